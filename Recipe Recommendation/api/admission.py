@@ -0,0 +1,261 @@
+# api/admission.py
+"""
+AI 엔드포인트 입장 제어
+
+- RateLimiter: IP(+ 로그인 유저) 별 토큰 버킷. 토큰이 없으면 RateLimited
+- UpstreamGate: LLM/이미지 업스트림 호출 전체의 동시 실행 수 상한 + 제한된 대기열.
+  대기열이 가득 찼거나 wait_timeout 안에 자리가 안 나면 UpstreamBusy
+  (동기 뷰의 스레드와 async 뷰의 코루틴이 같은 자리를 나눠 씀)
+
+뷰는 이 예외를 받아 바로 429/503 으로 응답하거나,
+CSV 추천 API 처럼 AI 보강 없이 매칭 결과만 돌려주는 식으로 부하를 덜어냅니다.
+상태는 모두 프로세스 단위입니다 (login_lane 과 같음).
+"""
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+
+from .instrumentation import stage
+
+
+class Shed(Exception):
+    """ 입장 거절 (retry_after 초 뒤에 다시 시도) """
+
+    def __init__(self, retry_after):
+        super().__init__(f"{self.__class__.__name__}, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RateLimited(Shed):
+    """ IP/유저 요청 한도 초과 (429) """
+
+
+class UpstreamBusy(Shed):
+    """ 업스트림 동시 호출 자리 없음 (503 또는 AI 보강 생략) """
+
+
+class RateLimiter:
+    """ 키별 토큰 버킷 (per_minute 속도로 채워지고 burst 개까지 쌓임)
+
+    키가 max_keys 를 넘으면 가장 오래 안 쓴 키부터 버립니다.
+    per_minute 가 0 이면 제한하지 않습니다.
+    """
+
+    def __init__(self, per_minute, burst, max_keys=10000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._limited = 0
+
+    def take(self, keys, cost=1):
+        """ keys 의 버킷 모두에 토큰이 있을 때만 전부에서 하나씩 씀 (하나라도 없으면 아무것도 쓰지 않음) """
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            levels = {}
+            for key in keys:
+                tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+                levels[key] = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = all(tokens >= cost for tokens in levels.values())
+            for key, tokens in levels.items():
+                self._buckets[key] = (tokens - cost if allowed else tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            if not allowed:
+                self._limited += 1
+                raise RateLimited(max(1, math.ceil((cost - min(levels.values())) / self.rate)))
+            self._allowed += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "per_minute": round(self.rate * 60, 2),
+                "burst": self.burst,
+                "tracked_keys": len(self._buckets),
+                "allowed": self._allowed,
+                "limited": self._limited,
+            }
+
+
+class _Waiter:
+    __slots__ = ('granted', 'wake')
+
+    def __init__(self, wake):
+        self.granted = False
+        self.wake = wake
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(True)
+
+
+class UpstreamGate:
+    """ 업스트림 호출 동시 실행 수 상한 (FIFO 대기열)
+
+    자리가 나면 release() 가 대기열 맨 앞 요청에게 자리를 바로 넘겨줍니다.
+    대기 인원이 max_waiting 이면 기다리지 않고 UpstreamBusy 를 던집니다.
+
+        with upstream_gate.slot(): ...            # 동기 뷰
+        async with upstream_gate.async_slot(): ...  # async 뷰
+    """
+
+    def __init__(self, concurrency, max_waiting, wait_timeout):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._in_flight = 0
+        self._peak_waiting = 0
+        self._admitted = 0
+        self._shed = 0
+        self._timed_out = 0
+        self._degraded = 0
+        self._total_seconds = 0.0
+        self._finished = 0
+
+    def _avg_seconds(self):
+        return self._total_seconds / self._finished if self._finished else 1.0
+
+    def _retry_after(self):
+        backlog = (len(self._waiters) + self._in_flight) / self.concurrency
+        return max(1, math.ceil(backlog * self._avg_seconds()))
+
+    def _enter_or_queue(self, wake):
+        """ 바로 들어가면 None, 줄을 서면 _Waiter. 줄이 꽉 찼으면 UpstreamBusy """
+        with self._lock:
+            if self._in_flight < self.concurrency and not self._waiters:
+                self._in_flight += 1
+                self._admitted += 1
+                return None
+            if len(self._waiters) >= self.max_waiting:
+                self._shed += 1
+                raise UpstreamBusy(self._retry_after())
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+            self._peak_waiting = max(self._peak_waiting, len(self._waiters))
+            return waiter
+
+    def _give_up(self, waiter):
+        """ 대기 포기. 그 사이에 자리를 넘겨받았으면 False (자리는 내 것) """
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            self._timed_out += 1
+            return True
+
+    def _release(self, elapsed):
+        with self._lock:
+            self._total_seconds += elapsed
+            self._finished += 1
+            if self._waiters:
+                # 자리를 반납하지 않고 다음 대기자에게 그대로 넘김 (in_flight 유지)
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self._admitted += 1
+                waiter.wake()
+            else:
+                self._in_flight -= 1
+
+    @contextlib.contextmanager
+    def slot(self):
+        event = threading.Event()
+        waiter = self._enter_or_queue(event.set)
+        if waiter is not None:
+            with stage('upstream_wait'):
+                if not event.wait(self.wait_timeout) and self._give_up(waiter):
+                    raise UpstreamBusy(self._retry_after())
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = self._enter_or_queue(lambda: loop.call_soon_threadsafe(_resolve, future))
+        if waiter is not None:
+            try:
+                async with stage('upstream_wait'):
+                    await asyncio.wait_for(future, self.wait_timeout)
+            except asyncio.TimeoutError:
+                if self._give_up(waiter):
+                    raise UpstreamBusy(self._retry_after())
+            except asyncio.CancelledError:
+                # 클라이언트가 끊긴 경우: 이미 넘겨받은 자리는 돌려줌
+                if not self._give_up(waiter):
+                    self._release(0.0)
+                raise
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    def record_degraded(self):
+        """ 자리가 없어 AI 보강 없이 응답한 요청 수 """
+        with self._lock:
+            self._degraded += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_waiting": self.max_waiting,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "peak_waiting": self._peak_waiting,
+                "admitted": self._admitted,
+                "shed": self._shed,
+                "timed_out": self._timed_out,
+                "degraded": self._degraded,
+                "avg_call_ms": round(self._avg_seconds() * 1000, 2) if self._finished else 0,
+            }
+
+
+def client_keys(request, user=None):
+    """ 요청 한도 키: 클라이언트 IP 는 항상, 로그인한 유저(또는 뷰가 확인한 user)면 유저 키도
+
+    요청 본문의 username 은 아무 값이나 보낼 수 있어서 키로 쓰지 않습니다.
+    (매번 다른 username 으로 새 버킷을 받아 IP 한도를 피하지 못하도록)
+    """
+    ip = request.META.get('REMOTE_ADDR', '')
+    if settings.ADMISSION_TRUST_X_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            ip = forwarded.split(',')[0].strip()
+    keys = [f"ip:{ip}"]
+    if user is None:
+        user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        keys.append(f"user:{user.pk}")
+    return keys
+
+
+def stats():
+    return {"rate_limit": rate_limiter.stats(), "upstream": upstream_gate.stats()}
+
+
+rate_limiter = RateLimiter(
+    per_minute=settings.AI_RATE_LIMIT_PER_MINUTE,
+    burst=settings.AI_RATE_LIMIT_BURST,
+)
+
+upstream_gate = UpstreamGate(
+    concurrency=settings.AI_UPSTREAM_CONCURRENCY,
+    max_waiting=settings.AI_UPSTREAM_MAX_WAITING,
+    wait_timeout=settings.AI_UPSTREAM_WAIT_TIMEOUT,
+)
@@ -0,0 +1,260 @@
+# api/ai.py
+"""
+외부 AI 호출 (Upstage Solar 텍스트 / Gemini 이미지)
+
+openai, requests, json_repair 는 import 비용이 커서 실제로 호출할 때만 불러옵니다.
+(로그인/커뮤니티 API 나 manage.py 명령은 이 비용을 내지 않음)
+"""
+import os
+import re
+import asyncio
+import base64
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from dotenv import load_dotenv
+
+from .admission import UpstreamBusy, upstream_gate
+from .instrumentation import stage
+from .prompts import RECIPE_TEXT, llm_usage, max_tokens, recipe_text_messages
+
+# .env 로드
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+env_path = os.path.join(root_dir, '.env')
+load_dotenv(env_path)
+
+# 키 설정 (공백 제거)
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
+UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "").strip()
+
+# 엔드포인트 (부하 테스트 때 가짜 서버로 바꿔 끼울 수 있도록 환경 변수로 뺌)
+UPSTAGE_BASE_URL = os.getenv("UPSTAGE_BASE_URL", "https://api.upstage.ai/v1")
+GEMINI_IMAGE_URL = os.getenv("GEMINI_IMAGE_URL", "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent")
+
+SOLAR_MODEL = "solar-pro2"
+
+_solar_client = None
+# 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 하나씩 (ASGI 서버면 프로세스당 하나)
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_solar_client():
+    """ Upstage Solar 클라이언트 (OpenAI 호환, 프로세스당 하나만 만들어 커넥션 재사용) """
+    global _solar_client
+    if _solar_client is None:
+        from openai import OpenAI
+        _solar_client = OpenAI(
+            api_key=UPSTAGE_API_KEY,
+            base_url=UPSTAGE_BASE_URL,
+            timeout=settings.AI_HTTP_TIMEOUT,
+        )
+    return _solar_client
+
+def _get_async_clients():
+    """ 현재 이벤트 루프용 (httpx.AsyncClient, AsyncOpenAI) 한 쌍
+
+    커넥션 풀 크기(settings.AI_HTTP_MAX_CONNECTIONS)가 동시 업스트림 호출 수의 상한입니다.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.get(loop)
+    if clients is None:
+        import httpx
+        from openai import AsyncOpenAI
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                                max_keepalive_connections=settings.AI_HTTP_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(settings.AI_HTTP_TIMEOUT),
+        )
+        solar = AsyncOpenAI(api_key=UPSTAGE_API_KEY, base_url=UPSTAGE_BASE_URL, http_client=http_client)
+        clients = _async_clients[loop] = (http_client, solar)
+    return clients
+
+def get_async_solar_client():
+    return _get_async_clients()[1]
+
+def get_async_http_client():
+    return _get_async_clients()[0]
+
+def _fallback_recipe_text():
+    return {
+        "description": "맛있는 요리를 위한 레시피입니다.",
+        "cooking_time": 20,
+        "difficulty": "보통",
+        "category": "기타",
+        "steps": ["재료를 손질합니다.", "맛있게 조리합니다.", "완성입니다."],
+        "tips": ["신선한 재료를 사용하세요."],
+        "nutrition": {"calories": 0, "carbohydrate": 0, "protein": 0, "fat": 0, "sodium": 0},
+        "required_equipment": ["프라이팬", "냄비"],
+        "alternative_ingredients": {},
+        "late_night_suitable": False,
+        "health_tags": []
+    }
+
+def _parse_recipe_text(response_text):
+    """ JSON 파싱 (json_repair 적용). 실패하면 기본값 """
+    try:
+        import json_repair
+        data = json_repair.loads(response_text)
+        
+        # steps 번호 제거 처리
+        if 'steps' in data and isinstance(data['steps'], list):
+            data['steps'] = [re.sub(r'^\d+\.\s*', '', str(step)) for step in data['steps']]
+        
+        return data
+        
+    except Exception as e:
+        print(f"⚠️ [Solar JSON 복구 실패]: {e}")
+        return _fallback_recipe_text()
+
+def solar_complete(field_set, messages):
+    """ Solar 호출 한 번 (업스트림 자리 + 응답 토큰 상한 + 토큰/지연 기록). 응답 본문 반환
+
+    자리가 없으면 UpstreamBusy, 호출이 실패하면 그 예외를 그대로 던집니다.
+    """
+    with upstream_gate.slot(), stage('llm'):
+        started = time.perf_counter()
+        try:
+            response = get_solar_client().chat.completions.create(
+                model=SOLAR_MODEL,
+                messages=messages,
+                max_tokens=max_tokens(field_set),
+                stream=False,
+            )
+        except Exception:
+            llm_usage.record_failure(field_set)
+            raise
+        llm_usage.record(field_set, response, time.perf_counter() - started)
+    return response.choices[0].message.content
+
+async def async_solar_complete(field_set, messages):
+    """ solar_complete 의 비동기 버전 """
+    async with upstream_gate.async_slot(), stage('llm'):
+        started = time.perf_counter()
+        try:
+            response = await get_async_solar_client().chat.completions.create(
+                model=SOLAR_MODEL,
+                messages=messages,
+                max_tokens=max_tokens(field_set),
+                stream=False,
+            )
+        except Exception:
+            llm_usage.record_failure(field_set)
+            raise
+        llm_usage.record(field_set, response, time.perf_counter() - started)
+    return response.choices[0].message.content
+
+def get_gemini_recipe_text(recipe_name, ingredients_str):
+    """ 텍스트 레시피 생성 (Upstage Solar-pro2 사용)
+
+    업스트림 자리가 없으면 기본값 대신 UpstreamBusy 를 던집니다 (호출한 뷰에서 처리).
+    """
+    print(f"🚀 [AI 텍스트 요청] 모델: {SOLAR_MODEL} / 요리명: {recipe_name}")
+
+    # 1. API 키 확인
+    if not UPSTAGE_API_KEY:
+        print("❌ [오류] UPSTAGE_API_KEY가 없습니다.")
+        return _fallback_recipe_text()
+
+    try:
+        # 2. AI 요청 -> 3. JSON 파싱
+        return _parse_recipe_text(solar_complete(RECIPE_TEXT, recipe_text_messages(recipe_name, ingredients_str)))
+    except UpstreamBusy:
+        raise
+    except Exception as e:
+        print(f"❌ [Solar 생성 실패]: {e}")
+        return _fallback_recipe_text()
+
+async def async_get_recipe_text(recipe_name, ingredients_str):
+    """ get_gemini_recipe_text 의 비동기 버전 (ASGI 뷰용) """
+    print(f"🚀 [AI 텍스트 요청/async] 모델: {SOLAR_MODEL} / 요리명: {recipe_name}")
+
+    if not UPSTAGE_API_KEY:
+        print("❌ [오류] UPSTAGE_API_KEY가 없습니다.")
+        return _fallback_recipe_text()
+
+    try:
+        messages = recipe_text_messages(recipe_name, ingredients_str)
+        return _parse_recipe_text(await async_solar_complete(RECIPE_TEXT, messages))
+    except UpstreamBusy:
+        raise
+    except Exception as e:
+        print(f"❌ [Solar 생성 실패]: {e}")
+        return _fallback_recipe_text()
+
+def _image_payload(recipe_name):
+    prompt = f"High-quality professional food photography of {recipe_name}, delicious, cinematic lighting, 4k"
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": { "responseModalities": ["TEXT", "IMAGE"] }
+    }
+
+def _store_image(result):
+    """ Gemini 응답에서 이미지를 꺼내 MEDIA_ROOT 에 저장하고 URL 반환 """
+    parts = result.get('candidates', [])[0].get('content', {}).get('parts', [])
+    
+    for part in parts:
+        if 'inlineData' in part:
+            img_data_b64 = part['inlineData']['data']
+            img_data = base64.b64decode(img_data_b64)
+            
+            file_name = f"{uuid.uuid4()}.jpg"
+            media_root = settings.MEDIA_ROOT
+            if not os.path.exists(media_root):
+                os.makedirs(media_root)
+            
+            file_path = os.path.join(media_root, file_name)
+            with open(file_path, "wb") as f:
+                f.write(img_data)
+            
+            # 주의: 배포 시에는 도메인 변경 필요
+            return f"http://127.0.0.1:8000/media/{file_name}"
+    
+    print("⚠️ [이미지 데이터 없음]")
+    return None
+
+def save_image_from_gemini(recipe_name):
+    """ 이미지 생성 (Gemini 2.0 Flash Exp Image Generation) """
+    if not GEMINI_API_KEY:
+        print("⚠️ [이미지 생성 건너뜀] Gemini API Key가 없습니다.")
+        return None
+
+    print(f"🎨 [AI 이미지 요청] {recipe_name} 그리는 중...")
+    with upstream_gate.slot(), stage('image'):
+        try:
+            import requests
+            headers = { 'Content-Type': 'application/json' }
+            # 업스트림이 멈춰도 게이트 자리를 계속 잡고 있지 않도록 타임아웃
+            response = requests.post(f"{GEMINI_IMAGE_URL}?key={GEMINI_API_KEY}", headers=headers, json=_image_payload(recipe_name),
+                                     timeout=settings.AI_HTTP_TIMEOUT)
+            
+            if response.status_code != 200:
+                print(f"⚠️ [이미지 생성 오류] {response.status_code}: {response.text}")
+                return None
+
+            return _store_image(response.json())
+        except Exception as e:
+            print(f"⚠️ 이미지 저장 실패: {e}")
+            return None
+
+async def async_save_image(recipe_name):
+    """ save_image_from_gemini 의 비동기 버전 (파일 쓰기만 스레드로 넘김) """
+    if not GEMINI_API_KEY:
+        print("⚠️ [이미지 생성 건너뜀] Gemini API Key가 없습니다.")
+        return None
+
+    print(f"🎨 [AI 이미지 요청/async] {recipe_name} 그리는 중...")
+    async with upstream_gate.async_slot(), stage('image'):
+        try:
+            response = await get_async_http_client().post(
+                GEMINI_IMAGE_URL, params={"key": GEMINI_API_KEY}, json=_image_payload(recipe_name))
+
+            if response.status_code != 200:
+                print(f"⚠️ [이미지 생성 오류] {response.status_code}: {response.text}")
+                return None
+
+            return await asyncio.to_thread(_store_image, response.json())
+        except Exception as e:
+            print(f"⚠️ 이미지 저장 실패: {e}")
+            return None
@@ -0,0 +1,200 @@
+# api/ai_results.py
+"""
+AI 맞춤 추천 결과 저장 / 재사용
+
+recommend_recipes_ai 가 LLM 으로 만든 레시피를 버리지 않고 Recipe/RecipeIngredient/Step 에 한 번에 저장합니다.
+  - 요청(재료 + 시간대 + 취향)을 정규화한 sha1 지문을 AIRecommendation.key 로 두고 저장한 레시피 id 목록을 기억합니다.
+    AI_RECOMMEND_FRESH_SECONDS 안에 같은 요청이 오면 LLM 없이 저장된 목록을 돌려줍니다.
+  - 레시피는 source='ai', source_key='<지문>:<생성 회차>:<순서>' 라서 고유 id (db-N) 가 생기고
+    즐겨찾기 / 댓글 / 상세 API 를 그대로 씁니다. 기간이 지나 다시 만들어도 예전 레시피는 지우지 않습니다.
+  - 이미지는 응답을 기다리게 하지 않도록 기본 이미지로 먼저 저장하고, 백그라운드 스레드(image_queue)가
+    AI_IMAGE_WORKERS 개씩 생성해서 바꿔 끼웁니다. 큐가 AI_IMAGE_QUEUE_MAX 를 넘으면 기본 이미지로 둡니다.
+    큐는 프로세스 단위라 재시작하면 대기 중이던 이미지는 사라집니다 (추천 API 가 다음에 다시 시도함).
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from recipes.models import AIRecommendation, Ingredient, Recipe, RecipeIngredient, Step
+from .instrumentation import stage
+from .recipe_detail import ai_recipe_payload, document_queryset, recipe_document, touch_recipe
+from .catalog_rows import canonical_ingredients
+
+
+def fingerprint(ingredients, time_slot, preferences):
+    """ 재료 순서 / 공백 차이와 무관한 요청 지문 """
+    canonical = [canonical_ingredients(ingredients), str(time_slot).strip(), ' '.join(str(preferences).split())]
+    return hashlib.sha1(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _payloads(recipe_ids):
+    """ 저장된 순서대로 AI 추천 응답 형식 (지워진 레시피는 빠짐, 쿼리 3번) """
+    recipes = document_queryset().in_bulk(recipe_ids)
+    return [ai_recipe_payload(recipe_document(recipes[i])) for i in recipe_ids if i in recipes]
+
+
+def get_fresh(key):
+    """ 기간 안에 만든 결과가 있으면 응답 목록, 없으면 None """
+    with stage('ai_results'):
+        since = timezone.now() - timedelta(seconds=settings.AI_RECOMMEND_FRESH_SECONDS)
+        recipe_ids = (AIRecommendation.objects.filter(key=key, generated_at__gte=since)
+                      .values_list('recipe_ids', flat=True).first())
+        if not recipe_ids:
+            return None
+        return _payloads(recipe_ids) or None
+
+
+def _int(value, default):
+    digits = ''.join(filter(str.isdigit, str(value)))
+    return int(digits) if digits else default
+
+
+def _valid_items(recipes_data):
+    # json_repair 결과는 목록 / 단일 dict / 엉뚱한 값 모두 가능
+    items = recipes_data if isinstance(recipes_data, list) else [recipes_data]
+    return [item for item in items if isinstance(item, dict) and str(item.get('name') or '').strip()]
+
+
+def store(key, ingredients, time_slot, preferences, recipes_data):
+    """ LLM 결과를 한 트랜잭션에 bulk 저장하고 응답 목록 반환. 저장할 게 없으면 None """
+    items = _valid_items(recipes_data)
+    if not items:
+        return None
+
+    with stage('ai_store'), transaction.atomic():
+        generation = uuid.uuid4().hex[:8]
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                name=str(item['name']).strip()[:100],
+                description=str(item.get('description') or ''),
+                cooking_time=_int(item.get('cooking_time'), 20),
+                difficulty=str(item.get('difficulty') or '보통')[:10],
+                category=str(item.get('category') or '기타')[:20],
+                health_tags=item.get('health_tags') if isinstance(item.get('health_tags'), list) else [],
+                late_night_suitable=str(time_slot).strip() == '야식',
+                image=f"https://source.unsplash.com/800x600/?{str(item['name']).strip()},food",
+                source=Recipe.SOURCE_AI,
+                source_key=f"{key}:{generation}:{i}",
+            )
+            for i, item in enumerate(items)
+        ])
+
+        links = []
+        for recipe, item in zip(recipes, items):
+            seen = set()
+            for ing in item.get('ingredients') or []:
+                name = (ing.get('name') if isinstance(ing, dict) else str(ing)) or ''
+                name = name.strip()[:50]
+                if name and name not in seen:
+                    seen.add(name)
+                    amount = ing.get('amount') if isinstance(ing, dict) else None
+                    links.append((recipe.id, name, str(amount or '적당량')[:50]))
+        names = {name for _, name, _ in links}
+        Ingredient.objects.bulk_create([Ingredient(name=n) for n in names], ignore_conflicts=True)
+        ingredient_ids = dict(Ingredient.objects.filter(name__in=names).values_list('name', 'id'))
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(recipe_id=recipe_id, ingredient_id=ingredient_ids[name], amount=amount)
+            for recipe_id, name, amount in links
+        ])
+        Step.objects.bulk_create([
+            Step(recipe=recipe, order=order, content=str(content))
+            for recipe, item in zip(recipes, items)
+            for order, content in enumerate(item.get('steps') or [], 1)
+        ])
+
+        AIRecommendation.objects.update_or_create(key=key, defaults={
+            "ingredients": canonical_ingredients(ingredients),
+            "time_slot": str(time_slot).strip()[:20],
+            "preferences": ' '.join(str(preferences).split())[:200],
+            "recipe_ids": [recipe.id for recipe in recipes],
+            "generated_at": timezone.now(),
+        })
+
+    # 커밋된 뒤에 이미지 생성 (워커가 레시피를 못 찾는 일이 없도록)
+    for recipe in recipes:
+        image_queue.submit(recipe.id, recipe.name)
+    return _payloads([recipe.id for recipe in recipes])
+
+
+class ImageQueue:
+    """ 레시피 이미지 생성 백그라운드 큐 (스레드 workers 개) """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._generated = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(self, recipe_id, name):
+        if self.workers <= 0:
+            return False
+        self._ensure_threads()
+        try:
+            self._queue.put_nowait((recipe_id, name))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            print(f"⚠️ [이미지 큐 가득 참] {name} 은 기본 이미지로 둡니다.")
+            return False
+
+    def _ensure_threads(self):
+        # gunicorn preload 후 fork 된 워커에서는 스레드가 없으므로 pid 로 확인해서 다시 띄움
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            for i in range(self.workers):
+                threading.Thread(target=self._run, name=f'recipick-ai-images-{i}', daemon=True).start()
+
+    def _run(self):
+        from .ai import save_image_from_gemini
+        while True:
+            recipe_id, name = self._queue.get()
+            try:
+                image_url = save_image_from_gemini(name)
+                if image_url:
+                    Recipe.objects.filter(id=recipe_id).update(image=image_url)
+                    touch_recipe(recipe_id)
+                with self._lock:
+                    if image_url:
+                        self._generated += 1
+                    else:
+                        self._failed += 1
+            except Exception as e:
+                with self._lock:
+                    self._failed += 1
+                print(f"⚠️ [이미지 생성 실패] {name}: {e}")
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+    def join(self):
+        """ 대기 중인 이미지를 다 만들 때까지 기다림 (테스트/관리 명령용) """
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "generated": self._generated,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "workers": self.workers,
+            }
+
+
+image_queue = ImageQueue(workers=settings.AI_IMAGE_WORKERS, max_pending=settings.AI_IMAGE_QUEUE_MAX)
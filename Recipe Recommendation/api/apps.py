@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # 검색 색인 테이블/트리거는 모델이 아니라서 migrate 가 끝날 때마다 확인 (api/search.py)
+        from django.db.models.signals import post_migrate
+        from .search import install_on_migrate
+        post_migrate.connect(install_on_migrate, dispatch_uid='recipick_search_index')
@@ -0,0 +1,190 @@
+# api/async_views.py
+"""
+비동기(ASGI) 추천 API
+
+recommend_recipes / recommend_recipes_ai 와 같은 입력/응답을 주지만,
+LLM/이미지 호출은 httpx/AsyncOpenAI 로 이벤트 루프에서 기다리므로
+느린 업스트림 호출이 워커 스레드를 붙잡지 않습니다.
+ORM 작업만 sync_to_async 로 넘기고, 점수 계산(numpy)은 별도 스레드에서 돌립니다.
+
+    uvicorn backend_dj.asgi:application   (또는 GUNICORN_ASGI=True gunicorn -c gunicorn.conf.py)
+
+DRF @api_view 는 async 뷰를 지원하지 않아 Django 순수 async 뷰로 작성했습니다.
+WSGI(runserver) 에서도 동작은 하지만 요청마다 이벤트 루프를 새로 만들어 이점이 없습니다.
+"""
+import asyncio
+import json
+import traceback
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+from .admission import RateLimited, UpstreamBusy, client_keys, rate_limiter, upstream_gate
+from .ai import UPSTAGE_API_KEY, async_get_recipe_text, async_save_image, async_solar_complete
+from .prompts import RECOMMEND, recommend_messages
+from .recommend_views import (
+    _apply_image, _apply_recipe_text, _ensure_recipe,
+    _find_matches, _needs_image, _serialize_recipe,
+)
+
+
+def _csrf_exempt(view):
+    # Django 4.2 의 csrf_exempt 는 async 뷰를 sync 함수로 감싸 버려서 속성만 직접 붙임
+    view.csrf_exempt = True
+    return view
+
+
+# 업스트림 자리가 없어 생성을 건너뛴 결과 표시
+_SHED = object()
+
+
+def _json_response(data, status=200, headers=None):
+    return JsonResponse(data, status=status, safe=False, headers=headers,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def _shed_response(e):
+    if isinstance(e, RateLimited):
+        return _json_response({"error": "AI 추천 요청이 너무 많습니다. 잠시 후 다시 시도해주세요."},
+                              status=429, headers={"Retry-After": str(e.retry_after)})
+    return _json_response({"error": "AI 서버가 혼잡합니다. 잠시 후 다시 시도해주세요."},
+                          status=503, headers={"Retry-After": str(e.retry_after)})
+
+
+def _read_json(request):
+    """ POST JSON 본문 -> dict (형식이 틀리면 None) """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _client_keys(request):
+    # request.user 는 세션을 DB 에서 읽는 지연 객체라 스레드에서 꺼냄
+    return await sync_to_async(client_keys)(request)
+
+
+def _prepare_recipes(matched_list):
+    """ (레시피, AI 텍스트 필요 여부, 이미지 필요 여부) 목록. 같은 레시피는 처음 한 번만 생성 요청 """
+    prepared, seen = [], set()
+    for item in matched_list:
+        recipe = _ensure_recipe(item)
+        first = recipe.id not in seen
+        seen.add(recipe.id)
+        prepared.append((recipe, first and not recipe.steps.exists(), first and _needs_image(recipe)))
+    return prepared
+
+
+def _finish_recipes(prepared, generated):
+    """ 생성된 AI 텍스트/이미지 저장 후 응답 형태로 변환 (동기 버전과 같은 규칙) """
+    final_results = []
+    ai_data = {}
+    for (recipe, needs_text, needs_image), (text, image_url) in zip(prepared, generated):
+        if needs_text and text is not _SHED:
+            ai_data = text
+            _apply_recipe_text(recipe, ai_data)
+        if needs_image:
+            _apply_image(recipe, None if image_url is _SHED else image_url)
+        final_results.append(_serialize_recipe(recipe, ai_data))
+    return final_results
+
+
+async def _unless_shed(coro):
+    try:
+        return await coro
+    except UpstreamBusy:
+        return _SHED
+
+
+async def _generate(item, needs_text, needs_image, enrich):
+    """ 레시피 하나의 텍스트/이미지를 동시에 요청. 필요하지만 요청하지 못한 것은 _SHED """
+    async def skip(needed):
+        return _SHED if needed else None
+    text = (_unless_shed(async_get_recipe_text(item['title'], item['ingredients_raw']))
+            if needs_text and enrich else skip(needs_text))
+    image = _unless_shed(async_save_image(item['title'])) if needs_image and enrich else skip(needs_image)
+    return await asyncio.gather(text, image)
+
+
+async def _build_recommendations_async(matched_list, rate_key):
+    """ (결과, AI 생성을 건너뛰었는지) - 한도/자리 규칙은 _build_recommendations 와 같음 """
+    prepared = await sync_to_async(_prepare_recipes)(matched_list)
+    enrich = True
+    if any(needs_text or needs_image for _, needs_text, needs_image in prepared):
+        try:
+            rate_limiter.take(rate_key)
+        except RateLimited:
+            enrich = False
+    generated = await asyncio.gather(*(
+        _generate(item, needs_text, needs_image, enrich)
+        for item, (_, needs_text, needs_image) in zip(matched_list, prepared)
+    ))
+    degraded = any(part is _SHED for parts in generated for part in parts)
+    return await sync_to_async(_finish_recipes)(prepared, generated), degraded
+
+
+@_csrf_exempt
+async def recommend_recipes_async(request):
+    """ recommend_recipes 의 async 버전 """
+    if request.method != 'POST':
+        return _json_response({"error": "POST 요청만 가능합니다."}, status=405)
+    data = _read_json(request)
+    if data is None:
+        return _json_response({"error": "잘못된 JSON 형식"}, status=400)
+
+    try:
+        user_ingredients = [u.strip() for u in data.get("ingredients", [])]
+        # 매칭은 CPU 작업이라 ORM 전용 스레드를 막지 않도록 별도 스레드에서
+        matched_list = await sync_to_async(_find_matches, thread_sensitive=False)(user_ingredients)
+        results, degraded = await _build_recommendations_async(matched_list, await _client_keys(request))
+        if degraded:
+            upstream_gate.record_degraded()
+            return _json_response(results, headers={"X-Recommend-Degraded": "ai-skipped"})
+        return _json_response(results)
+    except Exception as e:
+        traceback.print_exc()
+        return _json_response({"error": str(e)}, status=500)
+
+
+@_csrf_exempt
+async def recommend_recipes_ai_async(request):
+    """ recommend_recipes_ai 의 async 버전 """
+    if request.method != 'POST':
+        return _json_response({"error": "POST 요청만 가능합니다."}, status=405)
+    data = _read_json(request)
+    if data is None:
+        return _json_response({"error": "잘못된 JSON 형식"}, status=400)
+
+    try:
+        ingredients, time_slot, preferences = (data.get('ingredients', []), data.get('timeSlot', '점심'),
+                                               data.get('preferences', ''))
+        # 같은 요청의 최근 결과나 비슷한 저장 레시피가 있으면 LLM 없이 바로
+        from .ai_results import fingerprint, get_fresh, store
+        from .semantic import retrieve
+        key = fingerprint(ingredients, time_slot, preferences)
+        saved = await sync_to_async(get_fresh)(key)
+        if saved:
+            return _json_response(saved, headers={"X-Recommend-Source": "saved"})
+        stored = await sync_to_async(retrieve)(ingredients, time_slot, preferences)
+        if stored:
+            return _json_response(stored, headers={"X-Recommend-Source": "stored"})
+
+        rate_limiter.take(await _client_keys(request))
+        messages = recommend_messages(ingredients, time_slot, preferences)
+
+        if not UPSTAGE_API_KEY:
+            return _json_response({"error": "AI 키가 설정되지 않았습니다."}, status=500)
+
+        response_text = await async_solar_complete(RECOMMEND, messages)
+
+        import json_repair
+        recipes_data = json_repair.loads(response_text)
+        saved = await sync_to_async(store)(key, ingredients, time_slot, preferences, recipes_data)
+        return _json_response(saved or recipes_data, headers={"X-Recommend-Source": "generated"})
+
+    except (RateLimited, UpstreamBusy) as e:
+        return _shed_response(e)
+    except Exception as e:
+        print(f"❌ AI 추천 실패(async): {e}")
+        return _json_response({"error": str(e)}, status=500)
@@ -0,0 +1,378 @@
+# api/catalog.py
+"""
+CSV 레시피 카탈로그 로딩 + 재료 매칭
+
+CSV 는 한 번만 파싱해서 바이너리 스냅샷(<csv>.snapshot)으로 만들어 두고,
+워커들은 이 스냅샷을 mmap 으로 열기만 합니다. (모든 워커가 같은 물리 페이지를 공유)
+CSV 가 바뀌면 헤더의 원본 체크섬으로 알아채고 스냅샷을 다시 만듭니다.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+import numpy as np
+from django.conf import settings
+
+from .catalog_rows import catalog_version, parse_record, split_ingredients  # noqa: F401 (예전 import 경로)
+from .instrumentation import stage
+
+MIN_MATCH_RATE = 10  # % 이상 겹치는 레시피만 추천
+
+SNAPSHOT_MAGIC = b'RCPKCAT\0'
+SNAPSHOT_FORMAT = 1
+_ALIGN = 64
+
+
+def find_dataset_path():
+    """ recipe_dataset.csv 위치 찾기 (settings.RECIPE_DATASET_PATH 우선) """
+    candidates = [
+        getattr(settings, 'RECIPE_DATASET_PATH', None),
+        os.path.join(settings.BASE_DIR, 'backend_dj', 'recipe_dataset.csv'),
+        os.path.join(settings.BASE_DIR, 'recipe_dataset.csv'),
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            return str(path)
+    return None
+
+
+def ingredient_matches(u_ing, r_ing):
+    """ 정확한 단어 매칭 ("파"가 "양파"에 포함되지 않도록)
+
+    예: "김치" == "묵은지 김치" (O), "파" == "양파" (X)
+    """
+    return u_ing == r_ing or (len(u_ing) > 1 and u_ing in r_ing and r_ing != "양파" and u_ing != "파")
+
+
+class StringTable:
+    """ UTF-8 바이트 blob + 오프셋 배열 (mmap 위에서도 그대로 동작) """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [str(s).encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+
+class Catalog:
+    """ 컬럼형 레시피 카탈로그 (요청 간 공유, 읽기 전용)
+
+    - ing_ids / ing_offsets: 레시피별 재료 id (CSR: ing_ids[ing_offsets[i]:ing_offsets[i+1]])
+    - times / difficulty_codes / category_codes: 고정 폭 숫자 컬럼
+    - titles / ingredients_raw / vocab: 문자열 테이블
+    """
+
+    def __init__(self, titles, ingredients_raw, vocab, ing_ids, ing_offsets,
+                 times, difficulty_codes, category_codes, difficulties, categories, version):
+        self.titles = titles
+        self.ingredients_raw = ingredients_raw
+        # 재료 사전은 작아서 파이썬 리스트로 풀어 둠 (질의마다 전체를 훑음)
+        self.vocab = [vocab[i] for i in range(len(vocab))]
+        self._vocab_table = vocab
+        self.ing_ids = ing_ids
+        self.ing_offsets = ing_offsets
+        self.times = times
+        self.difficulty_codes = difficulty_codes
+        self.category_codes = category_codes
+        self.difficulties = difficulties
+        self.categories = categories
+        self.version = version
+        self.lsh = None
+
+    def __len__(self):
+        return len(self.ing_offsets) - 1
+
+    @classmethod
+    def from_rows(cls, rows, version):
+        """ row dict(title, ingredients_raw, names, time, difficulty, category) 목록으로 생성 """
+        vocab_index, difficulty_index, category_index = {}, {}, {}
+        titles, raws, ids, offsets, times, difficulty_codes, category_codes = [], [], [], [0], [], [], []
+        for row in rows:
+            titles.append(row['title'])
+            raws.append(row['ingredients_raw'])
+            for name in row['names']:
+                ids.append(vocab_index.setdefault(name, len(vocab_index)))
+            offsets.append(len(ids))
+            times.append(row['time'])
+            difficulty_codes.append(difficulty_index.setdefault(str(row['difficulty']), len(difficulty_index)))
+            category_codes.append(category_index.setdefault(str(row['category']), len(category_index)))
+        return cls(
+            titles=StringTable.from_strings(titles),
+            ingredients_raw=StringTable.from_strings(raws),
+            vocab=StringTable.from_strings(vocab_index),
+            ing_ids=np.asarray(ids, dtype=np.int32),
+            ing_offsets=np.asarray(offsets, dtype=np.int64),
+            times=np.asarray(times, dtype=np.int32),
+            difficulty_codes=np.asarray(difficulty_codes, dtype=np.uint16),
+            category_codes=np.asarray(category_codes, dtype=np.uint16),
+            difficulties=list(difficulty_index),
+            categories=list(category_index),
+            version=version,
+        )
+
+    @classmethod
+    def from_csv(cls, path):
+        import pandas as pd  # 스냅샷을 새로 만들 때만 필요
+        df = pd.read_csv(path, on_bad_lines='skip')
+
+        rows = (parse_record(row) for _, row in df.iterrows())
+        return cls.from_rows(rows, version=_stat_version(path))
+
+    # ------------------------------------------------------------------
+    # 바이너리 스냅샷
+    # ------------------------------------------------------------------
+    def _sections(self):
+        return {
+            'titles.blob': self.titles.blob, 'titles.offsets': self.titles.offsets,
+            'raw.blob': self.ingredients_raw.blob, 'raw.offsets': self.ingredients_raw.offsets,
+            'vocab.blob': self._vocab_table.blob, 'vocab.offsets': self._vocab_table.offsets,
+            'ing_ids': self.ing_ids, 'ing_offsets': self.ing_offsets,
+            'times': self.times, 'difficulty_codes': self.difficulty_codes,
+            'category_codes': self.category_codes,
+        }
+
+    def write_snapshot(self, path, source):
+        """ [magic][헤더 길이][헤더 JSON][64바이트 정렬된 섹션들] 형식으로 저장 (원자적 교체) """
+        sections = {name: np.ascontiguousarray(arr) for name, arr in self._sections().items()}
+        layout, offset, crc = {}, 0, 0
+        for name, arr in sections.items():
+            layout[name] = {"offset": offset, "dtype": arr.dtype.str, "length": len(arr)}
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+            crc = zlib.crc32(arr.tobytes(), crc)
+        header = json.dumps({
+            "format": SNAPSHOT_FORMAT,
+            "source": source,
+            "difficulties": self.difficulties,
+            "categories": self.categories,
+            "sections": layout,
+            "payload_crc32": crc,
+        }, ensure_ascii=False).encode('utf-8')
+        prefix_len = len(SNAPSHOT_MAGIC) + 4 + len(header)
+        data_start = -(-prefix_len // _ALIGN) * _ALIGN
+
+        # 여러 워커가 동시에 만들어도 서로의 임시 파일을 덮어쓰지 않도록 이름은 mkstemp 로
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(SNAPSHOT_MAGIC + struct.pack('<I', len(header)) + header)
+                f.write(b'\0' * (data_start - prefix_len))
+                for name, arr in sections.items():
+                    f.seek(data_start + layout[name]["offset"])
+                    f.write(arr.tobytes())
+            # mkstemp 는 0600 이라 다른 계정으로 도는 워커도 읽을 수 있게
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def read_snapshot_header(path):
+        with open(path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError("not a catalog snapshot")
+            (header_len,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"unsupported snapshot format {header.get('format')}")
+        prefix_len = len(SNAPSHOT_MAGIC) + 4 + header_len
+        header["data_start"] = -(-prefix_len // _ALIGN) * _ALIGN
+        return header
+
+    @classmethod
+    def open_snapshot(cls, path, version, verify=False):
+        """ 스냅샷을 읽기 전용 mmap 으로 열기 (복사 없음) """
+        header = cls.read_snapshot_header(path)
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays, crc = {}, 0
+        for name, meta in header["sections"].items():
+            dtype = np.dtype(meta["dtype"])
+            start = header["data_start"] + meta["offset"]
+            arrays[name] = data[start:start + meta["length"] * dtype.itemsize].view(dtype)
+            if verify:
+                crc = zlib.crc32(arrays[name].tobytes(), crc)
+        if verify and crc != header["payload_crc32"]:
+            raise ValueError("snapshot checksum mismatch")
+        return cls(
+            titles=StringTable(arrays['titles.blob'], arrays['titles.offsets']),
+            ingredients_raw=StringTable(arrays['raw.blob'], arrays['raw.offsets']),
+            vocab=StringTable(arrays['vocab.blob'], arrays['vocab.offsets']),
+            ing_ids=arrays['ing_ids'],
+            ing_offsets=arrays['ing_offsets'],
+            times=arrays['times'],
+            difficulty_codes=arrays['difficulty_codes'],
+            category_codes=arrays['category_codes'],
+            difficulties=header["difficulties"],
+            categories=header["categories"],
+            version=version,
+        )
+
+    # ------------------------------------------------------------------
+    # 매칭
+    # ------------------------------------------------------------------
+    def matching_vocab_ids(self, user_ingredients):
+        """ 입력 재료 중 하나라도 매칭되는 재료명 id 목록 """
+        return np.asarray([
+            vid for vid, r_ing in enumerate(self.vocab)
+            if any(ingredient_matches(u_ing, r_ing) for u_ing in user_ingredients)
+        ], dtype=np.int32)
+
+    def _vocab_mask(self, u_ing):
+        return np.fromiter((ingredient_matches(u_ing, r_ing) for r_ing in self.vocab),
+                           dtype=bool, count=len(self.vocab))
+
+    def row(self, i, match_count):
+        return {
+            'title': self.titles[i],
+            'ingredients_raw': self.ingredients_raw[i],
+            'time': int(self.times[i]),
+            'difficulty': self.difficulties[self.difficulty_codes[i]],
+            'category': self.categories[self.category_codes[i]],
+            'match_count': match_count,
+        }
+
+    def match(self, user_ingredients, limit=3, candidates=None):
+        """ 재료 겹침 비율이 MIN_MATCH_RATE 이상인 레시피를 match_count 순으로 반환
+
+        입력 재료마다 "매칭되는 재료명" 마스크를 사전 단위로 한 번 만들고,
+        레시피별 재료 id 배열에 대해 한꺼번에 집계합니다. (레시피 수만큼 파이썬 루프를 돌지 않음)
+        candidates(레시피 인덱스)를 주면 그 후보만 정확히 다시 점수 매김 (LSH 재랭킹용)
+        """
+        if candidates is None:
+            recipe_idx = np.arange(len(self), dtype=np.int64)
+        else:
+            recipe_idx = np.unique(np.asarray(candidates, dtype=np.int64))
+        starts = self.ing_offsets[recipe_idx]
+        totals = self.ing_offsets[recipe_idx + 1] - starts
+
+        keep = totals > 0
+        recipe_idx, starts, totals = recipe_idx[keep], starts[keep], totals[keep]
+        if len(recipe_idx) == 0:
+            return []
+
+        if candidates is None:
+            ids = self.ing_ids
+            seg_starts = starts
+        else:
+            # 후보 레시피의 재료만 이어 붙인 작은 CSR
+            ids = np.concatenate([self.ing_ids[s:s + t] for s, t in zip(starts, totals)])
+            seg_starts = np.concatenate(([0], np.cumsum(totals)[:-1]))
+
+        match_counts = np.zeros(len(recipe_idx), dtype=np.int32)
+        for u_ing in user_ingredients:
+            hit = self._vocab_mask(u_ing)[ids]
+            # 레시피 안에서 하나라도 매칭되면 1 (중복 카운트 방지)
+            match_counts += np.logical_or.reduceat(hit, seg_starts)
+
+        passed = match_counts * 100 >= MIN_MATCH_RATE * totals
+        recipe_idx, match_counts = recipe_idx[passed], match_counts[passed]
+        # match_count 내림차순, 같으면 CSV 순서 (기존 stable sort 와 동일)
+        order = np.lexsort((recipe_idx, -match_counts))[:limit]
+        return [self.row(int(recipe_idx[i]), int(match_counts[i])) for i in order]
+
+
+def _stat_version(path):
+    stat = os.stat(path)
+    return f"{int(stat.st_mtime)}-{stat.st_size}"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_path_for(csv_path):
+    return getattr(settings, 'RECIPE_SNAPSHOT_PATH', None) or f"{csv_path}.snapshot"
+
+
+def build_snapshot(csv_path, snapshot_path=None):
+    """ CSV -> 바이너리 스냅샷 컴파일 """
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    stat = os.stat(csv_path)
+    source = {"sha256": _file_sha256(csv_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    Catalog.from_csv(csv_path).write_snapshot(snapshot_path, source)
+    return snapshot_path
+
+
+def snapshot_is_fresh(csv_path, snapshot_path):
+    """ 크기+mtime 이 같으면 바로 OK, 다르면 원본 sha256 으로 다시 확인 """
+    try:
+        source = Catalog.read_snapshot_header(snapshot_path)["source"]
+    except (OSError, ValueError, KeyError):
+        return False
+    stat = os.stat(csv_path)
+    if source.get("size") == stat.st_size and source.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    return source.get("size") == stat.st_size and source.get("sha256") == _file_sha256(csv_path)
+
+
+def load_catalog(csv_path):
+    """ 최신 스냅샷이 있으면 mmap 으로 열고, 없거나 오래됐으면 다시 컴파일 """
+    version = _stat_version(csv_path)
+    if not settings.RECIPE_SNAPSHOT_ENABLED:
+        return Catalog.from_csv(csv_path)
+
+    snapshot_path = snapshot_path_for(csv_path)
+    if not snapshot_is_fresh(csv_path, snapshot_path):
+        try:
+            build_snapshot(csv_path, snapshot_path)
+        except OSError as e:
+            print(f"⚠️ [카탈로그 스냅샷 저장 실패]: {e}")
+            return Catalog.from_csv(csv_path)
+    return Catalog.open_snapshot(snapshot_path, version)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """ 프로세스 공용 카탈로그 (CSV 가 없으면 None) """
+    global _catalog
+    path = find_dataset_path()
+    if path is None:
+        return None
+    version = _stat_version(path)
+    if _catalog is None or _catalog.version != version:
+        with _catalog_lock:
+            if _catalog is None or _catalog.version != version:
+                with stage('csv_load'):
+                    catalog = load_catalog(path)
+                    if settings.RECIPE_LSH_ENABLED:
+                        from .lsh import load_or_build_index
+                        catalog.lsh = load_or_build_index(catalog, f"{path}.lsh.npz")
+                _catalog = catalog
+    return _catalog
+
+
+def match_recipes(user_ingredients, limit=3):
+    """ 추천 후보 계산 (CSV 가 없으면 입력 재료로 임시 요리 하나) """
+    catalog = get_catalog()
+    if catalog is not None:
+        with stage('match'):
+            if catalog.lsh is not None:
+                # 근사 후보 몇 백 개만 뽑아서 기존 규칙으로 정확히 재랭킹
+                candidates = catalog.lsh.query(catalog.matching_vocab_ids(user_ingredients))
+                return catalog.match(user_ingredients, limit=limit, candidates=candidates)
+            return catalog.match(user_ingredients, limit=limit)
+    if user_ingredients:
+        return [{'title': f"{user_ingredients[0]} 요리", 'ingredients_raw': '|'.join(user_ingredients), 'time': 20, 'difficulty': '초급', 'category': '기타', 'match_count': 1}]
+    return []
@@ -0,0 +1,57 @@
+# api/catalog_rows.py
+"""
+카탈로그 CSV 한 줄을 다루는 규칙 (파싱 / 내용 해시 / 재료 정규화)
+
+스냅샷(catalog.py) 과 DB 동기화(catalog_sync.py), 추천 뷰가 같은 규칙을 씁니다.
+URL conf 를 불러올 때 같이 import 되므로 numpy/pandas 는 쓰지 않습니다. (benchmarks.bench_importtime)
+"""
+import hashlib
+
+
+def split_ingredients(ingredients_raw):
+    """ "돼지고기 300g|양파 1/2개" -> [("돼지고기", "300g"), ("양파", "1/2개")] """
+    pairs = []
+    for raw in str(ingredients_raw).split('|'):
+        raw = raw.strip()
+        if not raw: continue
+        # 뒤에서부터 공백으로 잘라서 이름만 추출 (예: "양파 1/2개" -> "양파")
+        parts = raw.rsplit(' ', 1)
+        pairs.append((parts[0].strip(), parts[1] if len(parts) > 1 else '적당량'))
+    return pairs
+
+
+def _clean(value, default):
+    if value is None or value == '' or (isinstance(value, float) and value != value):  # 빈 값 / NaN
+        return default
+    return value
+
+
+def parse_record(record):
+    """ CSV 한 줄(dict 또는 pandas Series) -> row dict (스냅샷 빌드와 sync_catalog 가 같은 규칙으로 파싱) """
+    ingredients_raw = str(_clean(record.get('ingredients'), ''))
+    return {
+        'title': str(_clean(record.get('food_title'), '이름 없는 요리')),
+        'ingredients_raw': ingredients_raw,
+        'names': [name for name, _ in split_ingredients(ingredients_raw)],
+        'time': int(''.join(filter(str.isdigit, str(record.get('time', '20')))) or 20),
+        'difficulty': _clean(record.get('difficulty'), '초급'),
+        'category': _clean(record.get('cartegory'), '기타'),
+    }
+
+
+def row_hash(row):
+    """ CSV 에서 온 내용(제목/재료/시간/난이도/분류)의 sha1 """
+    content = '\x1f'.join(str(row[k]) for k in ('title', 'ingredients_raw', 'time', 'difficulty', 'category'))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def canonical_ingredients(names):
+    """ 공백/중복 제거 + 정렬 (top-K 테이블 / AI 추천 지문 키 기준) """
+    return sorted({n.strip() for n in names if n and n.strip()})
+
+
+def catalog_version():
+    """ 현재 카탈로그 버전 (카탈로그는 처음 부를 때 불러옴) """
+    from .catalog import get_catalog
+    catalog = get_catalog()
+    return catalog.version if catalog else 'none'
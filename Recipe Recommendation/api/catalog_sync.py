@@ -0,0 +1,150 @@
+# api/catalog_sync.py
+"""
+CSV 카탈로그 -> Recipe 테이블 증분 동기화 (manage.py sync_catalog)
+
+CSV 를 chunk_size 줄씩 읽어서 줄마다 내용 해시를 계산하고, (source='catalog', source_key=food_title) 로
+찾은 레시피의 CatalogEntry 해시와 비교해 새 레시피는 bulk insert, 바뀐 레시피는 bulk update + 재료 교체,
+그대로인 레시피는 건드리지 않습니다.
+청크 하나가 트랜잭션 하나이고, 메모리에는 청크 하나와 재료명 -> id 표만 올라갑니다.
+
+AI 가 채운 설명/조리 순서/이미지는 CSV 에 없는 정보라 업데이트할 때도 그대로 둡니다.
+CSV 에서 사라진 레시피는 댓글/즐겨찾기가 달려 있을 수 있어 지우지 않습니다.
+"""
+import csv
+import time
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from recipes.models import CatalogEntry, Ingredient, Recipe, RecipeIngredient
+from . import search as search_index
+from .catalog_rows import parse_record, row_hash, split_ingredients
+
+# 쿼리 한 번에 넣는 IN (...) 개수 / bulk_create 묶음 크기
+_BATCH = 500
+
+
+def iter_chunks(path, chunk_size):
+    """ CSV 를 chunk_size 줄씩 파싱 (파일 전체를 메모리에 올리지 않음) """
+    with open(path, newline='', encoding='utf-8') as f:
+        chunk = []
+        for record in csv.DictReader(f):
+            chunk.append(parse_record(record))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _batched(items):
+    items = list(items)
+    for i in range(0, len(items), _BATCH):
+        yield items[i:i + _BATCH]
+
+
+class CatalogSync:
+    """ 청크 단위 upsert. 재료명 -> id 표는 청크 사이에 재사용 """
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.ingredient_ids = {}
+        self.counts = {"rows": 0, "created": 0, "updated": 0, "unchanged": 0}
+
+    def sync_chunk(self, rows):
+        # 같은 청크 안의 중복 제목은 마지막 줄 기준 (청크 사이 중복도 뒤에 나온 줄이 덮어씀)
+        by_key = {row['title']: row for row in rows}
+        self.counts["rows"] += len(rows)
+
+        existing = {}
+        for keys in _batched(by_key):
+            # 추천 API 가 먼저 만든 레시피는 CatalogEntry 가 없어서 해시가 None -> 변경으로 처리해 해시를 채움
+            existing.update((key, (recipe_id, content_hash)) for key, recipe_id, content_hash in
+                            Recipe.objects.filter(source=Recipe.SOURCE_CATALOG, source_key__in=keys)
+                            .values_list('source_key', 'id', 'catalog_entry__content_hash'))
+
+        hashes = {key: row_hash(row) for key, row in by_key.items()}
+        changed = {key: existing[key][0] for key in existing if existing[key][1] != hashes[key]}
+        new_keys = [key for key in by_key if key not in existing]
+        self.counts["unchanged"] += len(existing) - len(changed)
+        if self.dry_run:
+            self.counts["updated"] += len(changed)
+            self.counts["created"] += len(new_keys)
+            return
+        if not changed and not new_keys:
+            return
+
+        with transaction.atomic():
+            created = Recipe.objects.bulk_create([self._recipe(by_key[key]) for key in new_keys],
+                                                 batch_size=_BATCH)
+            recipe_ids = {recipe.source_key: recipe.id for recipe in created}
+            recipe_ids.update(changed)
+
+            # CSV 에서 오는 필드만 덮어씀 (AI 가 채운 설명/순서/이미지는 유지)
+            updates = [self._recipe(by_key[key], recipe_ids[key]) for key in changed]
+            Recipe.objects.bulk_update(updates, ['name', 'cooking_time', 'difficulty', 'category'],
+                                       batch_size=_BATCH)
+            for ids in _batched(changed.values()):
+                RecipeIngredient.objects.filter(recipe_id__in=ids).delete()
+                Recipe.objects.filter(id__in=ids).update(version=F('version') + 1)
+
+            pairs = [(recipe_ids[key], split_ingredients(by_key[key]['ingredients_raw'])) for key in recipe_ids]
+            self._ensure_ingredients({name for _, items in pairs for name, _ in items})
+            links = []
+            for recipe_id, items in pairs:
+                seen = set()
+                for name, amount in items:
+                    if name in seen: continue  # 같은 재료가 두 번 적힌 줄
+                    seen.add(name)
+                    links.append((recipe_id, self.ingredient_ids[name], amount))
+            self._insert_links(links)
+
+            CatalogEntry.objects.bulk_create(
+                [CatalogEntry(recipe_id=recipe_id, content_hash=hashes[key]) for key, recipe_id in recipe_ids.items()],
+                batch_size=_BATCH, update_conflicts=True, unique_fields=['recipe'],
+                update_fields=['content_hash', 'synced_at'],
+            )
+
+        self.counts["created"] += len(created)
+        self.counts["updated"] += len(changed)
+        # 트리거가 쌓아 둔 검색 색인 대기열을 청크마다 비움 (첫 검색 요청이 몰아서 하지 않도록)
+        search_index.refresh()
+
+    @staticmethod
+    def _recipe(row, recipe_id=None):
+        return Recipe(id=recipe_id, name=row['title'], cooking_time=row['time'],
+                      difficulty=row['difficulty'], category=row['category'],
+                      source=Recipe.SOURCE_CATALOG, source_key=row['title'])
+
+    @staticmethod
+    def _insert_links(links):
+        # 줄 수가 레시피의 5~10 배라 모델 인스턴스 + bulk_create SQL 조립 비용이 전체의 대부분이었음
+        # -> 컬럼 세 개짜리 튜플을 executemany 로 바로 넣음
+        if not links:
+            return
+        qn = connection.ops.quote_name
+        table = RecipeIngredient._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {qn(table)} ({qn('recipe_id')}, {qn('ingredient_id')}, {qn('amount')}) "
+                f"VALUES (%s, %s, %s)", links)
+
+    def _ensure_ingredients(self, names):
+        missing = [name for name in names if name not in self.ingredient_ids]
+        if not missing:
+            return
+        Ingredient.objects.bulk_create([Ingredient(name=name) for name in missing],
+                                       batch_size=_BATCH, ignore_conflicts=True)
+        for batch in _batched(missing):
+            self.ingredient_ids.update(Ingredient.objects.filter(name__in=batch).values_list('name', 'id'))
+
+
+def sync_catalog(path, chunk_size=1000, dry_run=False, progress=None):
+    """ CSV 전체 동기화. progress(counts, elapsed) 는 청크마다 호출 """
+    sync = CatalogSync(dry_run=dry_run)
+    started = time.perf_counter()
+    for rows in iter_chunks(path, chunk_size):
+        sync.sync_chunk(rows)
+        if progress:
+            progress(sync.counts, time.perf_counter() - started)
+    return sync.counts, time.perf_counter() - started
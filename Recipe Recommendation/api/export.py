@@ -0,0 +1,283 @@
+# api/export.py
+"""
+레시피 / 댓글 / 즐겨찾기 스트리밍 내보내기 (NDJSON, CSV, gzip)
+
+목록 API 처럼 전체를 리스트로 만들지 않고 한 줄씩 만들어 바로 내보내서, 레시피가 백만 개여도 메모리는 일정하고
+첫 바이트가 바로 나갑니다.
+  - id 기준 keyset 청크(id > 마지막 id ORDER BY id LIMIT chunk_size)로 읽습니다. OFFSET 과 달리 뒤로 갈수록
+    느려지지 않고, 청크 사이에는 커서/트랜잭션을 잡고 있지 않아서 내보내는 동안 쓰기를 막지 않습니다.
+    (그 대신 전체가 한 시점의 스냅숏은 아님. 끊기면 마지막 id 를 after= 로 주고 이어받기)
+  - 레시피는 청크마다 재료/조리 순서를 IN 으로 한 번에 (청크당 쿼리 3번), 댓글/즐겨찾기는 JOIN 으로 청크당 한 번.
+    행이 많아서 모델 객체 대신 values_list 로 읽고 상세 API(recipe_detail.recipe_document)와 같은 모양으로 만듭니다.
+  - 출력은 EXPORT_BUFFER_BYTES 정도씩 모아서 내보내고, gzip 이면 그때마다 sync flush 해서 압축해도 계속 흘러갑니다.
+
+    GET /api/export/recipes/?format=ndjson|csv&gzip=1&after=<id>&source=user|catalog|ai
+    GET /api/export/comments/?username=<유저>     (그 유저 것만, EXPORT_TOKEN Bearer 면 username 없이 전체)
+    GET /api/export/favorites/?username=<유저>
+    python manage.py export_data recipes --format csv --gzip -o recipes.csv.gz
+
+API 와 manage.py export_data 가 같은 생성기(stream)를 씁니다.
+"""
+import csv
+import io
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from recipes.models import Comment, Favorite, Recipe, RecipeIngredient, Step
+
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def _keyset(queryset, chunk_size, after=0):
+    """ id 순서로 청크 단위 조회 (청크 안에서도 결과 캐시 없이 iterator) """
+    last = after
+    while True:
+        count = 0
+        for obj in queryset.filter(pk__gt=last).order_by('pk')[:chunk_size].iterator(chunk_size=chunk_size):
+            count += 1
+            last = obj.pk
+            yield obj
+        if count < chunk_size:
+            return
+
+
+_RECIPE_COLUMNS = ('id', 'name', 'cooking_time', 'difficulty', 'category', 'dishwashing', 'late_night_suitable',
+                   'health_tags', 'required_equipment', 'tips', 'nutrition', 'image', 'description',
+                   'author__username', 'source', 'source_key', 'created_at', 'version')
+
+
+def _recipe_chunks(queryset, chunk_size, after):
+    """ 청크 = 레시피 행 + 그 레시피들의 재료/조리 순서 (쿼리 3번, 모델 객체 없이 values_list) """
+    last = after
+    while True:
+        rows = list(queryset.filter(pk__gt=last).order_by('pk').values_list(*_RECIPE_COLUMNS)[:chunk_size])
+        if not rows:
+            return
+        ids = [row[0] for row in rows]
+        ingredients, steps = {}, {}
+        for recipe_id, name, amount in (RecipeIngredient.objects.filter(recipe_id__in=ids).order_by('id')
+                                        .values_list('recipe_id', 'ingredient__name', 'amount')):
+            ingredients.setdefault(recipe_id, []).append({"name": name, "amount": amount})
+        for recipe_id, content in (Step.objects.filter(recipe_id__in=ids).order_by('recipe_id', 'order')
+                                   .values_list('recipe_id', 'content')):
+            steps.setdefault(recipe_id, []).append(content)
+        for row in rows:
+            yield row, ingredients.get(row[0], []), steps.get(row[0], [])
+        if len(rows) < chunk_size:
+            return
+        last = ids[-1]
+
+
+def recipe_records(chunk_size=None, after=0, source=None):
+    """ 레시피 상세 API (recipe_document) 와 같은 형식 dict + 출처 """
+    queryset = Recipe.objects.all()
+    if source:
+        queryset = queryset.filter(source=source)
+    for row, ingredients, steps in _recipe_chunks(queryset, chunk_size or settings.EXPORT_CHUNK_SIZE, after):
+        (recipe_id, name, cooking_time, difficulty, category, dishwashing, late_night, health_tags, equipment,
+         tips, nutrition, image, description, author, source_, source_key, created_at, version) = row
+        yield {
+            "id": f"db-{recipe_id}",
+            "name": name,
+            "cookingTime": cooking_time,
+            "difficulty": difficulty,
+            "category": category,
+            "dishwashing": dishwashing,
+            "lateNightSuitable": late_night,
+            "healthTags": health_tags,
+            "requiredEquipment": equipment,
+            "ingredients": ingredients,
+            "steps": steps,
+            "tips": tips,
+            "nutrition": nutrition,
+            "image": image,
+            "description": description,
+            "author": author or "AI 셰프",
+            "isUserRecipe": source_ == Recipe.SOURCE_USER,
+            "source": source_,
+            "sourceKey": source_key,
+            "createdAt": created_at,
+            "version": version,
+        }
+
+
+def comment_records(chunk_size=None, after=0, user=None):
+    queryset = Comment.objects.select_related('user').only(
+        'id', 'recipe_id', 'rating', 'content', 'created_at', 'user__username')
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    for c in _keyset(queryset, chunk_size or settings.EXPORT_CHUNK_SIZE, after):
+        yield {
+            "id": c.id,
+            "recipeId": f"db-{c.recipe_id}",
+            "username": c.user.username,
+            "rating": c.rating,
+            "content": c.content,
+            "createdAt": c.created_at,
+        }
+
+
+def favorite_records(chunk_size=None, after=0, user=None):
+    queryset = Favorite.objects.select_related('user', 'recipe').only(
+        'id', 'created_at', 'user__username', 'recipe__id', 'recipe__name')
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    for f in _keyset(queryset, chunk_size or settings.EXPORT_CHUNK_SIZE, after):
+        yield {
+            "id": f.id,
+            "recipeId": f"db-{f.recipe_id}",
+            "recipeName": f.recipe.name,
+            "username": f.user.username,
+            "createdAt": f.created_at,
+        }
+
+
+KINDS = {
+    'recipes': recipe_records,
+    'comments': comment_records,
+    'favorites': favorite_records,
+}
+
+# CSV 컬럼 순서 (NDJSON 은 dict 키 그대로)
+CSV_FIELDS = {
+    'recipes': ['id', 'name', 'cookingTime', 'difficulty', 'category', 'dishwashing', 'lateNightSuitable',
+                'healthTags', 'requiredEquipment', 'ingredients', 'steps', 'tips', 'nutrition', 'image',
+                'description', 'author', 'isUserRecipe', 'source', 'sourceKey', 'createdAt', 'version'],
+    'comments': ['id', 'recipeId', 'username', 'rating', 'content', 'createdAt'],
+    'favorites': ['id', 'recipeId', 'recipeName', 'username', 'createdAt'],
+}
+
+
+def _json_default(value):
+    # datetime 등 (DRF 응답과 같은 ISO 8601)
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=_json_default)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _buffered(pieces):
+    """ 작은 문자열을 EXPORT_BUFFER_BYTES 정도씩 묶은 UTF-8 바이트 (첫 줄은 바로) """
+    limit = settings.EXPORT_BUFFER_BYTES
+    buffer, size, first = [], 0, True
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= limit or first:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size, first = [], 0, False
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, default=_json_default) + '\n'
+
+
+def csv_lines(records, fields):
+    out = io.StringIO()
+    writer = csv.writer(out)
+
+    def take(row):
+        writer.writerow(row)
+        line = out.getvalue()
+        out.seek(0)
+        out.truncate()
+        return line
+
+    # 엑셀이 UTF-8 로 열도록 BOM
+    yield '\ufeff' + take(fields)
+    for record in records:
+        yield take([_csv_value(record.get(field)) for field in fields])
+
+
+def gzip_stream(chunks):
+    """ 청크마다 sync flush 해서 받는 쪽이 바로 풀 수 있는 gzip 스트림 """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(kind, fmt='ndjson', compress=False, **filters):
+    """ 내보내기 바이트 스트림 (생성기라서 소비할 때 DB 를 읽음) """
+    records = KINDS[kind](**filters)
+    lines = csv_lines(records, CSV_FIELDS[kind]) if fmt == 'csv' else ndjson_lines(records)
+    chunks = _buffered(lines)
+    return gzip_stream(chunks) if compress else chunks
+
+
+# ----------------------------------------------------------------------
+# API
+# ----------------------------------------------------------------------
+
+async def _async_chunks(chunks):
+    # ASGI 에서 동기 이터레이터를 주면 Django 가 전부 읽어서 메모리에 올린 뒤 보내므로, 한 청크씩 스레드에서 꺼냄
+    done = object()
+    pull = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await pull(chunks, done)) is not done:
+        yield chunk
+
+
+def _has_export_token(request):
+    token = settings.EXPORT_TOKEN
+    return bool(token) and request.headers.get('Authorization') == f"Bearer {token}"
+
+
+@require_GET
+def export_view(request, kind):
+    """ 스트리밍 내보내기 (모듈 설명 참고) """
+    if kind not in KINDS:
+        return JsonResponse({"error": f"kind 는 {', '.join(KINDS)} 중 하나입니다."}, status=404)
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        return JsonResponse({"error": f"format 은 {', '.join(FORMATS)} 중 하나입니다."}, status=400)
+    try:
+        filters = {"after": max(0, int(request.GET.get('after', 0)))}
+    except ValueError:
+        return JsonResponse({"error": "after 는 숫자여야 합니다."}, status=400)
+
+    if kind == 'recipes':
+        source = request.GET.get('source')
+        if source and source not in dict(Recipe.SOURCE_CHOICES):
+            return JsonResponse({"error": "알 수 없는 source 입니다."}, status=400)
+        filters["source"] = source
+    else:
+        username = request.GET.get('username')
+        if username:
+            try:
+                filters["user"] = User.objects.get(username=username)
+            except User.DoesNotExist:
+                return JsonResponse({"error": "존재하지 않는 유저"}, status=404)
+        elif not _has_export_token(request):
+            # 전체 유저 데이터는 운영용 토큰이 있을 때만
+            return JsonResponse({"error": "유저 정보 필요"}, status=400)
+
+    compress = request.GET.get('gzip') in ('1', 'true')
+    chunks = stream(kind, fmt, compress, **filters)
+    if isinstance(request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+    filename = f"recipick-{kind}.{fmt}" + ('.gz' if compress else '')
+    response = StreamingHttpResponse(
+        chunks, content_type='application/gzip' if compress else f"{CONTENT_TYPES[fmt]}; charset=utf-8")
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    # nginx 가 응답을 모아 두지 않고 바로 흘려보내도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,13 @@
+# api/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """ 로그인 CPU 비용을 settings로 조절할 수 있는 Argon2 해셔
+
+    파라미터가 바뀌면 Django가 다음 로그인 때 자동으로 재해싱(must_update)합니다.
+    """
+    time_cost = getattr(settings, 'ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, 'ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, 'ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
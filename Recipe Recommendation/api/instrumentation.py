@@ -0,0 +1,309 @@
+# api/instrumentation.py
+"""
+요청 단위 성능 계측
+
+    from .instrumentation import stage
+    with stage('match'):
+        ...
+
+- 요청마다 RequestTimings 를 contextvar 에 두고, stage() 구간 시간과 DB 쿼리 수/시간을 모읍니다.
+  (contextvar 라서 async 뷰의 gather 태스크나 sync_to_async 스레드에서도 같은 요청으로 집계됨.
+   동시에 돈 구간은 합계라서 전체 시간보다 클 수 있음)
+- InstrumentationMiddleware 가 Server-Timing 헤더와 JSON 로그 한 줄을 남기고,
+  엔드포인트별 최근 METRICS_WINDOW 개 요청으로 p50/p95/p99 를 계산해 /metrics 로 내보냅니다.
+- 집계는 프로세스 단위입니다 (gunicorn 워커마다 따로).
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+logger = logging.getLogger('recipick.requests')
+
+_current = ContextVar('recipick_request_timings', default=None)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RequestTimings:
+    """ 요청 하나의 구간별 시간(초)과 DB 쿼리 통계 """
+
+    __slots__ = ('started', 'stages', 'db_queries', 'db_seconds', '_lock')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # name -> [seconds, count]
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def add_query(self, seconds):
+        with self._lock:
+            self.db_queries += 1
+            self.db_seconds += seconds
+
+
+class stage:
+    """ 이름 붙인 구간 시간 측정 (with / async with 둘 다 가능, 요청 밖에서는 아무것도 안 함) """
+
+    __slots__ = ('name', 'timings', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _current.get()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings.add_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        return self.__exit__(*exc)
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(time.perf_counter() - started)
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    # 스레드마다 새로 만들어지는 연결 모두에 붙여서 sync_to_async 스레드의 쿼리도 집계
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def _install_on_open_connections():
+    # 이 모듈이 로딩되기 전에 이미 열린 (현재 스레드의) 연결
+    for connection in connections.all(initialized_only=True):
+        _install_db_wrapper(None, connection)
+
+
+connection_created.connect(_install_db_wrapper, dispatch_uid='recipick_db_timing')
+
+
+class _Window:
+    """ 최근 N 개 관측값 + 누적 합계/개수 """
+
+    __slots__ = ('values', 'total', 'count')
+
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.values.append(value)
+        self.total += value
+        self.count += 1
+
+    def quantiles(self):
+        ordered = sorted(self.values)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class Metrics:
+    """ 엔드포인트별 요청/구간 지연 분포와 카운터 """
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests = {}   # (method, endpoint) -> _Window
+        self._stages = {}     # (endpoint, stage) -> _Window
+        self._statuses = {}   # (method, endpoint, status) -> count
+        self._db = {}         # endpoint -> [queries, seconds]
+
+    def observe(self, method, endpoint, status, seconds, timings):
+        with self._lock:
+            self._requests.setdefault((method, endpoint), _Window(self.window)).observe(seconds)
+            key = (method, endpoint, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            for name, (stage_seconds, _) in timings.stages.items():
+                self._stages.setdefault((endpoint, name), _Window(self.window)).observe(stage_seconds)
+            db = self._db.setdefault(endpoint, [0, 0.0])
+            db[0] += timings.db_queries
+            db[1] += timings.db_seconds
+
+    def snapshot(self):
+        """ 엔드포인트별 p50/p95/p99 (ms) """
+        with self._lock:
+            return {
+                f"{method} {endpoint}": {
+                    "count": window.count,
+                    **{f"p{int(q * 100)}_ms": round(v * 1000, 2) for q, v in window.quantiles().items()},
+                }
+                for (method, endpoint), window in self._requests.items()
+            }
+
+    def render(self):
+        """ Prometheus 텍스트 형식 """
+        lines = []
+
+        def summary(name, help_text, windows, label_names):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for label_values, window in windows:
+                labels = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, label_values))
+                for q, v in window.quantiles().items():
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {v:.6f}')
+                lines.append(f'{name}_sum{{{labels}}} {window.total:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {window.count}')
+
+        with self._lock:
+            summary('recipick_request_duration_seconds', 'Request latency (recent window quantiles)',
+                    sorted(self._requests.items()), ('method', 'endpoint'))
+            summary('recipick_stage_duration_seconds', 'Per-request time spent in a named stage',
+                    sorted(self._stages.items()), ('endpoint', 'stage'))
+
+            lines.append('# HELP recipick_requests_total Requests by status')
+            lines.append('# TYPE recipick_requests_total counter')
+            for (method, endpoint, status), count in sorted(self._statuses.items()):
+                lines.append(f'recipick_requests_total{{method="{method}",endpoint="{_escape(endpoint)}",'
+                             f'status="{status}"}} {count}')
+
+            lines.append('# HELP recipick_db_queries_total DB queries executed while serving requests')
+            lines.append('# TYPE recipick_db_queries_total counter')
+            for endpoint, (queries, _) in sorted(self._db.items()):
+                lines.append(f'recipick_db_queries_total{{endpoint="{_escape(endpoint)}"}} {queries}')
+            lines.append('# HELP recipick_db_seconds_total DB time spent while serving requests')
+            lines.append('# TYPE recipick_db_seconds_total counter')
+            for endpoint, (_, seconds) in sorted(self._db.items()):
+                lines.append(f'recipick_db_seconds_total{{endpoint="{_escape(endpoint)}"}} {seconds:.6f}')
+
+        # 입장 제어 / 로그인 레인 현재 상태
+        from .admission import upstream_gate
+        from .login_lane import login_lane
+        upstream = upstream_gate.stats()
+        gauges = {
+            'recipick_upstream_in_flight': upstream['in_flight'],
+            'recipick_upstream_waiting': upstream['waiting'],
+            'recipick_upstream_shed_total': upstream['shed'],
+            'recipick_upstream_degraded_total': upstream['degraded'],
+            'recipick_login_lane_waiting': login_lane.stats()['waiting'],
+        }
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{name} {value}")
+
+        # LLM 호출 / 토큰 (지연 시간은 stage="llm" 구간으로 나감)
+        from .prompts import llm_usage
+        usage = sorted(llm_usage.stats().items())
+        lines.append('# HELP recipick_llm_calls_total LLM calls by field set (truncated is a subset of ok)')
+        lines.append('# TYPE recipick_llm_calls_total counter')
+        for field_set, entry in usage:
+            for outcome, key in (('ok', 'calls'), ('failed', 'failed'), ('truncated', 'truncated')):
+                lines.append(f'recipick_llm_calls_total{{field_set="{field_set}",outcome="{outcome}"}} {entry[key]}')
+        lines.append('# HELP recipick_llm_tokens_total LLM tokens reported by the upstream')
+        lines.append('# TYPE recipick_llm_tokens_total counter')
+        for field_set, entry in usage:
+            for kind in ('prompt', 'completion', 'cached'):
+                lines.append(f'recipick_llm_tokens_total{{field_set="{field_set}",kind="{kind}"}} {entry[kind + "_tokens"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics(window=settings.METRICS_WINDOW)
+
+
+def _endpoint(request):
+    # URL 패턴(route) 기준으로 묶어서 레이블 종류가 늘어나지 않게 함 (/api/recipe/<int:recipe_id>/comments/)
+    match = getattr(request, 'resolver_match', None)
+    return f"/{match.route}" if match is not None and match.route else 'unmatched'
+
+
+def _server_timing(timings, total):
+    parts = [f'{name};dur={seconds * 1000:.1f}' for name, (seconds, _) in timings.stages.items()]
+    parts.append(f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.db_queries} queries"')
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+class InstrumentationMiddleware:
+    """ 요청 시간 / 구간 / DB 쿼리 집계 (sync, async 둘 다 지원) """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        _install_on_open_connections()
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    def _finish(self, request, response, timings):
+        total = time.perf_counter() - timings.started
+        endpoint = _endpoint(request)
+        metrics.observe(request.method, endpoint, response.status_code, total, timings)
+        response['Server-Timing'] = _server_timing(timings, total)
+        if settings.REQUEST_LOG_ENABLED:
+            logger.info(json.dumps({
+                "event": "request",
+                "method": request.method,
+                "path": request.path,
+                "endpoint": endpoint,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 2),
+                "db_queries": timings.db_queries,
+                "db_ms": round(timings.db_seconds * 1000, 2),
+                "stages_ms": {name: round(s * 1000, 2) for name, (s, _) in timings.stages.items()},
+            }, ensure_ascii=False))
+        return response
+
+
+def metrics_view(request):
+    """ Prometheus 수집용 /metrics (METRICS_TOKEN 을 설정하면 Bearer 토큰 필요) """
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return HttpResponse("unauthorized\n", status=401, content_type='text/plain')
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
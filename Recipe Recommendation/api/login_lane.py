@@ -0,0 +1,111 @@
+# api/login_lane.py
+"""
+로그인 / 회원가입 비밀번호 해싱 레인
+
+레인은 프로세스 안의 세마포어라서 한 워커가 요청을 여러 개 동시에 받을 때만 의미가 있습니다.
+  - gunicorn 은 gthread 워커(threads 가 LOGIN_LANE_CONCURRENCY 보다 커야 함) 또는 ASGI(uvicorn) 워커로 띄웁니다.
+    gunicorn.conf.py 가 이 조건을 검사해서 sync 워커 설정이면 시작하지 않습니다.
+  - Argon2/PBKDF2 해싱은 GIL 을 놓기 때문에 해싱 중인 스레드가 있어도 같은 워커의 다른 스레드가
+    레시피 요청을 계속 처리합니다. 스레드가 하나뿐인 sync 워커에서는 해싱 동안 워커 전체가 멈추고,
+    레인은 줄을 세우지도 429 를 돌려주지도 못합니다.
+WSGI 서버가 단일 스레드(wsgi.multithread=False)라고 알려 오면 첫 요청 때 경고를 남깁니다.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+
+
+class LoginLaneBusy(Exception):
+    """ 로그인 대기열이 가득 찼을 때 (429 + Retry-After 로 응답) """
+
+    def __init__(self, retry_after):
+        super().__init__(f"login lane busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class LoginLane:
+    """ 비밀번호 해싱 전용 실행 레인
+
+    동시에 해싱할 수 있는 요청 수(concurrency)를 제한해서 로그인 폭주 때도
+    나머지 워커 CPU가 레시피 요청을 처리할 수 있게 합니다.
+    대기 인원이 max_waiting 을 넘거나 wait_timeout 안에 자리가 나지 않으면
+    LoginLaneBusy 를 던집니다.
+    """
+
+    def __init__(self, concurrency, max_waiting, wait_timeout):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._peak_waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._warned = False
+
+    def _avg_seconds(self):
+        return self._total_seconds / self._admitted if self._admitted else 0.1
+
+    def _retry_after(self):
+        # 지금 줄 선 사람들이 다 빠지는 데 걸리는 예상 시간 (최소 1초)
+        backlog = (self._waiting + self._in_flight) / self.concurrency
+        return max(1, math.ceil(backlog * self._avg_seconds()))
+
+    def check_server(self, request):
+        """ 단일 스레드 WSGI 워커면 한 번만 경고 (모듈 설명 참고) """
+        if request.META.get('wsgi.multithread') is False and not self._warned:
+            self._warned = True
+            print("⚠️ [로그인 레인] 단일 스레드 워커에서는 레인이 동작하지 않습니다. "
+                  "gthread(GUNICORN_THREADS > LOGIN_LANE_CONCURRENCY) 또는 ASGI 워커로 실행하세요.")
+
+    def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self._waiting >= self.max_waiting:
+                self._rejected += 1
+                raise LoginLaneBusy(self._retry_after())
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+
+        acquired = self._slots.acquire(timeout=self.wait_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._rejected += 1
+                raise LoginLaneBusy(self._retry_after())
+            self._in_flight += 1
+
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._admitted += 1
+                self._total_seconds += elapsed
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_waiting": self.max_waiting,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "peak_waiting": self._peak_waiting,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "avg_hash_ms": round(self._avg_seconds() * 1000, 2) if self._admitted else 0,
+            }
+
+
+login_lane = LoginLane(
+    concurrency=settings.LOGIN_LANE_CONCURRENCY,
+    max_waiting=settings.LOGIN_LANE_MAX_WAITING,
+    wait_timeout=settings.LOGIN_LANE_WAIT_TIMEOUT,
+)
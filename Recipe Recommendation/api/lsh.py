@@ -0,0 +1,135 @@
+# api/lsh.py
+"""
+재료 집합 MinHash + LSH 인덱스 (근사 후보 검색)
+
+레시피마다 재료 id 집합의 MinHash 시그니처를 만들고, 밴드 단위로 버킷에 넣어 둡니다.
+질의 재료와 자카드 유사도가 높은 레시피 몇 백 개만 후보로 뽑고,
+최종 순위는 Catalog.match 의 기존 match_rate 규칙으로 다시 계산합니다.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+INDEX_FORMAT = 1
+
+
+class MinHashLSH:
+    """ num_perm = bands * rows
+
+    기본값(64 x 1)은 임계값을 낮게 잡고, 충돌한 밴드 수(= 자카드 추정치) 순으로
+    후보를 자르는 방식입니다. 재료 집합은 작고 부분 일치(예: "김치" -> "묵은지 김치")로
+    질의 집합이 넓어지기 때문에 rows 를 늘리면 recall 이 크게 떨어집니다.
+    """
+
+    def __init__(self, bands=64, rows=1, max_candidates=300, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.max_candidates = max_candidates
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        self.a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.band_keys = None    # (bands, n) 정렬된 버킷 키
+        self.band_order = None   # (bands, n) 키 순서의 레시피 인덱스
+        self.version = None
+
+    def _hash(self, ids):
+        # (len(ids), num_perm) 범용 해시 h(x) = (a*x + b) mod p, 32비트로 자름
+        x = ids.astype(np.uint64)[:, None]
+        return ((self.a * x + self.b) % _PRIME) & _MAX_HASH
+
+    def signatures(self, ing_ids, ing_offsets, chunk=50_000):
+        """ CSR 재료 배열 -> (n, num_perm) 시그니처. 재료 없는 레시피는 최댓값으로 채움 """
+        n = len(ing_offsets) - 1
+        sig = np.full((n, self.bands * self.rows), _MAX_HASH, dtype=np.uint64)
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            lo, hi = ing_offsets[start], ing_offsets[stop]
+            if lo == hi: continue
+            hashed = self._hash(ing_ids[lo:hi])
+            starts = ing_offsets[start:stop] - lo
+            nonempty = ing_offsets[start + 1:stop + 1] > ing_offsets[start:stop]
+            reduced = np.minimum.reduceat(hashed, starts[nonempty], axis=0)
+            sig[start:stop][nonempty] = reduced
+        return sig
+
+    def _band_keys(self, sig):
+        # 밴드 안의 rows 개 해시를 하나의 64비트 키로 섞음 (오버플로는 의도된 동작)
+        sig = sig.reshape(len(sig), self.bands, self.rows)
+        keys = np.zeros((len(sig), self.bands), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for r in range(self.rows):
+                keys = keys * np.uint64(0x9E3779B97F4A7C15) + sig[:, :, r]
+        return keys.T  # (bands, n)
+
+    def build(self, catalog):
+        keys = self._band_keys(self.signatures(catalog.ing_ids, catalog.ing_offsets))
+        self.band_order = np.argsort(keys, axis=1, kind='stable').astype(np.int32)
+        self.band_keys = np.take_along_axis(keys, self.band_order, axis=1)
+        self.version = catalog.version
+        return self
+
+    def query(self, vocab_ids):
+        """ 질의 재료 id 집합 -> 충돌 밴드 수가 많은 순으로 최대 max_candidates 개 레시피 인덱스 """
+        if len(vocab_ids) == 0:
+            return []
+        sig = self._hash(np.asarray(vocab_ids)).min(axis=0)[None, :]
+        qkeys = self._band_keys(sig)[:, 0]
+        hits = []
+        for band in range(self.bands):
+            keys = self.band_keys[band]
+            lo = np.searchsorted(keys, qkeys[band], side='left')
+            hi = np.searchsorted(keys, qkeys[band], side='right')
+            if hi > lo:
+                hits.append(self.band_order[band, lo:hi])
+        if not hits:
+            return []
+        found, counts = np.unique(np.concatenate(hits), return_counts=True)
+        if len(found) > self.max_candidates:
+            found = found[np.argsort(-counts, kind='stable')[:self.max_candidates]]
+        return found.tolist()
+
+    def save(self, path):
+        # 카탈로그 스냅샷과 같이 여러 워커가 동시에 저장해도 임시 파일이 겹치지 않게
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, format=INDEX_FORMAT, version=self.version,
+                         bands=self.bands, rows=self.rows, a=self.a, b=self.b,
+                         band_keys=self.band_keys, band_order=self.band_order)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, max_candidates=300):
+        with np.load(path) as data:
+            if int(data['format']) != INDEX_FORMAT:
+                raise ValueError("LSH index format mismatch")
+            index = cls(bands=int(data['bands']), rows=int(data['rows']), max_candidates=max_candidates)
+            index.a, index.b = data['a'], data['b']
+            index.band_keys, index.band_order = data['band_keys'], data['band_order']
+            index.version = str(data['version'])
+        return index
+
+
+def load_or_build_index(catalog, path):
+    """ 디스크 인덱스가 현재 카탈로그 버전이면 재사용, 아니면 새로 만들어 저장 """
+    if os.path.exists(path):
+        try:
+            index = MinHashLSH.load(path)
+            if index.version == catalog.version:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    index = MinHashLSH().build(catalog)
+    try:
+        index.save(path)
+    except OSError as e:
+        print(f"⚠️ [LSH 인덱스 저장 실패]: {e}")
+    return index
@@ -0,0 +1,81 @@
+# api/management/commands/aggregate_profiles.py
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("PROFILING_DIR 에 쌓인 요청 프로파일(collapsed stack)을 합쳐서 "
+            "엔드포인트별 요약과 가장 오래 걸린 함수를 출력합니다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', help="엔드포인트 디렉터리 이름에 이 문자열이 들어간 것만 (예: recommend)")
+        parser.add_argument('--since', type=float, help="최근 N 분 안에 저장된 프로파일만")
+        parser.add_argument('--top', type=int, default=20, help="출력할 함수 수")
+        parser.add_argument('--out', help="합친 collapsed stack 저장 경로 (flamegraph.pl / speedscope 입력)")
+
+    def handle(self, *args, **options):
+        root = settings.PROFILING_DIR
+        if not os.path.isdir(root):
+            raise CommandError(f"프로파일 디렉터리가 없습니다: {root}")
+        cutoff = time.time_ns() - int(options['since'] * 60e9) if options['since'] else 0
+
+        merged = {}  # endpoint -> Counter(stack -> samples)
+        durations = {}
+        for endpoint in sorted(os.listdir(root)):
+            directory = os.path.join(root, endpoint)
+            if not os.path.isdir(directory) or (options['endpoint'] and options['endpoint'] not in endpoint):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith('.folded'):
+                    continue
+                # <time_ns>-<pid>-<status>-<ms>ms.folded
+                parts = name[:-len('.folded')].split('-')
+                if int(parts[0]) < cutoff:
+                    continue
+                stacks = merged.setdefault(endpoint, Counter())
+                durations.setdefault(endpoint, []).append(int(parts[-1].rstrip('ms')))
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    for line in f:
+                        stack, _, count = line.rstrip('\n').rpartition(' ')
+                        if stack:
+                            stacks[stack] += int(count)
+
+        if not merged:
+            self.stdout.write("조건에 맞는 프로파일이 없습니다.")
+            return
+
+        for endpoint, stacks in merged.items():
+            ms = sorted(durations[endpoint])
+            self.stdout.write(self.style.SUCCESS(
+                f"📊 {endpoint}: 프로파일 {len(ms)}개, 샘플 {sum(stacks.values())}개, "
+                f"요청 시간 p50 {ms[len(ms) // 2]}ms / max {ms[-1]}ms"))
+            self._report(stacks, options['top'])
+
+        if options['out']:
+            # 여러 엔드포인트를 합칠 때는 엔드포인트 이름을 맨 아래 프레임으로 붙여 구분
+            with open(options['out'], 'w', encoding='utf-8') as f:
+                for endpoint, stacks in merged.items():
+                    prefix = f"{endpoint};" if len(merged) > 1 else ''
+                    for stack, count in stacks.most_common():
+                        f.write(f"{prefix}{stack} {count}\n")
+            self.stdout.write(f"💾 {options['out']} 저장 (flamegraph.pl {options['out']} > flame.svg)")
+
+    def _report(self, stacks, top):
+        total = sum(stacks.values())
+        self_samples, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+
+        self.stdout.write("  [자기 시간 기준]")
+        for frame, count in self_samples.most_common(top):
+            self.stdout.write(f"  {count / total:6.1%}  {frame}")
+        self.stdout.write("  [누적 시간 기준]")
+        for frame, count in inclusive.most_common(top):
+            self.stdout.write(f"  {count / total:6.1%}  {frame}")
@@ -0,0 +1,37 @@
+# api/management/commands/build_catalog_snapshot.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.catalog import Catalog, build_snapshot, find_dataset_path, snapshot_is_fresh, snapshot_path_for
+
+
+class Command(BaseCommand):
+    help = "recipe_dataset.csv 를 워커들이 mmap 으로 공유하는 바이너리 카탈로그 스냅샷으로 컴파일합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', help="CSV 경로 (기본: RECIPE_DATASET_PATH 또는 기본 위치)")
+        parser.add_argument('--output', help="스냅샷 경로 (기본: <csv>.snapshot)")
+        parser.add_argument('--force', action='store_true', help="최신이어도 다시 만들기")
+        parser.add_argument('--verify', action='store_true', help="저장 후 체크섬 검증")
+
+    def handle(self, *args, **options):
+        csv_path = options['csv'] or find_dataset_path()
+        if not csv_path or not os.path.exists(csv_path):
+            raise CommandError("recipe_dataset.csv 를 찾을 수 없습니다.")
+        output = options['output'] or snapshot_path_for(csv_path)
+
+        if not options['force'] and snapshot_is_fresh(csv_path, output):
+            self.stdout.write(f"스냅샷이 이미 최신입니다: {output}")
+        else:
+            started = time.perf_counter()
+            build_snapshot(csv_path, output)
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ 스냅샷 생성: {output} ({os.path.getsize(output) / 1024:.1f} KiB, "
+                f"{time.perf_counter() - started:.2f}s)"
+            ))
+
+        if options['verify']:
+            catalog = Catalog.open_snapshot(output, version='verify', verify=True)
+            self.stdout.write(f"체크섬 OK: 레시피 {len(catalog)}개, 재료 {len(catalog.vocab)}종")
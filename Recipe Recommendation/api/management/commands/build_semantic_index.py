@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.semantic import build_index
+
+
+class Command(BaseCommand):
+    help = "조리 순서가 있는 레시피를 벡터로 만들어 AI 추천 전 의미 검색 인덱스(.npy)를 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help="저장 위치 (기본: SEMANTIC_INDEX_DIR)")
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or settings.SEMANTIC_INDEX_DIR
+        started = time.perf_counter()
+        count = build_index(directory, progress=lambda done: self.stdout.write(f"⏳ {done}개"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 의미 검색 인덱스: 레시피 {count}개 -> {directory} ({time.perf_counter() - started:.1f}s)"
+        ))
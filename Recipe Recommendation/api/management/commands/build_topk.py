@@ -0,0 +1,88 @@
+# api/management/commands/build_topk.py
+import json
+from collections import Counter
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.models import UserIngredient, PrecomputedRecommendation
+from api.catalog import get_catalog
+from api.recommend_cache import fridge_fingerprint
+from api.topk import canonical_ingredients
+
+
+class Command(BaseCommand):
+    help = "자주 쓰이는 재료 조합의 top-K 추천을 미리 계산해서 PrecomputedRecommendation 에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', action='append', default=[],
+                            help="요청 로그(NDJSON, RECOMMEND_QUERY_LOG) 경로. 여러 번 지정 가능")
+        parser.add_argument('--k', type=int, default=10, help="조합당 저장할 추천 개수")
+        parser.add_argument('--min-support', type=int, default=2, help="이 횟수 이상 등장한 조합만 저장")
+        parser.add_argument('--max-subset', type=int, default=3,
+                            help="냉장고 재료에서 뽑을 부분 조합의 최대 크기 (0 이면 전체 조합만)")
+        parser.add_argument('--limit', type=int, default=5000, help="저장할 최대 조합 수")
+
+    def handle(self, *args, **options):
+        catalog = get_catalog()
+        if catalog is None:
+            raise CommandError("recipe_dataset.csv 를 찾을 수 없습니다.")
+
+        support, queries = self._mine(options)
+        frequent = [(combo, n) for combo, n in support.most_common(options['limit'])
+                    if n >= options['min_support']]
+
+        rows = [
+            PrecomputedRecommendation(
+                key=fridge_fingerprint(combo),
+                ingredients=list(combo),
+                matches=catalog.match(list(combo), limit=options['k']),
+                catalog_version=catalog.version,
+                support=n,
+            )
+            for combo, n in frequent
+        ]
+        PrecomputedRecommendation.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True, unique_fields=['key'],
+            update_fields=['ingredients', 'matches', 'catalog_version', 'support'],
+        )
+        # 카탈로그가 바뀌어서 더 이상 못 쓰는 행 정리
+        stale = PrecomputedRecommendation.objects.exclude(catalog_version=catalog.version).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(rows)}개 조합 저장 (카탈로그 {catalog.version}, stale {stale}개 삭제)"
+        ))
+        self._report(queries, {row.key for row in rows})
+
+    def _mine(self, options):
+        support = Counter()
+        fridges = {}
+        for user_id, name in UserIngredient.objects.values_list('user_id', 'name').iterator():
+            fridges.setdefault(user_id, []).append(name)
+
+        for names in fridges.values():
+            fridge = tuple(canonical_ingredients(names))
+            if not fridge: continue
+            support[fridge] += 1
+            for size in range(1, min(options['max_subset'], len(fridge) - 1) + 1):
+                support.update(combinations(fridge, size))
+
+        queries = []
+        for path in options['log']:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        combo = tuple(canonical_ingredients(json.loads(line).get('ingredients', [])))
+                    except (ValueError, AttributeError):
+                        continue
+                    if combo:
+                        support[combo] += 1
+                        queries.append(combo)
+        return support, queries
+
+    def _report(self, queries, keys):
+        """ 요청 로그를 다시 돌려서 테이블 적중률 출력 """
+        if not queries:
+            return
+        hits = sum(1 for combo in queries if fridge_fingerprint(combo) in keys)
+        self.stdout.write(f"📊 요청 로그 기준 적중률: {hits}/{len(queries)} = {hits / len(queries):.1%}")
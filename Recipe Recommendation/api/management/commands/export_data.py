@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import FORMATS, KINDS, stream
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = "레시피 / 댓글 / 즐겨찾기를 NDJSON 또는 CSV 로 스트리밍 내보내기합니다 (메모리 일정, keyset 청크)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(KINDS))
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--gzip', action='store_true', help="gzip 으로 압축")
+        parser.add_argument('-o', '--output', default='-', help="저장할 파일 (기본: 표준 출력)")
+        parser.add_argument('--chunk-size', type=int, default=None, help="한 번에 읽을 행 수 (기본: EXPORT_CHUNK_SIZE)")
+        parser.add_argument('--after', type=int, default=0, help="이 id 다음부터 (끊긴 내보내기 이어받기)")
+        parser.add_argument('--source', choices=[s for s, _ in Recipe.SOURCE_CHOICES], help="레시피 출처만 (recipes)")
+        parser.add_argument('--username', help="이 유저 것만 (comments / favorites)")
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        filters = {"chunk_size": options['chunk_size'], "after": options['after']}
+        if kind == 'recipes':
+            filters["source"] = options['source']
+        elif options['username']:
+            try:
+                filters["user"] = User.objects.get(username=options['username'])
+            except User.DoesNotExist:
+                raise CommandError(f"존재하지 않는 유저: {options['username']}")
+
+        started = time.perf_counter()
+        written = 0
+        out = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for chunk in stream(kind, options['format'], options['gzip'], **filters):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+        # 표준 출력으로 데이터를 내보낼 수 있으므로 요약은 stderr 로
+        self.stderr.write(self.style.SUCCESS(
+            f"✅ {kind} 내보내기: {written / 1024 / 1024:.1f}MB ({time.perf_counter() - started:.1f}s)"
+        ))
@@ -0,0 +1,17 @@
+# api/management/commands/profile_token.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = "요청 프로파일링용 서명 토큰을 발급합니다 (?profile=<토큰> 또는 X-Recipick-Profile 헤더)."
+
+    def handle(self, *args, **options):
+        token = make_token()
+        if not settings.PROFILING_ENABLED:
+            self.stderr.write("⚠️ PROFILING_ENABLED=False 라서 서버가 토큰을 무시합니다.")
+        self.stdout.write(token)
+        self.stderr.write(f"유효 시간 {settings.PROFILING_TOKEN_MAX_AGE}초, 예) "
+                          f"curl -H 'X-Recipick-Profile: {token}' ...")
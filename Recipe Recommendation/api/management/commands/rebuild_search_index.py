@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.search import rebuild
+
+
+class Command(BaseCommand):
+    help = "레시피 전문 검색 색인(FTS5)을 비우고 전체 레시피를 다시 색인합니다."
+
+    def handle(self, *args, **options):
+        done = rebuild(progress=lambda done: self.stdout.write(f"⏳ {done}개 색인"))
+        self.stdout.write(self.style.SUCCESS(f"✅ 레시피 {done}개 색인 완료"))
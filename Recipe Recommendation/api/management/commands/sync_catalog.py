@@ -0,0 +1,36 @@
+# api/management/commands/sync_catalog.py
+from django.core.management.base import BaseCommand, CommandError
+
+from api.catalog import find_dataset_path
+from api.catalog_sync import sync_catalog
+
+
+class Command(BaseCommand):
+    help = ("CSV 카탈로그를 Recipe/Ingredient/RecipeIngredient 테이블로 증분 동기화합니다. "
+            "내용 해시가 바뀐 줄만 bulk insert/update 합니다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help="CSV 경로 (기본: RECIPE_DATASET_PATH / recipe_dataset.csv)")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="한 트랜잭션에서 처리할 줄 수")
+        parser.add_argument('--dry-run', action='store_true', help="쓰지 않고 바뀔 건수만 계산")
+        parser.add_argument('--progress-every', type=int, default=100000, help="진행 상황 출력 간격(줄)")
+
+    def handle(self, *args, **options):
+        path = options['path'] or find_dataset_path()
+        if not path:
+            raise CommandError("recipe_dataset.csv 를 찾을 수 없습니다.")
+
+        every = options['progress_every']
+        last = {"rows": 0}
+
+        def progress(counts, elapsed):
+            if every and counts["rows"] - last["rows"] >= every:
+                last["rows"] = counts["rows"]
+                self.stdout.write(f"⏳ {counts['rows']}줄 ({counts['rows'] / elapsed:,.0f}줄/초) {counts}")
+
+        counts, elapsed = sync_catalog(path, options['chunk_size'], options['dry_run'], progress)
+        prefix = "🔎 [dry-run] " if options['dry_run'] else "✅ "
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{counts['rows']}줄 {elapsed:.1f}초 - 새로 {counts['created']}, "
+            f"변경 {counts['updated']}, 그대로 {counts['unchanged']}"
+        ))
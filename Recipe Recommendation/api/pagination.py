@@ -0,0 +1,10 @@
+# api/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class CommentCursorPagination(CursorPagination):
+    """ 최신 댓글부터 커서 페이지네이션 (recipe, created_at) 인덱스를 타서 페이지 깊이와 무관하게 일정한 비용 """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,190 @@
+# api/profiling.py
+"""
+요청 단위 샘플링 프로파일러 (운영 중 핫패스 분석용, 기본은 꺼짐)
+
+PROFILING_ENABLED=True 일 때 다음 요청만 프로파일링합니다.
+  - ?profile=<토큰> 쿼리 또는 X-Recipick-Profile: <토큰> 헤더가 붙은 요청
+    (토큰은 `python manage.py profile_token` 으로 발급, SECRET_KEY 서명 + PROFILING_TOKEN_MAX_AGE 초 유효)
+  - PROFILING_SAMPLE_RATE 비율만큼 무작위로 고른 요청
+
+요청 동안 별도 스레드가 PROFILING_INTERVAL_MS 마다 요청 스레드의 콜스택을 찍어서
+collapsed stack("a;b;c 횟수") 형식으로 PROFILING_DIR/<엔드포인트>/ 에 저장합니다 (flamegraph.pl / speedscope 로 바로 열림).
+엔드포인트마다 최근 PROFILING_MAX_PER_ENDPOINT 개만 남기고 오래된 것부터 지웁니다.
+여러 요청을 합쳐 보려면 `python manage.py aggregate_profiles`.
+
+async 뷰는 이벤트 루프 스레드를 찍으므로 동시에 돌던 다른 요청의 코루틴도 섞일 수 있고,
+sync_to_async 로 넘긴 작업은 보이지 않습니다. 동기(WSGI) 워커에서 보는 것이 정확합니다.
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import _endpoint
+
+_SALT = 'recipick.profile'
+_MAX_DEPTH = 128
+
+
+def make_token():
+    """ 프로파일링 요청용 서명 토큰 """
+    return signing.TimestampSigner(salt=_SALT).sign('profile')
+
+
+def _valid_token(value):
+    try:
+        return signing.TimestampSigner(salt=_SALT).unsign(
+            value, max_age=settings.PROFILING_TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def _frame_name(code):
+    # "함수 (상위폴더/파일.py:정의된 줄)" - 세미콜론은 collapsed 형식의 구분자라 바꿔 씀
+    path = code.co_filename.replace('\\', '/').rsplit('/', 2)
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})".replace(';', ':')
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None and len(names) < _MAX_DEPTH:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler:
+    """ 지정한 스레드의 콜스택을 interval 초마다 모으는 백그라운드 스레드 """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='recipick-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def _slug(endpoint):
+    return re.sub(r'[^A-Za-z0-9]+', '_', endpoint).strip('_') or 'root'
+
+
+def store_profile(endpoint, stacks, status, duration):
+    """ collapsed stack 파일 저장 후 엔드포인트별 최근 N 개만 유지. 저장한 상대 경로 반환 """
+    directory = os.path.join(settings.PROFILING_DIR, _slug(endpoint))
+    os.makedirs(directory, exist_ok=True)
+    # 이름 순서 = 시간 순서 (여러 워커가 같은 디렉터리에 써도 겹치지 않게 pid 포함)
+    name = f"{time.time_ns()}-{os.getpid()}-{status}-{int(duration * 1000)}ms.folded"
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    os.replace(tmp, os.path.join(directory, name))
+
+    files = sorted(n for n in os.listdir(directory) if n.endswith('.folded'))
+    for old in files[:-settings.PROFILING_MAX_PER_ENDPOINT]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except FileNotFoundError:
+            pass  # 다른 워커가 먼저 지움
+    return f"{_slug(endpoint)}/{name}"
+
+
+class _Slots:
+    """ 동시에 프로파일링하는 요청 수 상한 (넘치면 그냥 건너뜀) """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.used -= 1
+
+
+class ProfilingMiddleware:
+    """ 토큰이 붙었거나 샘플링에 걸린 요청을 Sampler 로 감싸서 저장 (sync, async 둘 다 지원) """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.slots = _Slots(settings.PROFILING_MAX_CONCURRENT)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _wanted(self, request):
+        token = request.GET.get('profile') or request.headers.get('X-Recipick-Profile')
+        if token:
+            return _valid_token(token)
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._wanted(request) or not self.slots.acquire():
+            return self.get_response(request)
+        sampler, started = self._start(), time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+            self.slots.release()
+        return self._finish(request, response, stacks, started)
+
+    async def __acall__(self, request):
+        if not self._wanted(request) or not self.slots.acquire():
+            return await self.get_response(request)
+        sampler, started = self._start(), time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+            self.slots.release()
+        return self._finish(request, response, stacks, started)
+
+    @staticmethod
+    def _start():
+        return Sampler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000).start()
+
+    @staticmethod
+    def _finish(request, response, stacks, started):
+        if stacks:
+            response['X-Recipick-Profile-Id'] = store_profile(
+                _endpoint(request), stacks, response.status_code, time.perf_counter() - started)
+        return response
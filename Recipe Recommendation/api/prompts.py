@@ -0,0 +1,164 @@
+# api/prompts.py
+"""
+Solar 프롬프트 / 토큰 예산
+
+매 호출마다 같은 긴 지시문(헬스 태그 기준, JSON 형식, 주의사항)을 요청 내용과 섞어서 보내던 것을
+  - 바뀌지 않는 지시문은 system 메시지(RECIPE_TEXT_SYSTEM / RECOMMEND_SYSTEM)로 고정하고,
+    요청마다 다른 값(요리명, 재료, 시간대, 취향)만 짧은 user 메시지에 넣습니다.
+    앞부분이 글자 하나까지 같아야 업스트림의 프롬프트 캐시(접두어 캐시)에 걸리므로 system 메시지에는
+    요청 값을 절대 넣지 않습니다.
+  - 재료는 CSV 원문("돼지고기 300g|양파 1/2개|...") 대신 공백/중복을 정리한 "돼지고기 300g, 양파 1/2개" 로,
+    최대 LLM_PROMPT_MAX_INGREDIENTS 개까지만 넣습니다.
+  - 레시피 상세 텍스트는 응답에서 쓰지 않는 ingredients 필드를 요청하지 않습니다 (재료는 DB/CSV 값을 씀).
+  - 응답 토큰은 필드 묶음별로 LLM_MAX_TOKENS_* 로 자릅니다. 잘려도 json_repair 가 닫아 주고,
+    잘린 횟수는 llm_usage 에 남으니 값이 작으면 늘리면 됩니다.
+
+호출마다 입력/출력/캐시 토큰 수와 지연 시간을 llm_usage 에 모아 /api/status/ 와 /metrics 로 내보냅니다.
+예전 프롬프트와의 비교는 `python -m benchmarks.bench_prompts`.
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+from .instrumentation import _Window
+from .catalog_rows import canonical_ingredients
+
+logger = logging.getLogger('recipick.llm')
+
+RECIPE_TEXT = 'recipe_text'
+RECOMMEND = 'recommend'
+
+_MAX_TOKENS_SETTINGS = {
+    RECIPE_TEXT: 'LLM_MAX_TOKENS_RECIPE_TEXT',
+    RECOMMEND: 'LLM_MAX_TOKENS_RECOMMEND',
+}
+
+RECIPE_TEXT_SYSTEM = (
+    "당신은 미슐랭 3스타 셰프이자 식품 영양학 전문가입니다. "
+    "사용자가 보낸 요리명과 재료로 아래 형식의 JSON 객체 하나만 응답하세요. 설명이나 코드 블록은 쓰지 마세요.\n"
+    '{"description":"요리 설명(한글 50자 내외)","cooking_time":분(숫자),"difficulty":"초급|중급|고급",'
+    '"category":"한식|양식|중식|일식|디저트|기타","late_night_suitable":true|false,"health_tags":[],'
+    '"required_equipment":["도구"],"alternative_ingredients":{"원래재료":["대체재료"]},'
+    '"steps":["조리 과정"],"tips":["팁"],'
+    '"nutrition":{"calories":0,"carbohydrate":0,"protein":0,"fat":0,"sodium":0}}\n'
+    "health_tags 는 기준에 맞을 때만 넣고 없으면 빈 배열: "
+    "뷰티 핏(저칼로리/저탄수화물 다이어트), 프로틴 업(닭가슴살/계란/콩 등 고단백), "
+    "배지라이프(고기/해산물/유제품 없는 비건), 저속노화 식단(저당/저염/가공식품 최소화, 통곡물/채소 위주).\n"
+    "steps 에는 번호를 붙이지 마세요."
+)
+
+RECOMMEND_SYSTEM = (
+    "당신은 냉장고 재료로 메뉴를 추천하는 셰프입니다. "
+    "사용자의 재료, 시간대, 취향에 가장 잘 어울리는 창의적인 레시피 3가지를 아래 항목 형식의 JSON 배열로만 응답하세요. "
+    "설명이나 코드 블록은 쓰지 마세요.\n"
+    "조건: 그 시간대에 먹기 부담스럽지 않거나 어울리는 메뉴, 가진 재료를 최대한 활용.\n"
+    '{"name":"요리 이름","description":"왜 이 시간/취향에 맞는지 한 줄","cooking_time":분(숫자),'
+    '"difficulty":"쉬움|보통|어려움","category":"한식|양식|중식|일식|기타",'
+    '"ingredients":[{"name":"재료","amount":"양"}],"steps":["조리 과정"],"health_tags":["다이어트","저염"]}'
+)
+
+
+def max_tokens(field_set):
+    return getattr(settings, _MAX_TOKENS_SETTINGS[field_set])
+
+
+def compact_ingredients(ingredients_raw):
+    """ "돼지고기  300g|양파 1/2개|돼지고기 100g" -> "돼지고기 300g, 양파 1/2개" (같은 재료는 처음 것만) """
+    seen, parts = set(), []
+    for raw in str(ingredients_raw or '').split('|'):
+        raw = ' '.join(raw.split())
+        name = raw.rsplit(' ', 1)[0]
+        if raw and name not in seen:
+            seen.add(name)
+            parts.append(raw)
+    return ', '.join(parts[:settings.LLM_PROMPT_MAX_INGREDIENTS])
+
+
+def recipe_text_messages(recipe_name, ingredients_raw):
+    """ 레시피 상세 텍스트 (get_gemini_recipe_text) """
+    return [
+        {"role": "system", "content": RECIPE_TEXT_SYSTEM},
+        {"role": "user", "content": f"요리명: {' '.join(str(recipe_name).split())}\n"
+                                    f"재료: {compact_ingredients(ingredients_raw)}"},
+    ]
+
+
+def recommend_messages(ingredients, time_slot, preferences):
+    """ 상황(시간대/취향) 맞춤 추천 """
+    names = canonical_ingredients(ingredients)[:settings.LLM_PROMPT_MAX_INGREDIENTS]
+    preferences = ' '.join(str(preferences or '').split())[:settings.LLM_PROMPT_MAX_PREFERENCE_CHARS]
+    return [
+        {"role": "system", "content": RECOMMEND_SYSTEM},
+        {"role": "user", "content": f"재료: {', '.join(names)}\n"
+                                    f"시간대: {' '.join(str(time_slot).split())}\n"
+                                    f"취향: {preferences or '없음'}"},
+    ]
+
+
+class LLMUsage:
+    """ 필드 묶음별 호출 수 / 토큰 합계 / 지연 분포 (프로세스 단위) """
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._sets = {}
+
+    def _entry(self, field_set):
+        entry = self._sets.get(field_set)
+        if entry is None:
+            entry = self._sets[field_set] = {
+                "calls": 0, "failed": 0, "truncated": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+                "latency": _Window(self.window),
+            }
+        return entry
+
+    def record(self, field_set, response, seconds):
+        """ 성공한 호출 한 건 (response 는 chat.completion) """
+        usage = getattr(response, 'usage', None)
+        prompt = getattr(usage, 'prompt_tokens', 0) or 0
+        completion = getattr(usage, 'completion_tokens', 0) or 0
+        cached = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) or 0
+        choices = getattr(response, 'choices', None) or []
+        truncated = bool(choices) and choices[0].finish_reason == 'length'
+        with self._lock:
+            entry = self._entry(field_set)
+            entry["calls"] += 1
+            entry["truncated"] += truncated
+            entry["prompt_tokens"] += prompt
+            entry["completion_tokens"] += completion
+            entry["cached_tokens"] += cached
+            entry["latency"].observe(seconds)
+        # 호출마다 찍으면 로그가 넘치므로 DEBUG 로만 (LLM_LOG_LEVEL=DEBUG 로 켬). 집계는 stats() 로 봄
+        logger.debug("LLM usage %s: prompt=%d cached=%d completion=%d %.0fms",
+                     field_set, prompt, cached, completion, seconds * 1000)
+        if truncated:
+            print(f"⚠️ [LLM 응답 잘림] {field_set}: max_tokens={max_tokens(field_set)} 에 닿았습니다.")
+
+    def record_failure(self, field_set):
+        with self._lock:
+            self._entry(field_set)["failed"] += 1
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            for field_set, entry in self._sets.items():
+                calls = entry["calls"]
+                latency = entry["latency"]
+                result[field_set] = {
+                    "calls": calls,
+                    "failed": entry["failed"],
+                    "truncated": entry["truncated"],
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "completion_tokens": entry["completion_tokens"],
+                    "cached_tokens": entry["cached_tokens"],
+                    "avg_prompt_tokens": round(entry["prompt_tokens"] / calls, 1) if calls else 0,
+                    "avg_completion_tokens": round(entry["completion_tokens"] / calls, 1) if calls else 0,
+                    **{f"p{int(q * 100)}_ms": round(v * 1000, 2) for q, v in latency.quantiles().items()},
+                    "max_tokens": max_tokens(field_set),
+                }
+            return result
+
+
+llm_usage = LLMUsage(window=settings.METRICS_WINDOW)
@@ -0,0 +1,144 @@
+# api/recently_viewed.py
+"""
+최근 본 레시피 기록 (쓰기 모으기)
+
+조회할 때마다 SQLite 에 한 번씩 쓰지 않도록, record() 는 메모리 버퍼에 (user, recipe) -> 마지막 조회 시각만
+남기고 바로 돌아갑니다. 같은 레시피를 여러 번 봐도 한 건으로 합쳐지고,
+백그라운드 스레드가 RECENT_VIEWS_FLUSH_INTERVAL 초마다 (또는 RECENT_VIEWS_MAX_PENDING 건이 쌓이면)
+bulk upsert 한 번 + 유저별 최근 RECENT_VIEWS_KEEP 개 초과분 삭제 한 번으로 내려씁니다.
+
+버퍼는 프로세스 단위이고, 프로세스가 죽으면 아직 안 쓴 기록은 사라집니다 (정상 종료 시에는 atexit 로 씀).
+읽을 때는 pending_for() 로 아직 안 쓴 내 기록을 합쳐서 방금 본 레시피도 바로 보이게 합니다.
+"""
+import atexit
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+
+class ViewBuffer:
+    """ (user_id, recipe_id) -> 마지막 조회 시각 버퍼 + 주기적 flush """
+
+    def __init__(self, flush_interval, max_pending, keep):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.keep = keep
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flush 는 한 번에 하나만
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._recorded = 0
+        self._flushed = 0
+        self._failed = 0
+        self._last_flush_ms = 0.0
+
+    def record(self, user_id, recipe_id):
+        """ 조회 한 건 기록 (DB 를 건드리지 않음. flush_interval 이 0 이면 바로 씀) """
+        with self._lock:
+            self._pending[(user_id, recipe_id)] = timezone.now()
+            self._recorded += 1
+            full = len(self._pending) >= self.max_pending
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def pending_for(self, user_id):
+        """ 아직 DB 에 안 쓴 이 유저의 {recipe_id: viewed_at} """
+        with self._lock:
+            return {recipe_id: viewed_at for (uid, recipe_id), viewed_at in self._pending.items() if uid == user_id}
+
+    def _ensure_thread(self):
+        # gunicorn preload 후 fork 된 워커에서는 스레드가 없으므로 pid 로 확인해서 다시 띄움
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='recipick-recent-views', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """ 버퍼를 비우고 한 번에 upsert + 유저별 오래된 기록 정리. 쓴 건수 반환 """
+        from recipes.models import Recipe, RecentlyViewed
+        from django.contrib.auth.models import User
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                # 그 사이에 지워진 유저/레시피가 섞여 있으면 FK 위반으로 배치 전체가 실패하므로 미리 걸러냄
+                user_ids = set(User.objects.filter(id__in={u for u, _ in batch}).values_list('id', flat=True))
+                recipe_ids = set(Recipe.objects.filter(id__in={r for _, r in batch}).values_list('id', flat=True))
+                rows = [
+                    RecentlyViewed(user_id=u, recipe_id=r, viewed_at=viewed_at)
+                    for (u, r), viewed_at in batch.items() if u in user_ids and r in recipe_ids
+                ]
+                RecentlyViewed.objects.bulk_create(
+                    rows, batch_size=500, update_conflicts=True,
+                    unique_fields=['user', 'recipe'], update_fields=['viewed_at'],
+                )
+                self._trim({row.user_id for row in rows})
+            except Exception as e:
+                self._failed += len(batch)
+                print(f"⚠️ [최근 본 레시피 저장 실패] {len(batch)}건: {e}")
+                return 0
+            self._flushed += len(rows)
+            self._last_flush_ms = (time.perf_counter() - started) * 1000
+            return len(rows)
+
+    def _trim(self, user_ids):
+        """ 유저별 최신 keep 개만 남기고 삭제 (윈도 함수로 한 번에 순위 계산) """
+        from recipes.models import RecentlyViewed
+        if not user_ids:
+            return
+        stale = (RecentlyViewed.objects.filter(user_id__in=user_ids)
+                 .annotate(rank=Window(RowNumber(), partition_by=F('user_id'),
+                                       order_by=[F('viewed_at').desc(), F('id').desc()]))
+                 .filter(rank__gt=self.keep)
+                 .values_list('id', flat=True))
+        stale = list(stale)
+        if stale:
+            RecentlyViewed.objects.filter(id__in=stale).delete()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "recorded": self._recorded,
+                "flushed": self._flushed,
+                "failed": self._failed,
+                "last_flush_ms": round(self._last_flush_ms, 2),
+                "flush_interval_s": self.flush_interval,
+                "keep": self.keep,
+            }
+
+
+recent_views = ViewBuffer(
+    flush_interval=settings.RECENT_VIEWS_FLUSH_INTERVAL,
+    max_pending=settings.RECENT_VIEWS_MAX_PENDING,
+    keep=settings.RECENT_VIEWS_KEEP,
+)
+
+atexit.register(recent_views.flush)
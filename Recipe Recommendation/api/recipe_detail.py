@@ -0,0 +1,88 @@
+# api/recipe_detail.py
+"""
+레시피 상세 문서 (재료 / 순서 / 팁 / 영양 / 작성자) 와 버전별 캐시
+
+문서는 레시피 + 작성자 JOIN 1번, 재료(+재료명 JOIN) 1번, 조리 순서 1번 = 쿼리 3번으로 만들고
+"recipe:detail:<id>:<version>" 키로 캐시합니다. 레시피 내용을 바꾸는 곳은 touch_recipe() 로 버전을 올리면
+예전 키는 더 이상 읽히지 않아 자연히 무효화됩니다 (버전은 DB 에 있으니 워커별 캐시도 어긋나지 않음).
+자주 바뀌는 즐겨찾기 수 / 댓글은 캐시하지 않고 뷰에서 따로 붙입니다.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Prefetch
+
+from recipes.models import Recipe, RecipeIngredient
+
+
+def document_queryset():
+    """ 작성자 JOIN + 재료/순서 prefetch (레시피 수와 무관하게 쿼리 3번) """
+    return (Recipe.objects.select_related('author')
+            .prefetch_related(
+                Prefetch('recipe_ingredients', queryset=RecipeIngredient.objects.select_related('ingredient')),
+                'steps',
+            ))
+
+
+def recipe_document(r):
+    """ document_queryset() 으로 읽은 레시피 -> 프론트 형식 dict """
+    return {
+        "id": f"db-{r.id}",
+        "name": r.name,
+        "cookingTime": r.cooking_time,
+        "difficulty": r.difficulty,
+        "category": r.category,
+        "dishwashing": r.dishwashing,
+        "lateNightSuitable": r.late_night_suitable,
+        "healthTags": r.health_tags,
+        "requiredEquipment": r.required_equipment,
+        "ingredients": [{"name": i.ingredient.name, "amount": i.amount} for i in r.recipe_ingredients.all()],
+        "steps": [s.content for s in r.steps.all()],
+        "tips": r.tips,
+        "nutrition": r.nutrition,
+        "image": r.image,
+        "description": r.description,
+        "author": r.author.username if r.author else "AI 셰프",
+        "isUserRecipe": r.source == Recipe.SOURCE_USER,
+        "createdAt": r.created_at,
+        "version": r.version,
+    }
+
+
+def ai_recipe_payload(doc):
+    """ recipe_document() -> AI 맞춤 추천 응답 형식 (LLM 이 주는 목록과 같은 모양 + id / 이미지) """
+    return {
+        "id": doc["id"],
+        "name": doc["name"],
+        "description": doc["description"],
+        "cooking_time": doc["cookingTime"],
+        "difficulty": doc["difficulty"],
+        "category": doc["category"],
+        "ingredients": doc["ingredients"],
+        "steps": doc["steps"],
+        "health_tags": doc["healthTags"],
+        "image": doc["image"],
+    }
+
+
+def _cache_key(recipe_id, version):
+    return f"recipe:detail:{recipe_id}:{version}"
+
+
+def get_recipe_document(recipe_id):
+    """ 캐시 히트면 버전 확인 쿼리 1번, 아니면 문서를 새로 만들어 저장. 없는 레시피면 None """
+    version = Recipe.objects.filter(id=recipe_id).values_list('version', flat=True).first()
+    if version is None:
+        return None
+    doc = cache.get(_cache_key(recipe_id, version))
+    if doc is None:
+        recipe = document_queryset().filter(id=recipe_id).first()
+        if recipe is None:
+            return None
+        doc = recipe_document(recipe)
+        cache.set(_cache_key(recipe_id, recipe.version), doc, settings.RECIPE_DETAIL_CACHE_TIMEOUT)
+    return doc
+
+
+def touch_recipe(recipe_id):
+    """ 레시피 내용(재료/순서 포함)을 다 바꾼 뒤 호출: 버전을 올려 캐시된 상세 문서를 무효화 """
+    Recipe.objects.filter(id=recipe_id).update(version=F('version') + 1)
@@ -0,0 +1,64 @@
+# api/recommend_cache.py
+"""
+"내 냉장고로 추천" 결과 저장
+
+유저별로 (냉장고 지문, 카탈로그 버전) 과 함께 랭킹 결과를 UserRecommendation 테이블에 저장합니다.
+프로세스 메모리 캐시(LocMemCache)와 달리 모든 워커/서버가 같은 행을 보므로,
+한 워커가 냉장고 변경 뒤 미리 계산해 두면 다른 워커로 간 요청도 바로 씁니다.
+냉장고가 바뀌면 행을 지우고, 설정에 따라 백그라운드에서 바로 다시 계산해 둡니다.
+"""
+import hashlib
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from recipes.models import UserRecommendation
+
+
+def fridge_fingerprint(names):
+    """ 재료 순서와 무관한 냉장고 지문 """
+    canonical = '|'.join(sorted(set(names)))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def get_user_matches(user_id, names):
+    """ 저장된 랭킹이 최신이면 그대로, 아니면 새로 계산해서 저장. (matches, hit) 반환 """
+    from .catalog import catalog_version
+    fingerprint = fridge_fingerprint(names)
+    version = catalog_version()
+    fresh_since = timezone.now() - timedelta(seconds=settings.RECOMMEND_ME_CACHE_TIMEOUT)
+    row = (UserRecommendation.objects
+           .filter(user_id=user_id, fingerprint=fingerprint, catalog_version=version, updated_at__gte=fresh_since)
+           .values_list('matches', flat=True).first())
+    if row is not None:
+        return row, True
+    return _store_user_matches(user_id, names, fingerprint, version), False
+
+
+def _store_user_matches(user_id, names, fingerprint=None, version=None):
+    from .catalog import catalog_version, match_recipes
+    matches = match_recipes(names)
+    UserRecommendation.objects.update_or_create(user_id=user_id, defaults={
+        'fingerprint': fingerprint or fridge_fingerprint(names),
+        'catalog_version': version or catalog_version(),
+        'matches': matches,
+    })
+    return matches
+
+
+def _precompute(user_id, names):
+    try:
+        _store_user_matches(user_id, names)
+    finally:
+        # 요청 밖의 일회용 스레드라 이 스레드의 DB 연결은 직접 닫음
+        connection.close()
+
+
+def invalidate_user_matches(user_id, names=None):
+    """ 냉장고 변경 시 호출. names 를 주면 (설정에 따라) 백그라운드로 미리 계산 """
+    UserRecommendation.objects.filter(user_id=user_id).delete()
+    if names is not None and settings.RECOMMEND_ME_PRECOMPUTE:
+        threading.Thread(target=_precompute, args=(user_id, list(names)), daemon=True).start()
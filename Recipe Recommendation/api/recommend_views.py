@@ -0,0 +1,241 @@
+# api/recommend_views.py
+"""
+레시피 추천 API (CSV 매칭 + AI 생성)
+
+카탈로그(numpy/pandas)와 AI 클라이언트는 뷰 안에서 필요할 때 불러옵니다.
+"""
+import traceback
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from recipes.models import CatalogEntry, Recipe, Ingredient, RecipeIngredient, Step, UserIngredient
+from .catalog_rows import row_hash, split_ingredients
+from .admission import RateLimited, Shed, UpstreamBusy, client_keys, rate_limiter, upstream_gate
+from .ai import UPSTAGE_API_KEY, get_gemini_recipe_text, save_image_from_gemini, solar_complete
+from .instrumentation import stage
+from .prompts import RECOMMEND, recommend_messages
+from .recipe_detail import touch_recipe
+
+def _ensure_recipe(item):
+    """ 매칭된 CSV 레시피 -> DB 레시피 (재료까지). (source, source_key) 유니크 인덱스로 조회 한 번 """
+    # 레시피 + 재료 + CatalogEntry 를 한 트랜잭션으로 (중간에 실패해도 재료 없는 레시피가 남지 않도록)
+    with stage('get_or_create'), transaction.atomic():
+        # 동시에 같은 레시피를 만들면 한쪽은 유니크 제약에 걸리고 get_or_create 가 다시 조회해서 같은 행을 돌려줌
+        recipe, created = Recipe.objects.get_or_create(
+            source=Recipe.SOURCE_CATALOG,
+            source_key=item['title'],
+            defaults={
+                'name': item['title'],
+                'cooking_time': item['time'],
+                'difficulty': item['difficulty'],
+                'category': item['category']
+            }
+        )
+
+        if created:
+            for name, amount in split_ingredients(item['ingredients_raw']):
+                ing_obj, _ = Ingredient.objects.get_or_create(name=name)
+                RecipeIngredient.objects.get_or_create(recipe=recipe, ingredient=ing_obj, defaults={'amount': amount})
+            # 다음 sync_catalog 가 같은 내용이면 건너뛰도록 해시 기록
+            CatalogEntry.objects.create(recipe=recipe, content_hash=row_hash(item))
+    return recipe
+
+def _needs_image(recipe):
+    return not recipe.image or "unsplash" in str(recipe.image)
+
+def _apply_recipe_text(recipe, ai_data):
+    if hasattr(recipe, 'description'): recipe.description = ai_data.get('description', '')
+    if hasattr(recipe, 'tips'): recipe.tips = ai_data.get('tips', [])
+    if hasattr(recipe, 'nutrition'): recipe.nutrition = ai_data.get('nutrition', {})
+    recipe.save()
+    
+    for i, s in enumerate(ai_data.get('steps', []), 1): 
+        Step.objects.create(recipe=recipe, order=i, content=s)
+    touch_recipe(recipe.id)
+
+def _apply_image(recipe, image_url):
+    if image_url:
+        recipe.image = image_url
+        recipe.save()
+        touch_recipe(recipe.id)
+    elif not recipe.image:
+        recipe.image = f"https://source.unsplash.com/800x600/?{recipe.name},food"
+        recipe.save()
+        touch_recipe(recipe.id)
+
+def _serialize_recipe(recipe, current_ai_data):
+    with stage('serialize'):
+        return _recipe_payload(recipe, current_ai_data)
+
+def _recipe_payload(recipe, current_ai_data):
+    recipe_ings = RecipeIngredient.objects.filter(recipe=recipe)
+    recipe_steps = Step.objects.filter(recipe=recipe).order_by('order')
+
+    return {
+        "id": f"db-{recipe.id}", 
+        "name": recipe.name,
+        "cookingTime": current_ai_data.get('cooking_time', recipe.cooking_time),
+        "difficulty": current_ai_data.get('difficulty', recipe.difficulty),
+        "category": current_ai_data.get('category', recipe.category),
+        "lateNightSuitable": current_ai_data.get('late_night_suitable', False),
+        "healthTags": current_ai_data.get('health_tags', []),
+        "ingredients": [{"name": i.ingredient.name, "amount": i.amount} for i in recipe_ings],
+        "steps": [s.content for s in recipe_steps],
+        "image": recipe.image,
+        "description": getattr(recipe, 'description', current_ai_data.get('description', '')),
+        "tips": getattr(recipe, 'tips', current_ai_data.get('tips', [])),
+        "nutrition": getattr(recipe, 'nutrition', current_ai_data.get('nutrition', {})),
+        "requiredEquipment": current_ai_data.get('required_equipment', ["조리 도구"]),
+        "alternativeIngredients": current_ai_data.get('alternative_ingredients', {}),
+        "author": "AI 셰프",
+        "isUserRecipe": False,
+    }
+
+def _build_recommendations(matched_list, rate_key=None):
+    """ 매칭된 CSV 레시피를 DB 레시피로 만들고 (필요 시 AI 텍스트/이미지 생성) 응답 형태로 변환
+
+    AI 생성이 처음 필요해질 때 rate_key(client_keys 목록)의 요청 한도에서 토큰을 하나씩 씁니다.
+    한도를 넘었거나 업스트림 자리가 없으면 남은 레시피는 AI 생성 없이 돌려줍니다.
+    (결과, AI 생성을 건너뛰었는지) 반환
+    """
+    final_results = []
+    # 응답의 AI 필드는 이번 요청에서 마지막으로 생성된 AI 텍스트 기준 (없으면 DB 값)
+    ai_data = {}
+    enrich, charged, degraded = True, rate_key is None, False
+
+    for item in matched_list:
+        recipe = _ensure_recipe(item)
+        needs_text = not recipe.steps.exists()
+        needs_image = _needs_image(recipe)
+
+        if enrich and (needs_text or needs_image):
+            try:
+                if not charged:
+                    rate_limiter.take(rate_key)
+                    charged = True
+
+                # AI 텍스트 생성
+                if needs_text:
+                    ai_data = get_gemini_recipe_text(item['title'], item['ingredients_raw'])
+                    _apply_recipe_text(recipe, ai_data)
+
+                # AI 이미지 생성
+                if needs_image:
+                    _apply_image(recipe, save_image_from_gemini(item['title']))
+            except Shed:
+                enrich, degraded = False, True
+
+        # 보강을 건너뛴 레시피는 기본 이미지만 (다음 요청 때 다시 생성 시도)
+        if not enrich and needs_image:
+            _apply_image(recipe, None)
+
+        final_results.append(_serialize_recipe(recipe, ai_data))
+
+    return final_results, degraded
+
+def _recommend_response(results, degraded):
+    if degraded:
+        upstream_gate.record_degraded()
+        return Response(results, headers={"X-Recommend-Degraded": "ai-skipped"})
+    return Response(results)
+
+def _find_matches(user_ingredients):
+    """ 미리 계산된 인기 조합이면 점수 계산 생략 """
+    from .topk import lookup_precomputed, log_query
+    from .catalog import match_recipes
+    log_query(user_ingredients)
+
+    matched_list = lookup_precomputed(user_ingredients)
+    if matched_list is None:
+        matched_list = match_recipes(user_ingredients)
+    return matched_list
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def recommend_recipes(request):
+    try:
+        # 사용자가 입력한 재료 (공백 제거)
+        user_ingredients = [u.strip() for u in request.data.get("ingredients", [])]
+        return _recommend_response(*_build_recommendations(
+            _find_matches(user_ingredients), rate_key=client_keys(request)))
+    except Exception as e:
+        traceback.print_exc()
+        return Response({"error": str(e)}, status=500)
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def recommend_for_me(request):
+    """ 저장된 내 냉장고 재료(UserIngredient)로 추천 (랭킹은 유저별 캐시) """
+    username = request.GET.get('username')
+    if not username: return Response({"error": "유저 정보 필요"}, 400)
+    try: user = User.objects.get(username=username)
+    except User.DoesNotExist: return Response({"error": "존재하지 않는 유저"}, 404)
+
+    try:
+        names = list(UserIngredient.objects.filter(user=user).values_list('name', flat=True))
+        from .recommend_cache import get_user_matches
+        matched_list, _ = get_user_matches(user.id, names)
+        return _recommend_response(*_build_recommendations(
+            matched_list, rate_key=client_keys(request, user)))
+    except Exception as e:
+        traceback.print_exc()
+        return Response({"error": str(e)}, status=500)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def recommend_recipes_ai(request):
+    """ 사용자의 상황(시간, 재료, 취향)에 맞는 AI 맞춤 추천 """
+    try:
+        data = request.data
+        ingredients = data.get('ingredients', [])
+        time_slot = data.get('timeSlot', '점심') # 아침, 점심, 저녁, 야식
+        preferences = data.get('preferences', '') # 예: 매운거 좋아함, 다이어트 중
+
+        # 0. 같은 요청의 최근 결과나 비슷한 저장 레시피가 있으면 LLM 없이 바로 (요청 한도도 쓰지 않음)
+        from .ai_results import fingerprint, get_fresh, store
+        from .semantic import retrieve
+        key = fingerprint(ingredients, time_slot, preferences)
+        saved = get_fresh(key)
+        if saved:
+            return Response(saved, status=200, headers={"X-Recommend-Source": "saved"})
+        stored = retrieve(ingredients, time_slot, preferences)
+        if stored:
+            return Response(stored, status=200, headers={"X-Recommend-Source": "stored"})
+
+        # 0-1. 요청 한도 (IP + 로그인 유저 별)
+        rate_limiter.take(client_keys(request))
+
+        # 1. AI 프롬프트 작성 (고정 지시문 + 짧은 요청 내용, api/prompts.py)
+        messages = recommend_messages(ingredients, time_slot, preferences)
+
+        # 2. AI 요청 (Upstage Solar)
+        if not UPSTAGE_API_KEY:
+             return Response({"error": "AI 키가 설정되지 않았습니다."}, status=500)
+
+        response_text = solar_complete(RECOMMEND, messages)
+
+        # 3. 응답 파싱
+        import json_repair # (설치 필요: pip install json_repair)
+        recipes_data = json_repair.loads(response_text)
+
+        # 4. DB 에 저장해서 id 를 붙여 돌려줌 (이미지는 백그라운드에서 생성, 형식이 이상하면 받은 그대로)
+        saved = store(key, ingredients, time_slot, preferences, recipes_data)
+        return Response(saved or recipes_data, status=200, headers={"X-Recommend-Source": "generated"})
+
+    except RateLimited as e:
+        return Response({"error": "AI 추천 요청이 너무 많습니다. 잠시 후 다시 시도해주세요."},
+                        status=status.HTTP_429_TOO_MANY_REQUESTS,
+                        headers={"Retry-After": str(e.retry_after)})
+    except UpstreamBusy as e:
+        return Response({"error": "AI 서버가 혼잡합니다. 잠시 후 다시 시도해주세요."},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        print(f"❌ AI 추천 실패: {e}")
+        return Response({"error": str(e)}, status=500)
@@ -0,0 +1,173 @@
+# api/search.py
+"""
+레시피 전문 검색 (SQLite FTS5 + 한국어용 2-gram)
+
+검색 대상은 레시피 이름 / 재료명 / 설명 / 조리 순서입니다.
+  - FTS5 기본 토크나이저는 띄어쓰기 단위라 "김치볶음밥" 안의 "볶음" 을 못 찾으므로,
+    단어를 겹치는 두 글자씩 (김치 치볶 볶음 음밥) 쪼개서 색인하고 검색어도 같은 방식으로 쪼개 구(phrase)로 찾습니다.
+  - 랭킹은 FTS5 bm25 (이름 > 재료 > 설명 > 조리 순서 가중치). 색인은 FTS5 의 역색인이라
+    레시피/조리 순서가 늘어도 검색어에 걸리는 문서 수만큼만 읽습니다.
+  - 레시피/조리 순서/레시피 재료 테이블의 트리거가 바뀐 레시피 id 를 recipe_search_dirty 에 쌓고
+    refresh() 가 그 레시피만 다시 색인합니다 (bulk_create / update() / executemany 로 바꿔도 트리거는 탐).
+    검색 API 는 검색 전에 최대 SEARCH_REFRESH_LIMIT 개, sync_catalog 는 청크마다 전부 반영합니다.
+  - 테이블/트리거는 모델이 아니라서 migrate 가 끝날 때마다 (post_migrate) 없으면 만듭니다.
+    Django 가 SQLite 테이블을 다시 만들면 (AlterField 등) 트리거가 같이 사라지기 때문입니다.
+    처음 만들 때는 전체 레시피를 대기열에 넣습니다. 전체 재색인은 `python manage.py rebuild_search_index`.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from recipes.models import Recipe, RecipeIngredient, Step
+
+# 밑줄은 unicode61 토크나이저에서 구분자라 단어 글자에서 뺌
+_WORD = re.compile(r'[^\W_]+')
+_MAX_QUERY_WORDS = 10
+_BATCH = 500
+# bm25 컬럼 가중치 (name, ingredients, description, steps 순서)
+_RANK = 'bm25(10.0, 4.0, 2.0, 1.0)'
+
+
+def bigrams(text):
+    """ "김치볶음밥 2인분" -> "김치 치볶 볶음 음밥 2인 인분" (한 글자 단어는 그대로) """
+    grams = []
+    for word in _WORD.findall(str(text or '').lower()):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(grams)
+
+
+def match_expression(query):
+    """ 검색어 -> FTS5 MATCH 식 (단어마다 2-gram 구, 단어끼리는 AND). 찾을 단어가 없으면 None
+
+    "볶음밥 김치" -> '"볶음 음밥" "김치"', 한 글자는 접두어 검색 "김" -> '"김"*'
+    """
+    terms = []
+    for word in _WORD.findall(query.lower())[:_MAX_QUERY_WORDS]:
+        if len(word) == 1:
+            terms.append(f'"{word}"*')
+        else:
+            terms.append('"' + bigrams(word) + '"')
+    return ' '.join(terms) or None
+
+
+def _ddl():
+    dirty = 'recipe_search_dirty'
+    yield ("CREATE VIRTUAL TABLE IF NOT EXISTS recipe_search "
+           "USING fts5(name, ingredients, description, steps, tokenize='unicode61')")
+    # id 는 처리한 지점까지만 지우기 위한 순번 (refresh 중에 새로 쌓인 건 남음)
+    yield f"CREATE TABLE IF NOT EXISTS {dirty} (id INTEGER PRIMARY KEY AUTOINCREMENT, recipe_id INTEGER NOT NULL)"
+    for model, column, on_update in (
+        (Recipe, 'id', 'UPDATE OF name, description'),
+        (Step, 'recipe_id', 'UPDATE'),
+        (RecipeIngredient, 'recipe_id', 'UPDATE'),
+    ):
+        table = model._meta.db_table
+        yield (f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} "
+               f"BEGIN INSERT INTO {dirty}(recipe_id) VALUES (new.{column}); END")
+        yield (f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER {on_update} ON {table} "
+               f"BEGIN INSERT INTO {dirty}(recipe_id) VALUES (old.{column}), (new.{column}); END")
+        yield (f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} "
+               f"BEGIN INSERT INTO {dirty}(recipe_id) VALUES (old.{column}); END")
+
+
+def install(using=DEFAULT_DB_ALIAS):
+    """ 검색 테이블/트리거가 없으면 만듦 (여러 번 불러도 됨). 새로 만들었으면 True """
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipe_search'")
+        fresh = cursor.fetchone() is None
+        for sql in _ddl():
+            cursor.execute(sql)
+        if fresh:
+            cursor.execute("INSERT INTO recipe_search(recipe_search, rank) VALUES ('rank', %s)", [_RANK])
+            cursor.execute(f"INSERT INTO recipe_search_dirty(recipe_id) SELECT id FROM {Recipe._meta.db_table}")
+    return fresh
+
+
+def install_on_migrate(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # post_migrate 는 앱마다 오므로 recipes 앱 차례에 한 번만
+    if sender.label == 'recipes':
+        install(using)
+
+
+def _batched(items):
+    items = list(items)
+    for i in range(0, len(items), _BATCH):
+        yield items[i:i + _BATCH]
+
+
+def _documents(recipe_ids):
+    """ 레시피 id -> (rowid, name, ingredients, description, steps) 2-gram 행 (지워진 레시피는 빠짐) """
+    docs = {}
+    for ids in _batched(recipe_ids):
+        for recipe_id, name, description in Recipe.objects.filter(id__in=ids).values_list('id', 'name', 'description'):
+            docs[recipe_id] = (name, [], description, [])
+        for recipe_id, name in (RecipeIngredient.objects.filter(recipe_id__in=ids)
+                                .values_list('recipe_id', 'ingredient__name')):
+            if recipe_id in docs:
+                docs[recipe_id][1].append(name)
+        for recipe_id, content in (Step.objects.filter(recipe_id__in=ids).order_by('recipe_id', 'order')
+                                   .values_list('recipe_id', 'content')):
+            if recipe_id in docs:
+                docs[recipe_id][3].append(content)
+    return [
+        (recipe_id, bigrams(name), bigrams(' '.join(ingredients)), bigrams(description), bigrams(' '.join(steps)))
+        for recipe_id, (name, ingredients, description, steps) in docs.items()
+    ]
+
+
+def refresh(limit=None):
+    """ 대기열에 쌓인 레시피를 다시 색인. 처리한 레시피 수 반환 """
+    with connection.cursor() as cursor:
+        if limit:
+            cursor.execute("SELECT id, recipe_id FROM recipe_search_dirty ORDER BY id LIMIT %s", [limit])
+        else:
+            cursor.execute("SELECT id, recipe_id FROM recipe_search_dirty ORDER BY id")
+        queued = cursor.fetchall()
+    if not queued:
+        return 0
+
+    recipe_ids = {recipe_id for _, recipe_id in queued}
+    rows = _documents(recipe_ids)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for ids in _batched(recipe_ids):
+            cursor.execute(f"DELETE FROM recipe_search WHERE rowid IN ({', '.join(['%s'] * len(ids))})", ids)
+        cursor.executemany(
+            "INSERT INTO recipe_search(rowid, name, ingredients, description, steps) VALUES (%s, %s, %s, %s, %s)",
+            rows)
+        cursor.execute("DELETE FROM recipe_search_dirty WHERE id <= %s", [queued[-1][0]])
+    return len(recipe_ids)
+
+
+def rebuild(progress=None):
+    """ 색인을 비우고 전체 레시피를 다시 색인. progress(done) 는 배치마다 호출 """
+    install()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("DELETE FROM recipe_search")
+        cursor.execute("DELETE FROM recipe_search_dirty")
+        cursor.execute(f"INSERT INTO recipe_search_dirty(recipe_id) SELECT id FROM {Recipe._meta.db_table}")
+    done = 0
+    while True:
+        count = refresh(limit=5000)
+        if not count:
+            return done
+        done += count
+        if progress:
+            progress(done)
+
+
+def search(query, offset=0, limit=20):
+    """ 랭킹 순 레시피 id 목록 """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM recipe_search WHERE recipe_search MATCH %s ORDER BY rank LIMIT %s OFFSET %s",
+            [expression, limit, offset])
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,221 @@
+# api/semantic.py
+"""
+저장된 레시피 의미 검색 (AI 추천 전에 먼저 찾아보기)
+
+AI 맞춤 추천은 매번 LLM 에게 레시피를 새로 지어내게 했는데, 비슷한 레시피가 이미 DB 에 있으면
+그걸 돌려주는 편이 빠르고 공짜입니다.
+  - 조리 순서까지 있는 레시피(사용자 작성 / AI 가 채운 카탈로그)를 벡터로 만들어
+    SEMANTIC_INDEX_DIR 에 .npy 로 저장합니다 (manage.py build_semantic_index).
+    워커는 mmap 으로 열고, 포인터 파일(semantic.json)이 바뀌면 다시 엽니다.
+  - 요청(재료 + 시간대 + 취향)도 같은 방식으로 벡터로 만들어 코사인 유사도 상위 SEMANTIC_TOP_K 개를 찾고,
+    1등이 SEMANTIC_MIN_SIMILARITY 이상이면 LLM 을 부르지 않고 그 레시피들을 돌려줍니다.
+  - 임베딩 함수는 SEMANTIC_EMBEDDER 로 바꿀 수 있습니다. embed(ingredients, text) -> 1차원 벡터.
+    기본값은 오프라인에서 도는 해시 bag-of-features (재료명 + 글자 2-gram, 부호 있는 feature hashing).
+  - 인덱스는 전체 행렬 곱(flat) 입니다. 10만 개 x 256차원에서 한 번에 약 10ms 라 IVF 는 아직 필요 없음.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from recipes.models import Recipe, RecipeIngredient, Step
+from .instrumentation import stage
+from .recipe_detail import ai_recipe_payload, document_queryset, recipe_document
+from .search import bigrams
+
+POINTER_NAME = 'semantic.json'
+INDEX_FORMAT = 1
+_BATCH = 2000
+# 요청은 대부분 재료 목록이라 재료 일치가 설명/이름 글자 겹침보다 크게 보이도록
+_INGREDIENT_WEIGHT = 3.0
+_TEXT_WEIGHT = 0.5
+
+
+def _tokens(ingredients, text):
+    """ (feature, 가중치) - 재료명은 통째로, 재료명/본문은 글자 2-gram 으로도 """
+    for name in ingredients:
+        name = str(name).strip().lower()
+        if name:
+            yield 'i:' + name, _INGREDIENT_WEIGHT
+    for gram in bigrams(' '.join([*map(str, ingredients), text])).split():
+        yield 't:' + gram, _TEXT_WEIGHT
+
+
+def hashed_embedding(ingredients, text):
+    """ 기본 임베딩: feature 를 crc32 로 SEMANTIC_DIM 칸에 부호와 함께 더한 뒤 L2 정규화 """
+    vec = np.zeros(settings.SEMANTIC_DIM, dtype=np.float32)
+    for feature, weight in _tokens(ingredients, text):
+        h = zlib.crc32(feature.encode('utf-8'))
+        vec[h % settings.SEMANTIC_DIM] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def get_embedder():
+    return import_string(settings.SEMANTIC_EMBEDDER)
+
+
+def recipe_text(name, category, description, health_tags, late_night_suitable):
+    parts = [name, category, description, *health_tags]
+    if late_night_suitable:
+        parts.append('야식')
+    return ' '.join(str(p) for p in parts if p)
+
+
+def query_text(time_slot, preferences):
+    return f"{time_slot} {preferences}"
+
+
+# ----------------------------------------------------------------------
+# 인덱스 만들기 / 열기
+# ----------------------------------------------------------------------
+
+def _indexable_ids():
+    # 조리 순서가 없는 레시피(아직 AI 가 안 채운 카탈로그)는 돌려줘도 쓸모가 없어서 뺌
+    return list(Step.objects.order_by('recipe_id').values_list('recipe_id', flat=True).distinct())
+
+
+def _embed_batch(embed, ids):
+    ingredients = {}
+    for recipe_id, name in RecipeIngredient.objects.filter(recipe_id__in=ids).values_list('recipe_id', 'ingredient__name'):
+        ingredients.setdefault(recipe_id, []).append(name)
+    rows = (Recipe.objects.filter(id__in=ids).order_by('id')
+            .values_list('id', 'name', 'category', 'description', 'health_tags', 'late_night_suitable'))
+    found, vectors = [], []
+    for recipe_id, name, category, description, health_tags, late_night in rows:
+        found.append(recipe_id)
+        vectors.append(embed(ingredients.get(recipe_id, []),
+                             recipe_text(name, category, description, health_tags or [], late_night)))
+    return found, vectors
+
+
+def build_index(directory=None, progress=None):
+    """ DB 레시피 -> 벡터 행렬 저장 후 포인터 파일을 바꿔 끼움. 저장한 레시피 수 반환 """
+    directory = directory or settings.SEMANTIC_INDEX_DIR
+    os.makedirs(directory, exist_ok=True)
+    embed = get_embedder()
+    all_ids, vectors = [], []
+    recipe_ids = _indexable_ids()
+    for i in range(0, len(recipe_ids), _BATCH):
+        found, batch = _embed_batch(embed, recipe_ids[i:i + _BATCH])
+        all_ids.extend(found)
+        vectors.extend(batch)
+        if progress:
+            progress(len(all_ids))
+
+    matrix = np.vstack(vectors).astype(np.float32) if vectors else np.zeros((0, 1), dtype=np.float32)
+    build = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    np.save(os.path.join(directory, f"{build}.vectors.npy"), matrix)
+    np.save(os.path.join(directory, f"{build}.ids.npy"), np.asarray(all_ids, dtype=np.int64))
+    pointer = {"format": INDEX_FORMAT, "build": build, "embedder": settings.SEMANTIC_EMBEDDER,
+               "count": len(all_ids), "dim": int(matrix.shape[1]), "built_at": time.time()}
+    # 동시에 빌드해도 서로의 임시 파일을 덮어쓰지 않도록 고유한 임시 파일에 쓰고 바꿔 끼움
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(pointer, f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(directory, POINTER_NAME))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # 예전 빌드 정리 (이미 열어 둔 워커는 mmap 이라 지워도 계속 읽힘)
+    for name in os.listdir(directory):
+        if name.endswith('.npy') and not name.startswith(build):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+    return len(all_ids)
+
+
+class SemanticIndex:
+    """ (n, dim) 정규화 벡터 + 레시피 id (둘 다 mmap) """
+
+    def __init__(self, vectors, ids, pointer):
+        self.vectors = vectors
+        self.ids = ids
+        self.pointer = pointer
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def open(cls, directory):
+        with open(os.path.join(directory, POINTER_NAME), encoding='utf-8') as f:
+            pointer = json.load(f)
+        if pointer.get("format") != INDEX_FORMAT:
+            raise ValueError("semantic index format mismatch")
+        build = pointer["build"]
+        vectors = np.load(os.path.join(directory, f"{build}.vectors.npy"), mmap_mode='r')
+        ids = np.load(os.path.join(directory, f"{build}.ids.npy"), mmap_mode='r')
+        return cls(vectors, ids, pointer)
+
+    def nearest(self, vector, k):
+        """ 코사인 유사도 상위 k 개 [(recipe_id, score)] """
+        if not len(self) or vector.shape[0] != self.vectors.shape[1]:
+            return []
+        scores = self.vectors @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """ 프로세스 공용 인덱스 (없거나 임베더가 다르면 None). 포인터 파일이 바뀌면 다시 엶 """
+    global _index, _index_mtime
+    pointer_path = os.path.join(settings.SEMANTIC_INDEX_DIR, POINTER_NAME)
+    try:
+        mtime = os.stat(pointer_path).st_mtime_ns
+    except OSError:
+        return None
+    if mtime != _index_mtime:
+        with _index_lock:
+            if mtime != _index_mtime:
+                try:
+                    index = SemanticIndex.open(settings.SEMANTIC_INDEX_DIR)
+                    if index.pointer.get("embedder") != settings.SEMANTIC_EMBEDDER:
+                        print("⚠️ [의미 검색] 인덱스의 임베더가 설정과 달라 사용하지 않습니다. build_semantic_index 를 다시 실행하세요.")
+                        index = None
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ [의미 검색 인덱스 열기 실패]: {e}")
+                    index = None
+                _index, _index_mtime = index, mtime
+    return _index
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+
+def retrieve(ingredients, time_slot, preferences):
+    """ 충분히 비슷한 저장 레시피가 있으면 AI 추천 형식 목록, 없으면 None (-> LLM 호출) """
+    if not settings.SEMANTIC_ENABLED:
+        return None
+    index = get_index()
+    if index is None or not len(index):
+        return None
+    with stage('semantic'):
+        vector = get_embedder()(list(ingredients), query_text(time_slot, preferences)).astype(np.float32)
+        hits = [(recipe_id, score) for recipe_id, score in index.nearest(vector, settings.SEMANTIC_TOP_K)
+                if score >= settings.SEMANTIC_MIN_SIMILARITY]
+        if not hits:
+            return None
+        recipes = document_queryset().in_bulk([recipe_id for recipe_id, _ in hits])
+        results = [{**ai_recipe_payload(recipe_document(recipes[recipe_id])), "similarity": round(score, 4)}
+                   for recipe_id, score in hits if recipe_id in recipes]
+    return results or None
@@ -1,3 +1,116 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import RequestFactory, TestCase, override_settings
+
+from .admission import RateLimited, RateLimiter, client_keys, rate_limiter
+
+
+class RateLimiterTests(TestCase):
+    """ 토큰 버킷: 여러 키를 한 번에 쓰면 전부 차감되거나 전부 그대로 """
+
+    def test_rejects_with_retry_after_when_bucket_is_empty(self):
+        limiter = RateLimiter(per_minute=6, burst=2)
+        limiter.take(['ip:1.1.1.1'])
+        limiter.take(['ip:1.1.1.1'])
+        with self.assertRaises(RateLimited) as ctx:
+            limiter.take(['ip:1.1.1.1'])
+        # 분당 6개 = 10초에 하나
+        self.assertEqual(ctx.exception.retry_after, 10)
+
+    def test_rejected_take_does_not_charge_other_keys(self):
+        limiter = RateLimiter(per_minute=1, burst=1)
+        limiter.take(['user:1'])
+        with self.assertRaises(RateLimited):
+            limiter.take(['ip:1.1.1.1', 'user:1'])
+        # 거절된 요청은 IP 버킷을 쓰지 않았으므로 IP 만으로는 아직 통과
+        limiter.take(['ip:1.1.1.1'])
+
+    def test_zero_rate_disables_limit(self):
+        limiter = RateLimiter(per_minute=0, burst=0)
+        for _ in range(5):
+            limiter.take(['ip:1.1.1.1'])
+
+
+class ClientKeysTests(TestCase):
+    """ 요청 한도 키: IP 는 항상, 유저 키는 로그인했거나 뷰가 확인한 유저일 때만 """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user('tester', password='pw')
+
+    def _request(self, user=None, **extra):
+        request = self.factory.post('/api/recommend/', REMOTE_ADDR='10.0.0.1', **extra)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_anonymous_request_uses_ip_only(self):
+        self.assertEqual(client_keys(self._request()), ['ip:10.0.0.1'])
+
+    def test_authenticated_request_adds_user_key(self):
+        self.assertEqual(client_keys(self._request(self.user)), ['ip:10.0.0.1', f'user:{self.user.pk}'])
+
+    def test_verified_user_adds_user_key(self):
+        self.assertEqual(client_keys(self._request(), self.user), ['ip:10.0.0.1', f'user:{self.user.pk}'])
+
+    @override_settings(ADMISSION_TRUST_X_FORWARDED_FOR=False)
+    def test_forwarded_for_ignored_by_default(self):
+        request = self._request(HTTP_X_FORWARDED_FOR='203.0.113.5')
+        self.assertEqual(client_keys(request), ['ip:10.0.0.1'])
+
+    @override_settings(ADMISSION_TRUST_X_FORWARDED_FOR=True)
+    def test_forwarded_for_used_behind_trusted_proxy(self):
+        request = self._request(HTTP_X_FORWARDED_FOR='203.0.113.5, 10.0.0.1')
+        self.assertEqual(client_keys(request), ['ip:203.0.113.5'])
+
+
+@override_settings(SEMANTIC_ENABLED=False, ADMISSION_TRUST_X_FORWARDED_FOR=False)
+class AIRecommendRateLimitTests(TestCase):
+    """ /api/recommend/ai/ 가 한도를 넘으면 429 + Retry-After """
+
+    url = '/api/recommend/ai/'
+
+    def setUp(self):
+        # 모듈 전역 rate_limiter 를 테스트마다 분당 1개 / 버스트 2 로 비워서 씀
+        saved = (rate_limiter.rate, rate_limiter.burst)
+        rate_limiter.rate, rate_limiter.burst = 1 / 60.0, 2
+        rate_limiter._buckets.clear()
+
+        def restore():
+            rate_limiter.rate, rate_limiter.burst = saved
+            rate_limiter._buckets.clear()
+        self.addCleanup(restore)
+
+        # AI 키가 없으면 한도를 통과한 뒤 500 으로 끝나므로 업스트림은 부르지 않음
+        patcher = mock.patch('api.recommend_views.UPSTAGE_API_KEY', '')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, remote_addr='10.0.0.1', **data):
+        body = {'ingredients': ['양파', '계란'], 'timeSlot': '점심', **data}
+        return self.client.post(self.url, body, content_type='application/json', REMOTE_ADDR=remote_addr)
+
+    def test_returns_429_with_retry_after(self):
+        for _ in range(2):
+            self.assertNotEqual(self._post().status_code, 429)
+        response = self._post()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_body_username_does_not_open_a_new_bucket(self):
+        for i in range(2):
+            self.assertNotEqual(self._post(username=f'spoof{i}').status_code, 429)
+        self.assertEqual(self._post(username='spoof-new').status_code, 429)
+
+    def test_logged_in_user_is_limited_across_addresses(self):
+        user = User.objects.create_user('tester', password='pw')
+        self.client.force_login(user)
+        self.assertNotEqual(self._post(remote_addr='10.0.0.1').status_code, 429)
+        self.assertNotEqual(self._post(remote_addr='10.0.0.2').status_code, 429)
+        # 새 IP 라도 유저 버킷이 비었으므로 거절
+        self.assertEqual(self._post(remote_addr='10.0.0.3').status_code, 429)
+
+    def test_other_client_is_not_affected(self):
+        for _ in range(3):
+            self._post(remote_addr='10.0.0.1')
+        self.assertNotEqual(self._post(remote_addr='10.0.0.9').status_code, 429)
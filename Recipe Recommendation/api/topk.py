@@ -0,0 +1,57 @@
+# api/topk.py
+"""
+미리 계산된 top-K 추천 테이블 조회
+
+자주 쓰이는 재료 조합은 manage.py build_topk 로 결과를 미리 만들어 두고,
+recommend_recipes 는 점수 계산 전에 이 테이블부터 찾아봅니다.
+카탈로그(CSV)가 바뀌면 저장된 결과는 stale 로 보고 무시합니다.
+"""
+import json
+import threading
+
+from django.conf import settings
+
+from recipes.models import PrecomputedRecommendation
+from .catalog_rows import canonical_ingredients, catalog_version
+from .instrumentation import stage
+from .recommend_cache import fridge_fingerprint
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "stale": 0}
+
+
+def lookup_precomputed(names, limit=3):
+    """ 테이블에 최신 결과가 있으면 matches, 없으면 None """
+    canonical = canonical_ingredients(names)
+    if not canonical:
+        return None
+    with stage('topk_lookup'):
+        row = (PrecomputedRecommendation.objects
+               .filter(key=fridge_fingerprint(canonical))
+               .only('matches', 'catalog_version').first())
+    with _lock:
+        if row is None:
+            _counters["misses"] += 1
+            return None
+        if row.catalog_version != catalog_version():
+            _counters["stale"] += 1
+            return None
+        _counters["hits"] += 1
+    return row.matches[:limit]
+
+
+def log_query(names):
+    """ settings.RECOMMEND_QUERY_LOG 가 있으면 요청 재료를 한 줄씩 기록 (build_topk 입력) """
+    path = settings.RECOMMEND_QUERY_LOG
+    if not path:
+        return
+    canonical = canonical_ingredients(names)
+    if canonical:
+        with _lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"ingredients": canonical}, ensure_ascii=False) + '\n')
+
+
+def stats():
+    with _lock:
+        lookups = sum(_counters.values())
+        return {**_counters, "hit_rate": round(_counters["hits"] / lookups, 4) if lookups else 0.0}
@@ -1,22 +1,33 @@
 from django.urls import path
-from . import views
+from . import views, recommend_views, async_views, export
 
 urlpatterns = [
     # AI 레시피 추천
-    path('recommend/', views.recommend_recipes, name='recommend_recipes'),
+    path('recommend/', recommend_views.recommend_recipes, name='recommend_recipes'),
+    path('recommend/me/', recommend_views.recommend_for_me, name='recommend_for_me'),
 
     # 인증 (Auth)
     path('signup/', views.signup, name='signup'),
     path('login/', views.login_view, name='login'),
+    path('status/', views.server_status, name='server_status'),
 
     # 기능 (Features)
     path('user/ingredients/', views.user_ingredients, name='user_ingredients'),
     path('user/favorites/', views.favorites, name='favorites'),
+    path('user/favorites/contains/', views.favorites_contains, name='favorites_contains'),
+    path('user/recent/', views.recently_viewed, name='recently_viewed'),
     path('recipe/<int:recipe_id>/comments/', views.comments, name='comments'),
     path('recipes/create/', views.create_user_recipe),
     path('recipes/', views.get_all_recipes),
+    path('recipes/search/', views.search_recipes, name='search_recipes'),
+    path('recipes/<int:recipe_id>/', views.recipe_detail, name='recipe_detail'),
     path('recipes/<int:recipe_id>/update/', views.update_recipe),
     path('recipes/<int:recipe_id>/delete/', views.delete_recipe),
-    path('recommend/ai/', views.recommend_recipes_ai),
+    path('export/<str:kind>/', export.export_view, name='export'),
+    path('recommend/ai/', recommend_views.recommend_recipes_ai),
+
+    # 비동기(ASGI) 버전 - uvicorn / GUNICORN_ASGI=True 로 띄울 때 사용
+    path('recommend/async/', async_views.recommend_recipes_async, name='recommend_recipes_async'),
+    path('recommend/ai/async/', async_views.recommend_recipes_ai_async, name='recommend_recipes_ai_async'),
     
 ]
\ No newline at end of file
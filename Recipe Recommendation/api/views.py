@@ -1,327 +1,33 @@
-import os
-import json
-import json_repair
-import requests
-import pandas as pd
 import traceback
-import base64
-import uuid
-import re
-from openai import OpenAI
 
-from django.core.files.base import ContentFile
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from dotenv import load_dotenv
+from django.urls import reverse
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from recipes.models import Recipe, Ingredient, RecipeIngredient, Step, UserIngredient, Favorite, Comment, RecentlyViewed
 from .serializers import UserSerializer, UserIngredientSerializer, FavoriteSerializer, CommentSerializer
+from .login_lane import login_lane, LoginLaneBusy
+from .recommend_cache import invalidate_user_matches
+from .pagination import CommentCursorPagination
+from .recently_viewed import recent_views
+from .recipe_detail import document_queryset, get_recipe_document, recipe_document, touch_recipe
+from . import search as search_index
 
-# .env 로드
-current_dir = os.path.dirname(os.path.abspath(__file__))
-root_dir = os.path.dirname(current_dir)
-env_path = os.path.join(root_dir, '.env')
-load_dotenv(env_path)
-
-# 키 설정 (공백 제거)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
-UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "").strip()
+# favorites/contains 한 번에 확인할 수 있는 최대 레시피 수
+FAVORITES_CONTAINS_MAX_IDS = 200
 
 # ==========================================
-# 1. AI 로직 (Upstage Solar & Gemini)
-# ==========================================
-
-def get_gemini_recipe_text(recipe_name, ingredients_str):
-    """ 텍스트 레시피 생성 (Upstage Solar-pro2 사용) """
-    
-    fallback_data = {
-        "description": "맛있는 요리를 위한 레시피입니다.",
-        "cooking_time": 20,
-        "difficulty": "보통",
-        "category": "기타",
-        "steps": ["재료를 손질합니다.", "맛있게 조리합니다.", "완성입니다."],
-        "tips": ["신선한 재료를 사용하세요."],
-        "nutrition": {"calories": 0, "carbohydrate": 0, "protein": 0, "fat": 0, "sodium": 0},
-        "required_equipment": ["프라이팬", "냄비"],
-        "alternative_ingredients": {},
-        "late_night_suitable": False,
-        "health_tags": []
-    }
-    
-    print(f"🚀 [AI 텍스트 요청] 모델: solar-pro2 / 요리명: {recipe_name}")
-
-    try:
-        # 1. API 키 확인
-        if not UPSTAGE_API_KEY:
-            print("❌ [오류] UPSTAGE_API_KEY가 없습니다.")
-            return fallback_data
-
-        # 2. 클라이언트 설정
-        client = OpenAI(
-            api_key=UPSTAGE_API_KEY,
-            base_url="https://api.upstage.ai/v1"
-        )
-        
-        system_message = "당신은 미슐랭 3스타 셰프이자 식품 영양학 전문가입니다. JSON 형식으로 응답하세요."
-        
-        user_message = f"""
-        요리명: {recipe_name}
-        가용 재료: {ingredients_str}
-        
-        다음 정보를 포함하여 완벽한 JSON 데이터를 만드세요.
-
-        [헬스 태그(health_tags) 선정 기준]
-        1. 뷰티 핏: 다이어트 식단 (저칼로리, 저탄수화물, 체중 감량용)
-        2. 프로틴 업: 고단백 식단 (닭가슴살, 계란, 콩 등 단백질 함량이 높음)
-        3. 배지라이프: 비건 식단 (고기, 해산물, 유제품 등 동물성 재료 없음)
-        4. 저속노화 식단: 자극적이지 않고 건강한 식단 (저당, 저염, 가공식품 최소화, 통곡물/채소 위주)
-        (위 기준에 부합하는 경우에만 해당 태그를 리스트에 담아주세요. 없으면 빈 배열)
-        
-        [필수 JSON 포맷]
-        {{
-            "description": "요리 설명 (한글, 50자 내외)",
-            "cooking_time": 숫자(분),
-            "difficulty": "초급/중급/고급",
-            "category": "한식/양식/중식/일식/디저트/기타 중 택1",
-            "late_night_suitable": true 또는 false,
-            "health_tags": ["뷰티 핏", "프로틴 업" 등 해당되는 것],
-            "ingredients": [{{"name": "이름", "amount": "양"}}],
-            "required_equipment": ["필요한 도구 리스트"],
-            "alternative_ingredients": {{ "원래재료": ["대체재료1", "대체재료2"] }},
-            "steps": ["조리과정1", "조리과정2"], 
-            "tips": ["팁1", "팁2"],
-            "nutrition": {{"calories": 0, "carbohydrate": 0, "protein": 0, "fat": 0, "sodium": 0}}
-        }}
-
-        [주의사항]
-        1. steps 문장 앞에 번호를 붙이지 마세요.
-        2. 오직 순수한 JSON만 응답하세요.
-        """
-
-        # 3. AI 요청
-        response = client.chat.completions.create(
-            model="solar-pro2",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            stream=False,
-        )
-
-        response_text = response.choices[0].message.content
-        
-        # 4. JSON 파싱 (json_repair 적용)
-        try:
-            data = json_repair.loads(response_text)
-            
-            # steps 번호 제거 처리
-            if 'steps' in data and isinstance(data['steps'], list):
-                data['steps'] = [re.sub(r'^\d+\.\s*', '', str(step)) for step in data['steps']]
-            
-            return data
-            
-        except Exception as e:
-            print(f"⚠️ [Solar JSON 복구 실패]: {e}")
-            return fallback_data
-
-    # ✅ [중요] 이 부분이 빠져서 에러가 났던 것입니다!
-    except Exception as e:
-        print(f"❌ [Solar 생성 실패]: {e}")
-        return fallback_data
-
-def save_image_from_gemini(recipe_name):
-    """ 이미지 생성 (Gemini 2.0 Flash Exp Image Generation) """
-    if not GEMINI_API_KEY:
-        print("⚠️ [이미지 생성 건너뜀] Gemini API Key가 없습니다.")
-        return None
-
-    print(f"🎨 [AI 이미지 요청] {recipe_name} 그리는 중...")
-    try:
-        url = f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent?key={GEMINI_API_KEY}"
-        headers = { 'Content-Type': 'application/json' }
-        prompt = f"High-quality professional food photography of {recipe_name}, delicious, cinematic lighting, 4k"
-        
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": { "responseModalities": ["TEXT", "IMAGE"] }
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-        
-        if response.status_code != 200:
-            print(f"⚠️ [이미지 생성 오류] {response.status_code}: {response.text}")
-            return None
-
-        result = response.json()
-        parts = result.get('candidates', [])[0].get('content', {}).get('parts', [])
-        
-        for part in parts:
-            if 'inlineData' in part:
-                img_data_b64 = part['inlineData']['data']
-                img_data = base64.b64decode(img_data_b64)
-                
-                file_name = f"{uuid.uuid4()}.jpg"
-                media_root = settings.MEDIA_ROOT
-                if not os.path.exists(media_root):
-                    os.makedirs(media_root)
-                
-                file_path = os.path.join(media_root, file_name)
-                with open(file_path, "wb") as f:
-                    f.write(img_data)
-                
-                # 주의: 배포 시에는 도메인 변경 필요
-                return f"http://127.0.0.1:8000/media/{file_name}"
-        
-        print("⚠️ [이미지 데이터 없음]")
-        return None
-    except Exception as e:
-        print(f"⚠️ 이미지 저장 실패: {e}")
-        return None
-
-# ==========================================
-# 2. 뷰 로직 (통합)
-# ==========================================
-
-@api_view(["POST"])
-@permission_classes([AllowAny])
-def recommend_recipes(request):
-    try:
-        # 사용자가 입력한 재료 (공백 제거)
-        user_ingredients = [u.strip() for u in request.data.get("ingredients", [])]
-        
-        csv_path = os.path.join(root_dir, 'backend_dj', 'recipe_dataset.csv')
-        if not os.path.exists(csv_path): 
-            csv_path = os.path.join(root_dir, 'recipe_dataset.csv')
-        
-        matched_list = []
-        
-        if os.path.exists(csv_path):
-            df = pd.read_csv(csv_path, on_bad_lines='skip')
-            for _, row in df.iterrows():
-                ingredients_raw = str(row.get('ingredients', ''))
-                
-                # 💡 [핵심 수정 1] 재료명만 깔끔하게 추출해서 리스트로 만들기
-                # 예: "돼지고기 300g|양파 1/2개" -> ["돼지고기", "양파"]
-                recipe_ing_names = []
-                for raw in ingredients_raw.split('|'):
-                    raw = raw.strip()
-                    if not raw: continue
-                    # 뒤에서부터 공백으로 잘라서 이름만 추출 (예: "양파 1/2개" -> "양파")
-                    parts = raw.rsplit(' ', 1)
-                    recipe_ing_names.append(parts[0].strip())
-
-                total_count = len(recipe_ing_names)
-                
-                # 💡 [핵심 수정 2] 정확한 단어 매칭 ("파"가 "양파"에 포함되지 않도록)
-                match_count = 0
-                for u_ing in user_ingredients:
-                    for r_ing in recipe_ing_names:
-                        # 사용자가 입력한 재료가 레시피 재료명에 정확히 포함되거나 같은지 확인
-                        # 예: "김치" == "묵은지 김치" (O), "파" == "양파" (X)
-                        if u_ing == r_ing or (len(u_ing) > 1 and u_ing in r_ing and r_ing != "양파" and u_ing != "파"): 
-                            match_count += 1
-                            break # 중복 카운트 방지
-                
-                if total_count > 0:
-                    match_rate = (match_count / total_count) * 100
-                    
-                    # 💡 [필터링] 10% 이상인 것만 통과
-                    if match_rate >= 10:
-                        matched_list.append({
-                            'title': row.get('food_title', '이름 없는 요리'),
-                            'ingredients_raw': ingredients_raw,
-                            'time': int(''.join(filter(str.isdigit, str(row.get('time', '20')))) or 20),
-                            'difficulty': row.get('difficulty', '초급'),
-                            'category': row.get('cartegory', '기타'),
-                            'match_count': match_count
-                        })
-            
-            matched_list = sorted(matched_list, key=lambda x: x['match_count'], reverse=True)[:3]
-        else:
-            if user_ingredients:
-                matched_list = [{'title': f"{user_ingredients[0]} 요리", 'ingredients_raw': '|'.join(user_ingredients), 'time': 20, 'difficulty': '초급', 'category': '기타', 'match_count': 1}]
-            else:
-                matched_list = []
-
-        final_results = []
-
-        for item in matched_list:
-            recipe, created = Recipe.objects.get_or_create(
-                name=item['title'],
-                defaults={
-                    'cooking_time': item['time'],
-                    'difficulty': item['difficulty'],
-                    'category': item['category']
-                }
-            )
-
-            if not RecipeIngredient.objects.filter(recipe=recipe).exists():
-                for raw_ing in item['ingredients_raw'].split('|'):
-                    parts = raw_ing.strip().rsplit(' ', 1)
-                    if not parts[0]: continue
-                    ing_obj, _ = Ingredient.objects.get_or_create(name=parts[0])
-                    RecipeIngredient.objects.get_or_create(recipe=recipe, ingredient=ing_obj, defaults={'amount': parts[1] if len(parts)>1 else '적당량'})
-
-            # AI 텍스트 생성
-            if not recipe.steps.exists():
-                ai_data = get_gemini_recipe_text(item['title'], item['ingredients_raw'])
-                
-                if hasattr(recipe, 'description'): recipe.description = ai_data.get('description', '')
-                if hasattr(recipe, 'tips'): recipe.tips = ai_data.get('tips', [])
-                if hasattr(recipe, 'nutrition'): recipe.nutrition = ai_data.get('nutrition', {})
-                recipe.save()
-                
-                for i, s in enumerate(ai_data.get('steps', []), 1): 
-                    Step.objects.create(recipe=recipe, order=i, content=s)
-            
-            # AI 이미지 생성
-            if not recipe.image or "unsplash" in str(recipe.image):
-                image_url = save_image_from_gemini(item['title'])
-                if image_url:
-                    recipe.image = image_url
-                    recipe.save()
-                elif not recipe.image:
-                    recipe.image = f"https://source.unsplash.com/800x600/?{recipe.name},food"
-                    recipe.save()
-
-            recipe_ings = RecipeIngredient.objects.filter(recipe=recipe)
-            recipe_steps = Step.objects.filter(recipe=recipe).order_by('order')
-            
-            current_ai_data = ai_data if 'ai_data' in locals() else {}
-
-            final_results.append({
-                "id": f"db-{recipe.id}", 
-                "name": recipe.name,
-                "cookingTime": current_ai_data.get('cooking_time', recipe.cooking_time),
-                "difficulty": current_ai_data.get('difficulty', recipe.difficulty),
-                "category": current_ai_data.get('category', recipe.category),
-                "lateNightSuitable": current_ai_data.get('late_night_suitable', False),
-                "healthTags": current_ai_data.get('health_tags', []),
-                "ingredients": [{"name": i.ingredient.name, "amount": i.amount} for i in recipe_ings],
-                "steps": [s.content for s in recipe_steps],
-                "image": recipe.image,
-                "description": getattr(recipe, 'description', current_ai_data.get('description', '')),
-                "tips": getattr(recipe, 'tips', current_ai_data.get('tips', [])),
-                "nutrition": getattr(recipe, 'nutrition', current_ai_data.get('nutrition', {})),
-                "requiredEquipment": current_ai_data.get('required_equipment', ["조리 도구"]),
-                "alternativeIngredients": current_ai_data.get('alternative_ingredients', {}),
-                "author": "AI 셰프",
-                "isUserRecipe": False,
-            })
-
-        return Response(final_results)
-    except Exception as e:
-        traceback.print_exc()
-        return Response({"error": str(e)}, status=500)
-
-# ==========================================
-# 3. 기타 유저/커뮤니티 API
+# 유저/커뮤니티 API (추천/AI API 는 api/recommend_views.py)
 # ==========================================
 
 @api_view(['POST'])
@@ -329,21 +35,93 @@ def recommend_recipes(request):
 def signup(request):
     serializer = UserSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
+        login_lane.check_server(request)
+        try:
+            # 비밀번호 해싱(set_password)도 로그인과 같은 레인에서
+            login_lane.run(serializer.save)
+        except LoginLaneBusy as e:
+            return _lane_busy_response(e)
         return Response({"message": "회원가입 성공!", "user": serializer.data}, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def _lane_busy_response(e):
+    return Response({"error": "로그인 요청이 많습니다. 잠시 후 다시 시도해주세요."},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(e.retry_after)})
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
     username = request.data.get('username')
     password = request.data.get('password')
-    user = authenticate(username=username, password=password)
+    login_lane.check_server(request)
+    try:
+        # 해싱은 전용 레인에서만 (로그인 폭주가 추천 API CPU를 잡아먹지 않도록)
+        user = login_lane.run(authenticate, username=username, password=password)
+    except LoginLaneBusy as e:
+        return _lane_busy_response(e)
     if user:
         return Response({"message": "로그인 성공", "user": {"id": user.id, "username": user.username}})
     return Response({"error": "아이디/비번 불일치"}, status=status.HTTP_401_UNAUTHORIZED)
 
-@api_view(['GET', 'POST', 'DELETE'])
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def server_status(request):
+    """ 운영용 상태 조회 (로그인 레인 / AI 업스트림 대기열 등) """
+    from .admission import stats as admission_stats
+    from .ai_results import image_queue
+    from .catalog import get_catalog
+    from .prompts import llm_usage
+    from .topk import stats as topk_stats
+    catalog = get_catalog()
+    return Response({
+        "catalog": {"version": catalog.version, "recipes": len(catalog)} if catalog else None,
+        "login_lane": login_lane.stats(),
+        "admission": admission_stats(),
+        "topk": topk_stats(),
+        "recent_views": recent_views.stats(),
+        "ai_images": image_queue.stats(),
+        "llm": llm_usage.stats(),
+    })
+
+def _ingredient_names(items):
+    """ ["양파", {"name": "계란"}, ...] -> 공백 제거 + 중복 제거된 이름 리스트 (입력 순서 유지) """
+    names = []
+    for item in items or []:
+        ing_name = item if isinstance(item, str) else (item or {}).get('name')
+        ing_name = (ing_name or '').strip()
+        if ing_name and ing_name not in names:
+            names.append(ing_name)
+    return names
+
+def _apply_user_ingredient_delta(user, add=(), remove=(), replace=None):
+    """ 냉장고 재료 변경을 한 트랜잭션으로 처리 (bulk insert / bulk delete)
+
+    replace 가 주어지면 저장된 목록과의 차집합으로 add/remove 를 계산합니다.
+    같은 요청을 두 번 보내도 두 번째는 쓰기가 발생하지 않습니다.
+    """
+    with transaction.atomic():
+        current = set(UserIngredient.objects.select_for_update()
+                      .filter(user=user).values_list('name', flat=True))
+        if replace is not None:
+            add = [n for n in replace if n not in current]
+            remove = current - set(replace)
+        else:
+            add = [n for n in add if n not in current]
+            remove = set(remove) & current
+
+        if remove:
+            UserIngredient.objects.filter(user=user, name__in=remove).delete()
+        if add:
+            UserIngredient.objects.bulk_create(
+                [UserIngredient(user=user, name=n) for n in add], ignore_conflicts=True
+            )
+        if add or remove:
+            final_names = (current - set(remove)) | set(add)
+            transaction.on_commit(lambda: invalidate_user_matches(user.id, final_names))
+    return list(add), sorted(remove)
+
+@api_view(['GET', 'POST', 'PATCH', 'DELETE'])
 @permission_classes([AllowAny])
 def user_ingredients(request):
     username = request.GET.get('username') or request.data.get('username')
@@ -355,33 +133,123 @@ def user_ingredients(request):
         ings = UserIngredient.objects.filter(user=user)
         return Response(UserIngredientSerializer(ings, many=True).data)
     elif request.method == 'POST':
-        UserIngredient.objects.filter(user=user).delete()
-        for item in request.data.get('ingredients', []):
-            ing_name = item if isinstance(item, str) else item.get('name')
-            if ing_name: UserIngredient.objects.create(user=user, name=ing_name)
-        return Response({"message": "저장 완료"})
+        # 전체 목록 교체 (멱등)
+        added, removed = _apply_user_ingredient_delta(
+            user, replace=_ingredient_names(request.data.get('ingredients', []))
+        )
+        return Response({"message": "저장 완료", "added": added, "removed": removed})
+    elif request.method == 'PATCH':
+        # 변경분만 전송: {"add": [...], "remove": [...]}
+        added, removed = _apply_user_ingredient_delta(
+            user,
+            add=_ingredient_names(request.data.get('add', [])),
+            remove=_ingredient_names(request.data.get('remove', [])),
+        )
+        return Response({"message": "저장 완료", "added": added, "removed": removed})
+
+def _recipe_pk(value):
+    """ 프론트의 레시피 id ("db-12" 또는 12) -> DB pk (형식이 틀리면 None) """
+    if isinstance(value, str) and value.startswith('db-'):
+        value = value[len('db-'):]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
 def favorites(request):
     username = request.data.get('username') or request.GET.get('username')
     if not username: return Response({"error": "유저 정보 필요"}, 400)
-    user = User.objects.get(username=username)
+    try: user = User.objects.get(username=username)
+    except User.DoesNotExist: return Response({"error": "존재하지 않는 유저"}, 404)
 
     if request.method == 'GET':
-        favs = Favorite.objects.filter(user=user)
+        # 레시피 이름/이미지를 JOIN 으로 한 번에 (행마다 레시피 조회 X)
+        favs = Favorite.objects.filter(user=user).select_related('recipe').order_by('-created_at')
         return Response(FavoriteSerializer(favs, many=True).data)
     elif request.method == 'POST':
-        recipe_id = request.data.get('recipe_id')
-        if isinstance(recipe_id, str) and recipe_id.startswith('db-'):
-            recipe_id = int(recipe_id.replace('db-', ''))
-        recipe = Recipe.objects.get(id=recipe_id)
-        fav, created = Favorite.objects.get_or_create(user=user, recipe=recipe)
-        if not created:
-            fav.delete()
+        recipe_id = _recipe_pk(request.data.get('recipe_id'))
+        if recipe_id is None: return Response({"error": "레시피 정보 필요"}, 400)
+        # 토글: 있으면 지우고(DELETE 한 번) 없으면 넣음(INSERT 한 번). (user, recipe) 유니크 인덱스를 탐
+        try:
+            with transaction.atomic():
+                deleted, _ = Favorite.objects.filter(user=user, recipe_id=recipe_id).delete()
+                if not deleted:
+                    Favorite.objects.create(user=user, recipe_id=recipe_id)
+        except IntegrityError:
+            # 없는 레시피(FK 위반)이거나, 동시에 들어온 같은 요청이 먼저 추가한 경우
+            if not Recipe.objects.filter(id=recipe_id).exists():
+                return Response({"error": "존재하지 않는 레시피"}, 404)
+            deleted = 0
+        if deleted:
             return Response({"message": "삭제됨", "status": "removed"})
         return Response({"message": "추가됨", "status": "added"})
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def favorites_contains(request):
+    """ 카드 목록의 즐겨찾기 여부 한 번에 확인: ?username=..&ids=db-1,db-2,3 -> {"favorites": {"db-1": true, ...}} """
+    username = request.GET.get('username')
+    if not username: return Response({"error": "유저 정보 필요"}, 400)
+    raw_ids = [i for i in request.GET.get('ids', '').split(',') if i.strip()]
+    if len(raw_ids) > FAVORITES_CONTAINS_MAX_IDS:
+        return Response({"error": f"ids 는 최대 {FAVORITES_CONTAINS_MAX_IDS}개까지 가능합니다."}, 400)
+
+    pks = {raw.strip(): _recipe_pk(raw.strip()) for raw in raw_ids}
+    # 유저 조인 + (user, recipe) 유니크 인덱스로 쿼리 한 번
+    favorited = set(Favorite.objects.filter(
+        user__username=username, recipe_id__in=[pk for pk in pks.values() if pk is not None],
+    ).values_list('recipe_id', flat=True))
+    return Response({"favorites": {raw: pk in favorited for raw, pk in pks.items()}})
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def recently_viewed(request):
+    """ 최근 본 레시피
+
+    POST {"username", "recipe_id"}: 조회 기록 (메모리 버퍼에만 넣고 바로 202, DB 쓰기는 모아서 나중에)
+    GET ?username=..&limit=20: 최근 본 순서 목록 (아직 DB 에 안 쓴 기록도 합쳐서)
+    """
+    username = request.data.get('username') or request.GET.get('username')
+    if not username: return Response({"error": "유저 정보 필요"}, 400)
+    try: user = User.objects.get(username=username)
+    except User.DoesNotExist: return Response({"error": "존재하지 않는 유저"}, 404)
+
+    if request.method == 'POST':
+        recipe_id = _recipe_pk(request.data.get('recipe_id'))
+        if recipe_id is None: return Response({"error": "레시피 정보 필요"}, 400)
+        recent_views.record(user.id, recipe_id)
+        return Response({"status": "recorded"}, status=202)
+
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), settings.RECENT_VIEWS_KEEP))
+    except ValueError:
+        return Response({"error": "limit 은 숫자여야 합니다."}, 400)
+
+    # (user, viewed_at) 인덱스를 역순으로 읽음
+    rows = (RecentlyViewed.objects.filter(user=user).select_related('recipe')
+            .order_by('-viewed_at')[:limit])
+    entries = {row.recipe_id: (row.viewed_at, row.recipe) for row in rows}
+    pending = recent_views.pending_for(user.id)
+    missing = [rid for rid in pending if rid not in entries]
+    recipes = Recipe.objects.in_bulk(missing) if missing else {}
+    for rid, viewed_at in pending.items():
+        if rid in entries:
+            entries[rid] = (max(viewed_at, entries[rid][0]), entries[rid][1])
+        elif rid in recipes:
+            entries[rid] = (viewed_at, recipes[rid])
+
+    ordered = sorted(entries.values(), key=lambda entry: entry[0], reverse=True)[:limit]
+    return Response([{
+        "id": f"db-{r.id}",
+        "name": r.name,
+        "image": r.image,
+        "category": r.category,
+        "cookingTime": r.cooking_time,
+        "viewedAt": viewed_at,
+    } for viewed_at, r in ordered])
+
 # backend_dj/api/views.py
 
 @api_view(['POST'])
@@ -443,46 +311,110 @@ def create_user_recipe(request):
 @permission_classes([AllowAny])
 def get_all_recipes(request):
     """ 모든 레시피 조회 (상세 정보 포함) """
-    # 최신순 정렬
-    recipes = Recipe.objects.all().order_by('-created_at')[:100]
-    data = []
-    for r in recipes:
-        ings = RecipeIngredient.objects.filter(recipe=r)
-        steps = Step.objects.filter(recipe=r).order_by('order')
-        
-        # 작성자 이름 처리
-        author_name = r.author.username if r.author else "AI 셰프"
-        is_user_recipe = True if r.author else False
-
-        data.append({
-            "id": f"db-{r.id}",
-            "name": r.name,
-            "cookingTime": r.cooking_time,
-            "difficulty": r.difficulty,
-            "category": r.category,
-            "dishwashing": r.dishwashing,           # 추가됨
-            "lateNightSuitable": r.late_night_suitable, # 추가됨
-            "healthTags": r.health_tags,            # 추가됨
-            "requiredEquipment": r.required_equipment, # 추가됨
-            "ingredients": [{"name": i.ingredient.name, "amount": i.amount} for i in ings],
-            "steps": [s.content for s in steps],
-            "image": r.image,
-            "description": r.description,
-            "author": author_name,
-            "isUserRecipe": is_user_recipe,
-            "createdAt": r.created_at
-        })
+    # 최신순 정렬 (재료/순서는 prefetch 로 레시피 수와 무관하게 쿼리 3번)
+    recipes = document_queryset().order_by('-created_at')[:100]
+    return Response([recipe_document(r) for r in recipes])
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_recipes(request):
+    """ 레시피 전문 검색 ?q=&page=&page_size= (이름 > 재료 > 설명 > 조리 순서 가중치로 랭킹)
+
+    전체 개수는 세지 않고 한 개 더 읽어서 다음 페이지가 있는지만 알려줍니다.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return Response({"error": "검색어(q)가 필요합니다."}, status=400)
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+        page_size = min(settings.SEARCH_MAX_PAGE_SIZE, max(1, int(request.GET.get('page_size', settings.SEARCH_PAGE_SIZE))))
+    except ValueError:
+        return Response({"error": "page, page_size 는 숫자여야 합니다."}, status=400)
+
+    # 방금 바뀐 레시피도 검색되도록 밀린 색인부터 반영
+    search_index.refresh(limit=settings.SEARCH_REFRESH_LIMIT)
+    ids = search_index.search(query, offset=(page - 1) * page_size, limit=page_size + 1)
+    has_next, ids = len(ids) > page_size, ids[:page_size]
+    recipes = document_queryset().in_bulk(ids)
+
+    url = request.build_absolute_uri()
+    return Response({
+        "query": query,
+        "page": page,
+        "next": replace_query_param(url, 'page', page + 1) if has_next else None,
+        "previous": (None if page == 1 else
+                     remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)),
+        "results": [recipe_document(recipes[i]) for i in ids if i in recipes],
+    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def recipe_detail(request, recipe_id):
+    """ 레시피 하나의 전체 문서 + 즐겨찾기 수 + 평점 요약 + 첫 댓글 페이지
+
+    문서는 버전별 캐시 (api/recipe_detail.py), 나머지는 매번 인덱스로 조회하므로 쿼리 수는 일정합니다.
+    ?username= 을 주면 isFavorite 를 붙이고 최근 본 레시피에 기록합니다.
+    """
+    doc = get_recipe_document(recipe_id)
+    if doc is None:
+        return Response({"error": "존재하지 않는 레시피입니다."}, status=404)
+
+    paginator = CommentCursorPagination()
+    page = paginator.paginate_queryset(
+        Comment.objects.filter(recipe_id=recipe_id).select_related('user'), request)
+    # 다음 페이지는 댓글 API 로 이어서 읽도록
+    paginator.base_url = request.build_absolute_uri(reverse('comments', args=[recipe_id]))
+    data = {
+        **doc,
+        "favoriteCount": Favorite.objects.filter(recipe_id=recipe_id).count(),
+        "commentSummary": _rating_summary(recipe_id),
+        "comments": {"next": paginator.get_next_link(), "results": CommentSerializer(page, many=True).data},
+    }
+
+    username = request.GET.get('username')
+    if username:
+        user = User.objects.filter(username=username).only('id').first()
+        if user is not None:
+            data["isFavorite"] = Favorite.objects.filter(user=user, recipe_id=recipe_id).exists()
+            recent_views.record(user.id, recipe_id)
     return Response(data)
 
+def _rating_summary(recipe_id):
+    """ 댓글 수 / 평균 평점 / 평점 분포 (평점별 GROUP BY 쿼리 한 번, (recipe, rating) 인덱스만 읽음) """
+    histogram = {str(r): 0 for r in range(1, 6)}
+    count = total = 0
+    rows = (Comment.objects.filter(recipe_id=recipe_id)
+            .values('rating').annotate(n=Count('id')).order_by())
+    for row in rows:
+        histogram[str(row['rating'])] = row['n']
+        count += row['n']
+        total += row['rating'] * row['n']
+    return {
+        "count": count,
+        "average_rating": round(total / count, 2) if count else None,
+        "histogram": histogram,
+    }
+
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
 def comments(request, recipe_id):
-    """ 레시피 댓글 조회 및 작성 """
+    """ 레시피 댓글 조회 및 작성
+
+    GET: 최신순 커서 페이지 (?cursor=..., ?page_size=..) + 평점 요약
+        {"summary": {...}, "next": url, "previous": url, "results": [...]}
+    """
     try:
         # 댓글 조회
         if request.method == 'GET':
-            comments_qs = Comment.objects.filter(recipe_id=recipe_id).order_by('-created_at')
-            return Response(CommentSerializer(comments_qs, many=True).data)
+            comments_qs = Comment.objects.filter(recipe_id=recipe_id).select_related('user')
+            paginator = CommentCursorPagination()
+            page = paginator.paginate_queryset(comments_qs, request)
+            return Response({
+                "summary": _rating_summary(recipe_id),
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": CommentSerializer(page, many=True).data,
+            })
         
         # 댓글 작성
         elif request.method == 'POST':
@@ -501,6 +433,13 @@ def comments(request, recipe_id):
             if not content:
                  return Response({"error": "내용을 입력해주세요."}, status=400)
 
+            try:
+                rating = int(request.data.get('rating', 5))
+            except (TypeError, ValueError):
+                rating = 0
+            if not 1 <= rating <= 5:
+                return Response({"error": "평점은 1~5 사이여야 합니다."}, status=400)
+
             # 2. 레시피 찾기
             try:
                 recipe = Recipe.objects.get(id=recipe_id)
@@ -508,9 +447,12 @@ def comments(request, recipe_id):
                 return Response({"error": "존재하지 않는 레시피입니다."}, status=404)
 
             # 3. 저장
-            comment = Comment.objects.create(user=user, recipe=recipe, content=content)
+            comment = Comment.objects.create(user=user, recipe=recipe, content=content, rating=rating)
             return Response(CommentSerializer(comment).data, status=201)
 
+    except APIException:
+        # 잘못된 ?cursor= (NotFound) 등은 DRF 가 알맞은 상태 코드로 응답
+        raise
     except Exception as e:
         # 에러 로그 출력
         import traceback
@@ -562,6 +504,9 @@ def update_recipe(request, recipe_id):
                 if content.strip():
                     Step.objects.create(recipe=recipe, order=idx+1, content=content)
 
+        # 6. 상세 문서 캐시 무효화
+        touch_recipe(recipe.id)
+
         return Response({"message": "수정 성공!"}, status=200)
 
     except Exception as e:
@@ -588,66 +533,3 @@ def delete_recipe(request, recipe_id):
         return Response({"error": "이미 삭제되었거나 없는 레시피입니다."}, status=404)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
-    
-
-# backend_dj/api/views.py
-
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def recommend_recipes_ai(request):
-    """ 사용자의 상황(시간, 재료, 취향)에 맞는 AI 맞춤 추천 """
-    try:
-        data = request.data
-        ingredients = data.get('ingredients', [])
-        time_slot = data.get('timeSlot', '점심') # 아침, 점심, 저녁, 야식
-        preferences = data.get('preferences', '') # 예: 매운거 좋아함, 다이어트 중
-
-        # 1. AI 프롬프트 작성 (상황극 부여)
-        prompt = f"""
-        나는 지금 냉장고에 {', '.join(ingredients)}을(를) 가지고 있어.
-        지금 시간은 '{time_slot}'이고, 나의 취향은 '{preferences}'야.
-        
-        이 상황에 가장 잘 어울리는 창의적인 레시피 3가지를 추천해줘.
-        
-        [조건]
-        1. '{time_slot}' 시간대에 먹기 부담스럽지 않거나 어울리는 메뉴여야 해.
-        2. 내가 가진 재료를 최대한 활용해야 해.
-        3. 응답은 반드시 아래 JSON 리스트 형식으로만 줘. (설명 금지)
-
-        [
-            {{
-                "name": "요리 이름",
-                "description": "왜 이 시간/취향에 맞는지 한 줄 설명",
-                "cooking_time": 20,
-                "difficulty": "쉬움",
-                "category": "한식",
-                "ingredients": [{{"name": "재료1", "amount": "1개"}}],
-                "steps": ["단계1", "단계2"],
-                "health_tags": ["다이어트", "저염"]
-            }}
-        ]
-        """
-
-        # 2. AI 요청 (Upstage Solar 사용 예시)
-        if not UPSTAGE_API_KEY:
-             return Response({"error": "AI 키가 설정되지 않았습니다."}, status=500)
-
-        client = OpenAI(api_key=UPSTAGE_API_KEY, base_url="https://api.upstage.ai/v1")
-        response = client.chat.completions.create(
-            model="solar-pro2",
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        # 3. 응답 파싱
-        response_text = response.choices[0].message.content
-        import json_repair # (설치 필요: pip install json_repair)
-        recipes_data = json_repair.loads(response_text)
-
-        # 4. 이미지 생성 및 데이터 가공 (기존 로직 재활용 가능)
-        # (여기서는 간단히 데이터만 리턴합니다. 필요하면 DB 저장 로직 추가)
-        
-        return Response(recipes_data, status=200)
-
-    except Exception as e:
-        print(f"❌ AI 추천 실패: {e}")
-        return Response({"error": str(e)}, status=500)
\ No newline at end of file
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_dj.settings')
 
 application = get_asgi_application()
+
+# wsgi.py 와 같은 미리 로딩 (gunicorn + UvicornWorker 에서 preload_app 과 함께 사용)
+if settings.WSGI_PRELOAD:
+    from backend_dj.preload import preload
+    preload()
@@ -0,0 +1,37 @@
+# backend_dj/preload.py
+"""
+fork 전 미리 로딩 (gunicorn preload_app 용)
+
+마스터 프로세스에서 무거운 모듈과 레시피 카탈로그/인덱스를 한 번만 올려 두면
+워커들은 fork 후 copy-on-write 로 같은 메모리를 공유합니다.
+gc.freeze() 로 이 객체들을 GC 추적에서 빼 두어야 워커에서 GC 가 돌 때
+참조 카운트/GC 헤더 쓰기로 페이지가 복사되는 것을 줄일 수 있습니다.
+"""
+import gc
+import time
+
+
+def preload():
+    started = time.perf_counter()
+
+    # 1. 무거운 라이브러리
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import openai  # noqa: F401
+
+    # 2. URL/뷰 모듈 (첫 요청 때 import 하지 않도록)
+    import api.urls  # noqa: F401
+
+    # 3. 카탈로그 + (설정 시) LSH 인덱스
+    from api.catalog import get_catalog
+    catalog = get_catalog()
+
+    # 4. fork 전에 DB 연결은 닫아 둠 (워커끼리 소켓/파일 핸들 공유 방지)
+    from django.db import connections
+    connections.close_all()
+
+    gc.collect()
+    gc.freeze()
+
+    recipes = len(catalog) if catalog is not None else 0
+    print(f"📦 [preload] 레시피 {recipes}개 로딩 완료 ({time.perf_counter() - started:.2f}s)")
@@ -55,6 +55,10 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 MIDDLEWARE = [
+    # 요청 시간/구간/DB 쿼리 계측 (Server-Timing 헤더, JSON 로그, /metrics) - 전체를 재도록 맨 앞에 둠
+    'api.instrumentation.InstrumentationMiddleware',
+    # 토큰/샘플링으로 고른 요청만 샘플링 프로파일러로 감쌈 (PROFILING_ENABLED=False 면 빠짐)
+    'api.profiling.ProfilingMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -94,7 +98,7 @@ WSGI_APPLICATION = 'backend_dj.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH') or BASE_DIR / 'db.sqlite3',
     }
 }
 
@@ -117,6 +121,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# 비밀번호 해셔
+# USE_ARGON2=True 면 새 비밀번호는 튜닝된 Argon2로 저장하고,
+# 기존 PBKDF2 해시는 그대로 검증한 뒤 다음 로그인 때 Argon2로 재해싱됩니다.
+USE_ARGON2 = os.getenv('USE_ARGON2', 'False') == 'True'
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'api.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+]
+if USE_ARGON2:
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(2))
+
+# 로그인 전용 해싱 레인 (동시 해싱 수 / 최대 대기 인원 / 대기 시간(초))
+LOGIN_LANE_CONCURRENCY = int(os.getenv('LOGIN_LANE_CONCURRENCY', '2'))
+LOGIN_LANE_MAX_WAITING = int(os.getenv('LOGIN_LANE_MAX_WAITING', '16'))
+LOGIN_LANE_WAIT_TIMEOUT = float(os.getenv('LOGIN_LANE_WAIT_TIMEOUT', '2.0'))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -144,4 +170,122 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # 미디어 파일(이미지)이 저장될 실제 경로
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# 레시피 추천
+# CSV 데이터셋 경로 (비워두면 backend_dj/recipe_dataset.csv -> ./recipe_dataset.csv 순서로 찾음)
+RECIPE_DATASET_PATH = os.getenv('RECIPE_DATASET_PATH') or None
+
+# /api/recommend/me/ 랭킹 유지 시간(초) / 냉장고 변경 직후 백그라운드 미리 계산 여부
+# (랭킹은 UserRecommendation 테이블에 저장해서 모든 워커가 공유)
+RECOMMEND_ME_CACHE_TIMEOUT = int(os.getenv('RECOMMEND_ME_CACHE_TIMEOUT', '86400'))
+RECOMMEND_ME_PRECOMPUTE = os.getenv('RECOMMEND_ME_PRECOMPUTE', 'True') == 'True'
+
+# 추천 요청 재료 로그 (NDJSON, manage.py build_topk --log 입력). 비워두면 기록 안 함
+RECOMMEND_QUERY_LOG = os.getenv('RECOMMEND_QUERY_LOG') or None
+
+# MinHash/LSH 근사 후보 검색 (큰 카탈로그용). 인덱스는 CSV 옆 *.lsh.npz 로 저장됨
+RECIPE_LSH_ENABLED = os.getenv('RECIPE_LSH_ENABLED', 'False') == 'True'
+
+# CSV 를 바이너리 스냅샷(<csv>.snapshot)으로 컴파일해서 mmap 으로 공유 (manage.py build_catalog_snapshot)
+RECIPE_SNAPSHOT_ENABLED = os.getenv('RECIPE_SNAPSHOT_ENABLED', 'True') == 'True'
+RECIPE_SNAPSHOT_PATH = os.getenv('RECIPE_SNAPSHOT_PATH') or None
+
+# wsgi.py / asgi.py 로딩 시 카탈로그/무거운 모듈 미리 로딩 + gc.freeze()
+# gunicorn.conf.py 가 preload_app 일 때 켬. runserver 등 다른 서버에서는 꺼 두고 필요할 때 지연 로딩
+WSGI_PRELOAD = os.getenv('WSGI_PRELOAD', 'False') == 'True'
+
+# 비동기(ASGI) AI 뷰의 업스트림 커넥션 풀 크기 / 업스트림 요청 타임아웃(초, 동기 Solar/이미지 호출도 같은 값)
+AI_HTTP_MAX_CONNECTIONS = int(os.getenv('AI_HTTP_MAX_CONNECTIONS', '256'))
+AI_HTTP_TIMEOUT = float(os.getenv('AI_HTTP_TIMEOUT', '60'))
+
+# AI 엔드포인트 입장 제어 (api/admission.py)
+# IP 별 (로그인한 유저는 유저 별로도) 분당 요청 수와 순간 허용량 (0 이면 제한 없음)
+AI_RATE_LIMIT_PER_MINUTE = int(os.getenv('AI_RATE_LIMIT_PER_MINUTE', '20'))
+AI_RATE_LIMIT_BURST = int(os.getenv('AI_RATE_LIMIT_BURST', '5'))
+# LLM/이미지 업스트림 동시 호출 수 / 최대 대기 인원 / 대기 시간(초)
+AI_UPSTREAM_CONCURRENCY = int(os.getenv('AI_UPSTREAM_CONCURRENCY', '32'))
+AI_UPSTREAM_MAX_WAITING = int(os.getenv('AI_UPSTREAM_MAX_WAITING', '64'))
+AI_UPSTREAM_WAIT_TIMEOUT = float(os.getenv('AI_UPSTREAM_WAIT_TIMEOUT', '5.0'))
+# 리버스 프록시 뒤라면 X-Forwarded-For 첫 주소를 클라이언트 IP 로 사용
+ADMISSION_TRUST_X_FORWARDED_FOR = os.getenv('ADMISSION_TRUST_X_FORWARDED_FOR', 'False') == 'True'
+
+# 레시피 상세 문서 캐시 유지 시간(초) - 키에 버전이 들어가서 내용이 바뀌면 바로 새 문서를 씀
+RECIPE_DETAIL_CACHE_TIMEOUT = int(os.getenv('RECIPE_DETAIL_CACHE_TIMEOUT', '600'))
+
+# 최근 본 레시피 (api/recently_viewed.py)
+# 조회 기록을 모아 쓰는 주기(초, 0 이면 바로 씀) / 이만큼 쌓이면 주기 전이라도 씀 / 유저당 남길 개수
+RECENT_VIEWS_FLUSH_INTERVAL = float(os.getenv('RECENT_VIEWS_FLUSH_INTERVAL', '5'))
+RECENT_VIEWS_MAX_PENDING = int(os.getenv('RECENT_VIEWS_MAX_PENDING', '1000'))
+RECENT_VIEWS_KEEP = int(os.getenv('RECENT_VIEWS_KEEP', '50'))
+
+# 레시피 전문 검색 (api/search.py)
+# 기본/최대 페이지 크기 / 검색 요청마다 먼저 다시 색인할 최대 레시피 수 (나머지는 다음 요청이나 sync_catalog 때)
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', '20'))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv('SEARCH_MAX_PAGE_SIZE', '50'))
+SEARCH_REFRESH_LIMIT = int(os.getenv('SEARCH_REFRESH_LIMIT', '500'))
+
+# AI 맞춤 추천 전 저장 레시피 의미 검색 (api/semantic.py, 인덱스는 manage.py build_semantic_index 로 생성)
+# 1등 코사인 유사도가 이 값 이상이면 LLM 을 부르지 않고 저장된 레시피를 돌려줌 / 돌려줄 최대 개수
+SEMANTIC_ENABLED = os.getenv('SEMANTIC_ENABLED', 'True') == 'True'
+SEMANTIC_INDEX_DIR = os.getenv('SEMANTIC_INDEX_DIR') or str(BASE_DIR / 'semantic_index')
+SEMANTIC_EMBEDDER = os.getenv('SEMANTIC_EMBEDDER', 'api.semantic.hashed_embedding')
+SEMANTIC_DIM = int(os.getenv('SEMANTIC_DIM', '256'))
+SEMANTIC_MIN_SIMILARITY = float(os.getenv('SEMANTIC_MIN_SIMILARITY', '0.6'))
+SEMANTIC_TOP_K = int(os.getenv('SEMANTIC_TOP_K', '3'))
+
+# AI 맞춤 추천 결과 저장 (api/ai_results.py)
+# 같은 요청(재료/시간대/취향)이면 이 시간(초) 동안 LLM 없이 저장된 결과를 돌려줌
+AI_RECOMMEND_FRESH_SECONDS = int(os.getenv('AI_RECOMMEND_FRESH_SECONDS', '21600'))
+# 저장한 레시피 이미지를 백그라운드에서 만드는 스레드 수 (0 이면 기본 이미지만) / 대기열 최대 길이
+AI_IMAGE_WORKERS = int(os.getenv('AI_IMAGE_WORKERS', '2'))
+AI_IMAGE_QUEUE_MAX = int(os.getenv('AI_IMAGE_QUEUE_MAX', '200'))
+
+# Solar 프롬프트 / 토큰 예산 (api/prompts.py)
+# 필드 묶음별 응답 최대 토큰 (레시피 상세 텍스트 / AI 맞춤 추천 3개). 닿으면 잘린 JSON 을 json_repair 가 닫음
+LLM_MAX_TOKENS_RECIPE_TEXT = int(os.getenv('LLM_MAX_TOKENS_RECIPE_TEXT', '1024'))
+LLM_MAX_TOKENS_RECOMMEND = int(os.getenv('LLM_MAX_TOKENS_RECOMMEND', '2048'))
+# 프롬프트에 넣을 최대 재료 수 / 취향 최대 글자 수
+LLM_PROMPT_MAX_INGREDIENTS = int(os.getenv('LLM_PROMPT_MAX_INGREDIENTS', '20'))
+LLM_PROMPT_MAX_PREFERENCE_CHARS = int(os.getenv('LLM_PROMPT_MAX_PREFERENCE_CHARS', '100'))
+
+# 스트리밍 내보내기 (api/export.py, /api/export/<kind>/, manage.py export_data)
+# 한 번에 읽을 행 수 / 모아서 내보낼 바이트 수 / 전체 유저 댓글·즐겨찾기 내보내기 토큰 (Authorization: Bearer <토큰>)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '1000'))
+EXPORT_BUFFER_BYTES = int(os.getenv('EXPORT_BUFFER_BYTES', '65536'))
+EXPORT_TOKEN = os.getenv('EXPORT_TOKEN') or None
+
+# 요청 계측 (api/instrumentation.py)
+# 엔드포인트별 p50/p95/p99 를 계산할 최근 요청 수 / 요청마다 JSON 로그 한 줄 출력 여부
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', '1024'))
+REQUEST_LOG_ENABLED = os.getenv('REQUEST_LOG_ENABLED', 'True') == 'True'
+# /metrics 접근 토큰 (설정하면 Authorization: Bearer <토큰> 필요)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+
+# 요청 프로파일링 (api/profiling.py)
+# 켜면 ?profile=<토큰> / X-Recipick-Profile 헤더가 붙은 요청과 PROFILING_SAMPLE_RATE 비율의 요청을 프로파일링
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+# 콜스택 샘플링 간격(ms) / 동시에 프로파일링할 최대 요청 수 / 토큰 유효 시간(초)
+PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '5'))
+PROFILING_MAX_CONCURRENT = int(os.getenv('PROFILING_MAX_CONCURRENT', '2'))
+PROFILING_TOKEN_MAX_AGE = int(os.getenv('PROFILING_TOKEN_MAX_AGE', '3600'))
+# 저장 위치 / 엔드포인트별로 남길 최근 프로파일 수
+PROFILING_DIR = os.getenv('PROFILING_DIR') or os.path.join(BASE_DIR, 'profiles')
+PROFILING_MAX_PER_ENDPOINT = int(os.getenv('PROFILING_MAX_PER_ENDPOINT', '200'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'requests': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'recipick.requests': {'handlers': ['requests'], 'level': 'INFO', 'propagate': False},
+        # LLM 호출별 토큰/지연 (api/prompts.py). 기본은 꺼 둠, 보려면 LLM_LOG_LEVEL=DEBUG
+        'recipick.llm': {'handlers': ['requests'], 'level': os.getenv('LLM_LOG_LEVEL', 'WARNING'), 'propagate': False},
+    },
+}
@@ -21,9 +21,12 @@ from django.urls import path, include
 from django.conf import settings            
 from django.conf.urls.static import static  
 
+from api.instrumentation import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),  # Prometheus 수집용
 ]
 
 if settings.DEBUG:
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_dj.settings')
 
 application = get_wsgi_application()
+
+# gunicorn preload_app=True 면 이 부분은 마스터에서 fork 전에 한 번만 실행됨 (gunicorn.conf.py 참고)
+if settings.WSGI_PRELOAD:
+    from backend_dj.preload import preload
+    preload()
@@ -0,0 +1,164 @@
+# benchmarks/bench_async.py
+"""
+AI 추천 엔드포인트 부하 테스트 (가짜 업스트림 + 지연 주입, Linux 전용 /proc 사용)
+
+    python -m benchmarks.bench_async --requests 1000 --concurrency 500 --latency 2.0
+
+가짜 Solar(OpenAI 호환) 서버(benchmarks.fake_upstream)를 별도 프로세스로 띄우고, 앱 서버를 두 가지로 띄워 비교합니다.
+  - asgi: uvicorn 1 프로세스 + /api/recommend/ai/async/
+  - wsgi: gunicorn gthread 1 워커(--threads) + /api/recommend/ai/
+처리량, 지연 분포, 업스트림 동시 처리 수(peak in-flight), 서버 RSS/스레드 수 최댓값을 JSON 한 줄씩 출력합니다.
+요청 한도는 끄고 돌리며, --upstream-concurrency / --upstream-max-waiting 을 주면
+입장 제어(api/admission.py)가 429/503 으로 덜어낸 요청 수도 status 별로 셉니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fake_upstream import PROJECT_DIR, _free_port, _wait_port, start_upstream, upstream_stats
+
+def _proc_status(pid):
+    """ (RSS KiB, 스레드 수) """
+    rss = threads = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+            elif line.startswith('Threads:'):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+def _tree_status(pid):
+    """ 자식 프로세스(gunicorn 워커)까지 합친 (RSS KiB, 스레드 수) """
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+    totals = [_proc_status(p) for p in pids]
+    return sum(t[0] for t in totals), sum(t[1] for t in totals)
+
+
+async def _load(url, total, concurrency, server_pid, timeout):
+    latencies, errors, statuses = [], 0, {}
+    peak = {"rss": 0, "threads": 0}
+    stop = asyncio.Event()
+
+    async def sample():
+        while not stop.is_set():
+            rss, threads = _tree_status(server_pid)
+            peak["rss"] = max(peak["rss"], rss)
+            peak["threads"] = max(peak["threads"], threads)
+            await asyncio.sleep(0.05)
+
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        async def one():
+            nonlocal errors
+            async with sem:
+                started = time.perf_counter()
+                try:
+                    resp = await client.post(url, json={"ingredients": ["김치", "계란"], "timeSlot": "야식"})
+                    statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+                    if resp.status_code != 200:
+                        errors += 1
+                        return
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+
+        sampler = asyncio.create_task(sample())
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 3) if latencies else None
+
+    return {
+        "ok": len(latencies), "errors": errors, "statuses": statuses, "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_s": pct(0.50), "p95_s": pct(0.95), "p99_s": pct(0.99),
+        "server_peak_rss_mib": round(peak["rss"] / 1024, 1), "server_peak_threads": peak["threads"],
+    }
+
+
+def run(mode, upstream_port, args, tmp):
+    port = _free_port()
+    # 모드마다 새 DB (앞 모드가 저장한 AI 추천을 다음 모드가 재사용하지 않도록).
+    # 같은 요청 재사용 / 저장 레시피 검색도 꺼서 모든 요청이 업스트림까지 가게 함
+    env = dict(os.environ,
+               UPSTAGE_API_KEY='bench', UPSTAGE_BASE_URL=f"http://127.0.0.1:{upstream_port}/v1",
+               GEMINI_API_KEY='', SQLITE_PATH=os.path.join(tmp, f'{mode}.sqlite3'),
+               AI_RECOMMEND_FRESH_SECONDS='0', SEMANTIC_ENABLED='False',
+               WSGI_PRELOAD='False', DEBUG='True',
+               AI_HTTP_MAX_CONNECTIONS=str(args.concurrency), AI_RATE_LIMIT_PER_MINUTE='0',
+               AI_UPSTREAM_CONCURRENCY=str(args.upstream_concurrency or args.concurrency),
+               AI_UPSTREAM_MAX_WAITING=str(args.upstream_max_waiting), AI_UPSTREAM_WAIT_TIMEOUT=str(args.timeout))
+    if mode == 'asgi':
+        cmd = [sys.executable, '-m', 'uvicorn', 'backend_dj.asgi:application',
+               '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning', '--backlog', '4096']
+        path = '/api/recommend/ai/async/'
+    else:
+        env.update(GUNICORN_WORKERS='1', GUNICORN_THREADS=str(args.threads),
+                   GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_PRELOAD='False', GUNICORN_TIMEOUT='300')
+        cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--backlog', '4096']
+        path = '/api/recommend/ai/'
+
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '--verbosity', '0'],
+                   cwd=PROJECT_DIR, env=env, check=True)
+    proc = subprocess.Popen(cmd, cwd=PROJECT_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_port(port)
+        upstream_stats(upstream_port, reset=True)
+        result = asyncio.run(_load(f"http://127.0.0.1:{port}{path}", args.requests,
+                                   args.concurrency, proc.pid, args.timeout))
+        return {"mode": mode, "requests": args.requests, "concurrency": args.concurrency,
+                "upstream_latency_s": args.latency,
+                "threads": args.threads if mode == 'wsgi' else None,
+                "upstream_peak_in_flight": upstream_stats(upstream_port)["peak_in_flight"], **result}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=2.0, help="가짜 업스트림 응답 지연(초)")
+    parser.add_argument('--threads', type=int, default=8, help="wsgi 모드 gthread 스레드 수")
+    parser.add_argument('--timeout', type=float, default=300.0)
+    parser.add_argument('--modes', default="asgi,wsgi")
+    parser.add_argument('--upstream-concurrency', type=int, default=0, help="AI_UPSTREAM_CONCURRENCY (0 이면 --concurrency)")
+    parser.add_argument('--upstream-max-waiting', type=int, default=100000, help="AI_UPSTREAM_MAX_WAITING")
+    args = parser.parse_args()
+
+    upstream, upstream_port = start_upstream(args.latency)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in args.modes.split(','):
+                print(json.dumps(run(mode, upstream_port, args, tmp)), flush=True)
+    finally:
+        upstream.terminate()
+        upstream.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
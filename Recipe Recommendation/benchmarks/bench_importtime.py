@@ -0,0 +1,82 @@
+# benchmarks/bench_importtime.py
+"""
+콜드 import 시간 회귀 검사 (python -X importtime)
+
+    python -m benchmarks.bench_importtime                      # 기본 한도(--max-ms)로 검사
+    python -m benchmarks.bench_importtime --save baseline.json # 기준값 저장
+    python -m benchmarks.bench_importtime --baseline baseline.json --tolerance 0.2
+
+Django setup + URL conf 로딩까지를 새 프로세스에서 여러 번 재서 최솟값을 씁니다.
+무거운 모듈(pandas, openai 등)이 다시 top-level import 되면 바로 실패합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_dj.settings');"
+    "import django; django.setup(); import backend_dj.urls"
+)
+# URL conf 로딩만으로는 import 되면 안 되는 모듈
+# (requests 는 DRF 가 coreapi 호환용으로 먼저 import 하므로 제외)
+FORBIDDEN = ['pandas', 'numpy', 'openai', 'json_repair', 'httpx']
+
+
+def measure_once():
+    """ (top-level 모듈 cumulative 합계 ms, import 된 모듈 이름 집합) """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', BOOT],
+                            cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, WSGI_PRELOAD='False'))
+    total_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if not name.startswith('  '):  # 들여쓰기 없는 줄 = top-level import
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=600.0, help="절대 한도 (ms, django.setup 포함)")
+    parser.add_argument('--baseline', help="이전 결과 JSON (기준 대비 --tolerance 이상 느려지면 실패)")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--save', help="이번 결과를 JSON 으로 저장")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    cold_ms = min(ms for ms, _ in runs)
+    leaked = sorted(m for m in FORBIDDEN if any(m in modules for _, modules in runs))
+    report = {"cold_import_ms": round(cold_ms, 1), "runs": args.runs, "forbidden_imports": leaked}
+
+    failures = []
+    if leaked:
+        failures.append(f"무거운 모듈이 시작 시 import 됨: {', '.join(leaked)}")
+    if cold_ms > args.max_ms:
+        failures.append(f"{cold_ms:.1f}ms > 한도 {args.max_ms:.1f}ms")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_ms = json.load(f)["cold_import_ms"]
+        report["baseline_ms"] = baseline_ms
+        if cold_ms > baseline_ms * (1 + args.tolerance):
+            failures.append(f"{cold_ms:.1f}ms > 기준 {baseline_ms:.1f}ms x {1 + args.tolerance:.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    report["ok"] = not failures
+    print(json.dumps(report, ensure_ascii=False))
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
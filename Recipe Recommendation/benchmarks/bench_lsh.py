@@ -0,0 +1,76 @@
+# benchmarks/bench_lsh.py
+"""
+MinHash/LSH 후보 검색 vs 정확 스코어러 비교 (recall@3, 지연 시간)
+
+    python -m benchmarks.bench_lsh --sizes 10000,100000,1000000 --queries 50
+"""
+import argparse
+import json
+import os
+import time
+
+import django
+
+# api.catalog 이 계측(api/instrumentation.py) 설정값을 읽으므로 프로젝트 설정으로
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_dj.settings')
+django.setup()
+
+from api.catalog import Catalog
+from api.lsh import MinHashLSH
+from benchmarks.synthetic import make_rows, make_queries
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(size, n_queries, max_candidates):
+    rows = list(make_rows(size, seed=size))
+    catalog = Catalog.from_rows(rows, version=f"synthetic-{size}")
+
+    started = time.perf_counter()
+    index = MinHashLSH(max_candidates=max_candidates).build(catalog)
+    build_s = time.perf_counter() - started
+
+    exact_ms, lsh_ms, recalls = [], [], []
+    for query in make_queries(rows, n_queries, seed=size):
+        started = time.perf_counter()
+        exact = catalog.match(query)
+        exact_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        approx = catalog.match(query, candidates=index.query(catalog.matching_vocab_ids(query)))
+        lsh_ms.append((time.perf_counter() - started) * 1000)
+
+        # 같은 match_count 끼리는 순서가 바뀔 수 있으므로 점수 기준으로 recall 계산
+        exact_scores = sorted(r['match_count'] for r in exact)
+        approx_scores = sorted(r['match_count'] for r in approx)
+        if exact_scores:
+            recalls.append(sum(min(a, e) for a, e in zip(approx_scores[::-1], exact_scores[::-1]))
+                           / sum(exact_scores))
+
+    return {
+        "size": size,
+        "build_seconds": round(build_s, 2),
+        "recall_at_3": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        "exact_ms_p50": round(_percentile(exact_ms, 0.5), 2),
+        "exact_ms_p95": round(_percentile(exact_ms, 0.95), 2),
+        "lsh_ms_p50": round(_percentile(lsh_ms, 0.5), 2),
+        "lsh_ms_p95": round(_percentile(lsh_ms, 0.95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default="10000,100000,1000000")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--max-candidates', type=int, default=300)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(',')):
+        print(json.dumps(run(size, args.queries, args.max_candidates), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_preload.py
+"""
+gunicorn 워커 수별 메모리(RSS/PSS)와 첫 요청까지 걸린 시간 측정 (Linux 전용, /proc 사용)
+
+    python -m benchmarks.bench_preload --workers 1,4,16 --recipes 100000
+
+preload_app 켜기/끄기 두 가지를 모두 돌려서 JSON 한 줄씩 출력합니다.
+PSS 는 공유 페이지를 프로세스 수로 나눈 값이라 copy-on-write 공유 효과가 그대로 보입니다.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.synthetic import write_csv
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _memory_kib(pid):
+    """ (RSS, PSS) KiB """
+    rss = pss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith('Rss:'):
+                rss = int(line.split()[1])
+            elif line.startswith('Pss:'):
+                pss = int(line.split()[1])
+    return rss, pss
+
+
+def _get(url, timeout=2):
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.status
+
+
+def run(workers, preload, csv_path, db_path):
+    port = _free_port()
+    env = dict(os.environ,
+               GUNICORN_WORKERS=str(workers), GUNICORN_BIND=f"127.0.0.1:{port}",
+               GUNICORN_PRELOAD=str(preload), WSGI_PRELOAD=str(preload),
+               RECIPE_DATASET_PATH=csv_path, SQLITE_PATH=db_path)
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+                            cwd=PROJECT_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/api/status/"
+    try:
+        first_response = None
+        while time.perf_counter() - started < 300:
+            try:
+                if _get(url) == 200:
+                    first_response = time.perf_counter() - started
+                    break
+            except OSError:
+                time.sleep(0.05)
+
+        # 모든 워커가 카탈로그를 한 번씩 쓰도록 요청을 넉넉히 보냄
+        while len(_children(proc.pid)) < workers:
+            time.sleep(0.1)
+        for _ in range(workers * 8):
+            _get(url, timeout=60)
+
+        memory = [_memory_kib(pid) for pid in _children(proc.pid)]
+        return {
+            "workers": workers,
+            "preload": preload,
+            "time_to_first_response_s": round(first_response, 3) if first_response else None,
+            "master_rss_mib": round(_memory_kib(proc.pid)[0] / 1024, 1),
+            "worker_rss_mib_avg": round(sum(m[0] for m in memory) / len(memory) / 1024, 1),
+            "worker_pss_mib_avg": round(sum(m[1] for m in memory) / len(memory) / 1024, 1),
+            "total_pss_mib": round((sum(m[1] for m in memory) + _memory_kib(proc.pid)[1]) / 1024, 1),
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', default="1,4,16")
+    parser.add_argument('--recipes', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_csv(os.path.join(tmp, 'recipe_dataset.csv'), args.recipes)
+        db_path = os.path.join(tmp, 'db.sqlite3')
+        for workers in (int(w) for w in args.workers.split(',')):
+            for preload in (False, True):
+                print(json.dumps(run(workers, preload, csv_path, db_path)), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# benchmarks/bench_prompts.py
+"""
+Solar 프롬프트 비교: 예전 프롬프트 vs api/prompts.py (고정된 합성 샘플)
+
+    python -m benchmarks.bench_prompts --samples 20            # 프롬프트 크기만 (오프라인, 어림 토큰)
+    python -m benchmarks.bench_prompts --samples 5 --live      # 실제 Solar 호출 (UPSTAGE_API_KEY 필요, 요금 발생)
+
+필드 묶음(recipe_text / recommend)마다 JSON 한 줄을 출력합니다.
+  - 오프라인: 요청 하나의 글자 수 / 어림 토큰(benchmarks.fake_upstream.estimate_tokens) 평균과 감소율,
+    매 호출 똑같은 system 메시지(업스트림 접두어 캐시 대상)가 차지하는 비율
+  - --live: 업스트림이 돌려준 usage(입력/출력/캐시 토큰) 평균과 지연 시간 p50/p95.
+    샘플마다 예전/새 프롬프트를 번갈아 보내서 시간대에 따른 업스트림 속도 차이가 한쪽으로 몰리지 않게 합니다.
+"""
+import argparse
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_dj.settings')
+django.setup()
+
+from api import prompts
+from benchmarks.fake_upstream import estimate_tokens
+from benchmarks.synthetic import make_queries, make_rows
+
+TIME_SLOTS = ["아침", "점심", "저녁", "야식"]
+PREFERENCES = ["", "매운 거 좋아함", "다이어트 중", "간단하게 10분 안에", "아이랑 같이 먹을 거예요"]
+
+
+# ----------------------------------------------------------------------
+# 예전 프롬프트 (api/prompts.py 도입 전 그대로)
+# ----------------------------------------------------------------------
+
+def legacy_recipe_text_messages(recipe_name, ingredients_str):
+    system_message = "당신은 미슐랭 3스타 셰프이자 식품 영양학 전문가입니다. JSON 형식으로 응답하세요."
+
+    user_message = f"""
+        요리명: {recipe_name}
+        가용 재료: {ingredients_str}
+
+        다음 정보를 포함하여 완벽한 JSON 데이터를 만드세요.
+
+        [헬스 태그(health_tags) 선정 기준]
+        1. 뷰티 핏: 다이어트 식단 (저칼로리, 저탄수화물, 체중 감량용)
+        2. 프로틴 업: 고단백 식단 (닭가슴살, 계란, 콩 등 단백질 함량이 높음)
+        3. 배지라이프: 비건 식단 (고기, 해산물, 유제품 등 동물성 재료 없음)
+        4. 저속노화 식단: 자극적이지 않고 건강한 식단 (저당, 저염, 가공식품 최소화, 통곡물/채소 위주)
+        (위 기준에 부합하는 경우에만 해당 태그를 리스트에 담아주세요. 없으면 빈 배열)
+
+        [필수 JSON 포맷]
+        {{
+            "description": "요리 설명 (한글, 50자 내외)",
+            "cooking_time": 숫자(분),
+            "difficulty": "초급/중급/고급",
+            "category": "한식/양식/중식/일식/디저트/기타 중 택1",
+            "late_night_suitable": true 또는 false,
+            "health_tags": ["뷰티 핏", "프로틴 업" 등 해당되는 것],
+            "ingredients": [{{"name": "이름", "amount": "양"}}],
+            "required_equipment": ["필요한 도구 리스트"],
+            "alternative_ingredients": {{ "원래재료": ["대체재료1", "대체재료2"] }},
+            "steps": ["조리과정1", "조리과정2"],
+            "tips": ["팁1", "팁2"],
+            "nutrition": {{"calories": 0, "carbohydrate": 0, "protein": 0, "fat": 0, "sodium": 0}}
+        }}
+
+        [주의사항]
+        1. steps 문장 앞에 번호를 붙이지 마세요.
+        2. 오직 순수한 JSON만 응답하세요.
+        """
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def legacy_recommend_messages(ingredients, time_slot, preferences):
+    prompt = f"""
+        나는 지금 냉장고에 {', '.join(ingredients)}을(를) 가지고 있어.
+        지금 시간은 '{time_slot}'이고, 나의 취향은 '{preferences}'야.
+
+        이 상황에 가장 잘 어울리는 창의적인 레시피 3가지를 추천해줘.
+
+        [조건]
+        1. '{time_slot}' 시간대에 먹기 부담스럽지 않거나 어울리는 메뉴여야 해.
+        2. 내가 가진 재료를 최대한 활용해야 해.
+        3. 응답은 반드시 아래 JSON 리스트 형식으로만 줘. (설명 금지)
+
+        [
+            {{
+                "name": "요리 이름",
+                "description": "왜 이 시간/취향에 맞는지 한 줄 설명",
+                "cooking_time": 20,
+                "difficulty": "쉬움",
+                "category": "한식",
+                "ingredients": [{{"name": "재료1", "amount": "1개"}}],
+                "steps": ["단계1", "단계2"],
+                "health_tags": ["다이어트", "저염"]
+            }}
+        ]
+        """
+    return [{"role": "user", "content": prompt}]
+
+
+# ----------------------------------------------------------------------
+
+def sample_requests(n, seed=48):
+    """ 필드 묶음 -> [(legacy 메시지, 새 메시지)] (seed 고정이라 매번 같은 샘플) """
+    rows = list(make_rows(n, vocab_size=300, min_ings=4, max_ings=12, seed=seed))
+    recommend = []
+    for i, ingredients in enumerate(make_queries(rows, n, seed=seed)):
+        time_slot, preferences = TIME_SLOTS[i % len(TIME_SLOTS)], PREFERENCES[i % len(PREFERENCES)]
+        recommend.append((legacy_recommend_messages(ingredients, time_slot, preferences),
+                          prompts.recommend_messages(ingredients, time_slot, preferences)))
+    return {
+        prompts.RECIPE_TEXT: [(legacy_recipe_text_messages(row['title'], row['ingredients_raw']),
+                               prompts.recipe_text_messages(row['title'], row['ingredients_raw']))
+                              for row in rows],
+        prompts.RECOMMEND: recommend,
+    }
+
+
+def _mean(values):
+    return round(sum(values) / len(values), 1) if values else 0
+
+
+def _reduction(before, after):
+    return f"{(1 - after / before) * 100:.1f}%" if before else None
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0
+
+
+def offline(field_set, pairs):
+    def size(messages):
+        return sum(len(m['content']) for m in messages), sum(estimate_tokens(m['content']) for m in messages)
+
+    legacy = [size(old) for old, _ in pairs]
+    new = [size(messages) for _, messages in pairs]
+    static = estimate_tokens(pairs[0][1][0]['content'])
+    legacy_tokens, new_tokens = _mean([t for _, t in legacy]), _mean([t for _, t in new])
+    return {
+        "field_set": field_set,
+        "samples": len(pairs),
+        "legacy_chars": _mean([c for c, _ in legacy]),
+        "new_chars": _mean([c for c, _ in new]),
+        "legacy_est_tokens": legacy_tokens,
+        "new_est_tokens": new_tokens,
+        "prompt_reduction": _reduction(legacy_tokens, new_tokens),
+        "new_static_prefix_share": f"{static / new_tokens * 100:.1f}%" if new_tokens else None,
+        "new_max_tokens": prompts.max_tokens(field_set),
+    }
+
+
+def live(field_set, pairs):
+    from api.ai import SOLAR_MODEL, get_solar_client
+    client = get_solar_client()
+    results = {"legacy": [], "new": []}
+    for old, new in pairs:
+        for variant, messages, extra in (("legacy", old, {}), ("new", new, {"max_tokens": prompts.max_tokens(field_set)})):
+            started = time.perf_counter()
+            response = client.chat.completions.create(model=SOLAR_MODEL, messages=messages, stream=False, **extra)
+            seconds = time.perf_counter() - started
+            usage = response.usage
+            cached = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) or 0
+            results[variant].append((usage.prompt_tokens, usage.completion_tokens, cached, seconds,
+                                     response.choices[0].finish_reason == 'length'))
+
+    report = {"field_set": field_set, "samples": len(pairs)}
+    for variant, rows in results.items():
+        report[f"{variant}_prompt_tokens"] = _mean([r[0] for r in rows])
+        report[f"{variant}_completion_tokens"] = _mean([r[1] for r in rows])
+        report[f"{variant}_cached_tokens"] = _mean([r[2] for r in rows])
+        report[f"{variant}_ms_p50"] = round(_percentile([r[3] for r in rows], 0.5) * 1000, 1)
+        report[f"{variant}_ms_p95"] = round(_percentile([r[3] for r in rows], 0.95) * 1000, 1)
+        report[f"{variant}_truncated"] = sum(r[4] for r in rows)
+    for key in ("prompt_tokens", "completion_tokens", "ms_p50", "ms_p95"):
+        report[f"{key}_reduction"] = _reduction(report[f"legacy_{key}"], report[f"new_{key}"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=48)
+    parser.add_argument('--live', action='store_true', help="실제 Solar 로 호출해서 usage/지연 비교")
+    args = parser.parse_args()
+
+    if args.live:
+        from api.ai import UPSTAGE_API_KEY
+        if not UPSTAGE_API_KEY:
+            parser.error("--live 에는 UPSTAGE_API_KEY 가 필요합니다.")
+
+    for field_set, pairs in sample_requests(args.samples, args.seed).items():
+        report = live(field_set, pairs) if args.live else offline(field_set, pairs)
+        print(json.dumps(report, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# benchmarks/fake_upstream.py
+"""
+벤치마크용 가짜 LLM / 이미지 서버 (지연 주입)
+
+    python -m benchmarks.fake_upstream --port 9000 --latency 0.5 --image-latency 1.0
+
+  - POST .../chat/completions : latency 초 뒤 고정 chat.completion 응답 (Upstage Solar 대신)
+      AI 추천(system 메시지가 없거나 "JSON 배열" 을 요구)이면 목록(list), 아니면 레시피 상세(dict) JSON.
+      usage 에는 estimate_tokens() 로 어림한 토큰 수를 넣음
+  - POST ...:generateContent  : image_latency 초 뒤 작은 JPEG 를 담은 응답 (Gemini 이미지 대신)
+  - GET /stats[/reset]        : 동시 처리 수 최댓값 / 처리 건수 (reset 은 읽은 뒤 0 으로)
+
+앱 쪽은 UPSTAGE_BASE_URL=http://127.0.0.1:PORT/v1, GEMINI_IMAGE_URL=http://127.0.0.1:PORT/image:generateContent
+로 연결합니다. 부하 생성기와 GIL 을 나눠 쓰지 않도록 start_upstream() 으로 별도 프로세스에서 띄웁니다.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAKE_RECIPES = json.dumps([{
+    "name": "가짜 김치볶음밥", "description": "부하 테스트용", "cooking_time": 15,
+    "difficulty": "쉬움", "category": "한식", "ingredients": [{"name": "김치", "amount": "1컵"}],
+    "steps": ["볶는다"], "health_tags": [],
+}], ensure_ascii=False)
+
+FAKE_RECIPE_TEXT = json.dumps({
+    "description": "벤치마크용 가짜 레시피 설명입니다.", "cooking_time": 20, "difficulty": "초급",
+    "category": "한식", "late_night_suitable": False, "health_tags": ["저속노화 식단"],
+    "ingredients": [{"name": "양파", "amount": "1개"}], "required_equipment": ["프라이팬"],
+    "alternative_ingredients": {"양파": ["대파"]},
+    "steps": ["1. 재료를 손질합니다.", "2. 볶습니다.", "3. 담아냅니다."], "tips": ["약불에서 볶으세요."],
+    "nutrition": {"calories": 300, "carbohydrate": 40, "protein": 10, "fat": 8, "sodium": 500},
+}, ensure_ascii=False)
+
+# 1x1 JPEG
+FAKE_IMAGE_B64 = base64.b64encode(bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912"
+    "130f141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b0800"
+    "01000101011100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffc400b5100002"
+    "010303020403050504040000017d01020300041105122131410613516107227114328191a1082342b1c11552d1f024"
+    "33627282090a161718191a25262728292a3435363738393a434445464748494a535455565758595a63646566676869"
+    "6a737475767778797a838485868788898a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4"
+    "c5c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda0008010100003f00fbd3"
+    "ffd9"
+)).decode()
+
+
+def estimate_tokens(text):
+    """ 토크나이저 없이 어림한 토큰 수 (비ASCII 한 글자 = 1, ASCII 4글자 = 1)
+
+    실제 Solar 토크나이저와는 다르므로 두 프롬프트를 비교하는 용도로만 씁니다.
+    """
+    text = str(text)
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return len(text) - ascii_chars + (ascii_chars + 3) // 4
+
+
+class FakeUpstream:
+    """ chat.completions / generateContent 흉내 + GET /stats 동시 처리 수 통계 """
+
+    def __init__(self, latency, image_latency=None):
+        self.latency = latency
+        self.image_latency = latency if image_latency is None else image_latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.served = 0
+        self.served_images = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        if scope['method'] == 'GET':
+            await self._send_json(send, {"peak_in_flight": self.peak_in_flight, "served": self.served,
+                                         "served_images": self.served_images})
+            if scope['path'] == '/stats/reset':
+                self.reset()
+            return
+
+        is_image = scope['path'].endswith(':generateContent')
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.image_latency if is_image else self.latency)
+        finally:
+            self.in_flight -= 1
+        self.served += 1
+        if is_image:
+            self.served_images += 1
+            await self._send_json(send, {"candidates": [{"content": {"parts": [
+                {"text": "fake"}, {"inlineData": {"mimeType": "image/jpeg", "data": FAKE_IMAGE_B64}},
+            ]}}]})
+            return
+        try:
+            messages = json.loads(body).get('messages', [])
+        except ValueError:
+            messages = []
+        content = self._chat_content(messages)
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = estimate_tokens(content)
+        await self._send_json(send, {
+            "id": "fake", "object": "chat.completion", "created": 0, "model": "solar-pro2",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    @staticmethod
+    def _chat_content(messages):
+        system = [m.get('content', '') for m in messages if m.get('role') == 'system']
+        if not system or any('JSON 배열' in content for content in system):
+            return FAKE_RECIPES
+        return FAKE_RECIPE_TEXT
+
+    @staticmethod
+    async def _send_json(send, data):
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': json.dumps(data).encode()})
+
+    def reset(self):
+        self.in_flight = self.peak_in_flight = self.served = self.served_images = 0
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_port(port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"port {port} not ready")
+
+
+def start_upstream(latency, image_latency=None):
+    """ 별도 프로세스로 띄우고 (Popen, port) 반환 """
+    port = _free_port()
+    cmd = [sys.executable, '-m', 'benchmarks.fake_upstream', '--port', str(port), '--latency', str(latency)]
+    if image_latency is not None:
+        cmd += ['--image-latency', str(image_latency)]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_port(port)
+    return proc, port
+
+
+def upstream_env(port):
+    """ 앱이 가짜 서버를 보도록 하는 환경 변수 """
+    return {
+        'UPSTAGE_API_KEY': 'bench', 'UPSTAGE_BASE_URL': f"http://127.0.0.1:{port}/v1",
+        'GEMINI_API_KEY': 'bench', 'GEMINI_IMAGE_URL': f"http://127.0.0.1:{port}/image:generateContent",
+    }
+
+
+def upstream_stats(port, reset=False):
+    import httpx
+    return httpx.get(f"http://127.0.0.1:{port}/stats{'/reset' if reset else ''}").json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, required=True)
+    parser.add_argument('--latency', type=float, default=0.5, help="LLM 응답 지연(초)")
+    parser.add_argument('--image-latency', type=float, default=None, help="이미지 응답 지연(초, 기본은 --latency)")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(FakeUpstream(args.latency, args.image_latency), host='127.0.0.1', port=args.port,
+                log_level='warning', backlog=4096)
+
+
+if __name__ == '__main__':
+    main()
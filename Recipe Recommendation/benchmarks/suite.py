@@ -0,0 +1,283 @@
+# benchmarks/suite.py
+"""
+추천 파이프라인 / CRUD API 회귀 벤치마크
+
+    python -m benchmarks.suite --save baseline.json                       # 기준 결과 저장
+    python -m benchmarks.suite --baseline baseline.json --tolerance 0.25  # 기준 대비 검사 (실패 시 exit 1)
+    python -m benchmarks.suite --scenarios get_all_recipes,comment_burst --recipes 1000
+
+임시 디렉터리에 합성 CSV(benchmarks.synthetic)와 새 SQLite DB 를 만들고,
+가짜 LLM/이미지 서버(benchmarks.fake_upstream)를 별도 프로세스로 띄운 뒤
+이 프로세스에서 Django 테스트 클라이언트로 시나리오를 순서대로 돌립니다.
+
+  recommend_cold   처음 보는 냉장고 질의 (카탈로그 로딩 + 레시피 저장 + AI 텍스트/이미지 생성)
+  recommend_warm   같은 질의 반복 (DB 에 저장된 레시피 재사용, 업스트림 호출 0 이어야 함)
+  get_all_recipes  사용자 레시피 --recipes 개가 있을 때 목록 조회
+  comment_burst    댓글 연속 작성
+  favorite_burst   즐겨찾기 추가/삭제 연속 토글
+  recommend_ai     상황 맞춤 AI 추천 (가짜 LLM 지연 포함)
+
+요청마다 Server-Timing 헤더(api/instrumentation.py)에서 서버 처리 시간, DB 쿼리 수, 구간별 시간을 읽어
+시나리오별 p50/p95, 요청당 쿼리 수, 업스트림 호출 수를 JSON 으로 출력합니다.
+--baseline 과 비교할 때
+  - p50/p95 가 기준 x (1 + tolerance) + slack-ms 보다 느려지면 실패 (기계 성능 차이는 tolerance 로 흡수)
+  - 요청당 쿼리 수 / 업스트림 호출 수는 조금이라도 늘면 실패 (N+1 같은 회귀는 기계와 무관하게 잡힘)
+  - 기대하지 않은 상태 코드가 나오면 실패
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_upstream import PROJECT_DIR, start_upstream, upstream_env, upstream_stats
+from benchmarks.synthetic import make_queries, make_rows, write_rows
+
+SCENARIOS = ['recommend_cold', 'recommend_warm', 'get_all_recipes', 'comment_burst', 'favorite_burst',
+             'recommend_ai']
+
+# 결과가 달라지는 설정 (기준과 다르면 비교하지 않음)
+CONFIG_KEYS = ['rows', 'min_ings', 'max_ings', 'vocab_size', 'seed', 'recipes', 'queries', 'repeat',
+               'iterations', 'writes', 'latency', 'image_latency']
+
+_STAGE_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+def _server_timing(response):
+    """ Server-Timing 헤더 -> (전체 ms, DB 쿼리 수, {구간: ms}) """
+    stages, queries, total = {}, 0, 0.0
+    for name, dur, desc in _STAGE_RE.findall(response.get('Server-Timing', '')):
+        if name == 'total':
+            total = float(dur)
+        elif name == 'db':
+            queries = int(desc or 0)
+            stages['db'] = float(dur)
+        else:
+            stages[name] = float(dur)
+    return total, queries, stages
+
+
+class Recorder:
+    """ 시나리오 하나의 요청별 측정값 """
+
+    def __init__(self, expected_status):
+        from django.test import Client
+        self.client = Client()
+        self.expected_status = expected_status
+        self.latencies = []
+        self.queries = 0
+        self.statuses = {}
+        self.stages = {}
+
+    def call(self, method, path, data=None):
+        if method == 'GET':
+            response = self.client.get(path, data)
+        else:
+            response = self.client.post(path, json.dumps(data or {}), content_type='application/json')
+        total, queries, stages = _server_timing(response)
+        self.latencies.append(total)
+        self.queries += queries
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        for name, ms in stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+        return response
+
+    def result(self, elapsed, upstream_calls):
+        n = len(self.latencies)
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            return round(ordered[min(n - 1, int(n * p))], 2) if ordered else 0.0
+
+        return {
+            "requests": n,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "unexpected_statuses": sum(v for k, v in self.statuses.items() if k != self.expected_status),
+            "p50_ms": pct(0.50), "p95_ms": pct(0.95), "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+            "mean_ms": round(sum(ordered) / n, 2) if n else 0.0,
+            "queries_per_request": round(self.queries / n, 2) if n else 0.0,
+            "upstream_calls": upstream_calls,
+            "stages_ms_per_request": {k: round(v / n, 2) for k, v in sorted(self.stages.items())},
+            "wall_s": round(elapsed, 3),
+        }
+
+
+def _seed(args, rows):
+    """ 벤치마크용 유저와 사용자 레시피 --recipes 개 (재료 / 조리 순서 포함) """
+    from django.contrib.auth.models import User
+    from recipes.models import Ingredient, Recipe, RecipeIngredient, Step
+
+    users = User.objects.bulk_create([User(username=f"bench{i}", password='!') for i in range(20)])
+    names = sorted({name for row in rows[:args.recipes] for name in row['names']})
+    Ingredient.objects.bulk_create([Ingredient(name=n) for n in names], ignore_conflicts=True)
+    ingredient_ids = dict(Ingredient.objects.filter(name__in=names).values_list('name', 'id'))
+
+    recipes = Recipe.objects.bulk_create([
+        Recipe(author=users[i % len(users)], name=row['title'], cooking_time=row['time'],
+               difficulty='보통', category='한식', description="벤치마크 레시피")
+        for i, row in enumerate(rows[:args.recipes])
+    ])
+    RecipeIngredient.objects.bulk_create([
+        RecipeIngredient(recipe=recipe, ingredient_id=ingredient_ids[name], amount="1개")
+        for recipe, row in zip(recipes, rows) for name in row['names']
+    ])
+    Step.objects.bulk_create([
+        Step(recipe=recipe, order=order, content=f"{order}단계 조리")
+        for recipe in recipes for order in range(1, 5)
+    ])
+    return users, recipes
+
+
+def run_scenarios(args, rows, upstream_port):
+    users, recipes = _seed(args, rows)
+    queries = make_queries(rows, args.queries, seed=args.seed)
+
+    def recommend_cold(rec):
+        for ingredients in queries:
+            rec.call('POST', '/api/recommend/', {"ingredients": ingredients})
+
+    def recommend_warm(rec):
+        for _ in range(args.repeat):
+            for ingredients in queries:
+                rec.call('POST', '/api/recommend/', {"ingredients": ingredients})
+
+    def get_all_recipes(rec):
+        for _ in range(args.iterations):
+            rec.call('GET', '/api/recipes/')
+
+    def comment_burst(rec):
+        for i in range(args.writes):
+            rec.call('POST', f"/api/recipe/{recipes[i % len(recipes)].id}/comments/",
+                     {"username": users[i % len(users)].username, "content": f"맛있어요 {i}"})
+
+    def favorite_burst(rec):
+        for i in range(args.writes):
+            rec.call('POST', '/api/user/favorites/',
+                     {"username": users[0].username, "recipe_id": recipes[(i // 2) % len(recipes)].id})
+
+    def recommend_ai(rec):
+        for i in range(args.iterations):
+            rec.call('POST', '/api/recommend/ai/', {"ingredients": queries[i % len(queries)],
+                                                    "timeSlot": "저녁", "username": users[0].username})
+
+    table = {
+        'recommend_cold': (recommend_cold, 200), 'recommend_warm': (recommend_warm, 200),
+        'get_all_recipes': (get_all_recipes, 200), 'comment_burst': (comment_burst, 201),
+        'favorite_burst': (favorite_burst, 200), 'recommend_ai': (recommend_ai, 200),
+    }
+    results = {}
+    for name in args.scenarios:
+        run, expected = table[name]
+        rec = Recorder(expected)
+        upstream_stats(upstream_port, reset=True)
+        started = time.perf_counter()
+        run(rec)
+        elapsed = time.perf_counter() - started
+        results[name] = rec.result(elapsed, upstream_stats(upstream_port)["served"])
+        print(f"⏱️ {name}: p50 {results[name]['p50_ms']}ms, "
+              f"{results[name]['queries_per_request']} queries/req", file=sys.stderr)
+    return results
+
+
+def compare(report, baseline, tolerance, slack_ms):
+    """ 기준 결과 대비 회귀 목록 """
+    if baseline.get("config") != report["config"]:
+        return ["기준 결과와 설정(config)이 달라 비교할 수 없습니다."]
+    failures = []
+    for name, current in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            limit = base[key] * (1 + tolerance) + slack_ms
+            if current[key] > limit:
+                failures.append(f"{name}.{key}: {current[key]} > {limit:.2f} (기준 {base[key]})")
+        for key in ('queries_per_request', 'upstream_calls'):
+            if current[key] > base[key]:
+                failures.append(f"{name}.{key}: {current[key]} > 기준 {base[key]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--rows', type=int, default=20000, help="합성 CSV 레시피 수")
+    parser.add_argument('--min-ings', type=int, default=3)
+    parser.add_argument('--max-ings', type=int, default=10)
+    parser.add_argument('--vocab-size', type=int, default=2000)
+    parser.add_argument('--vocab-file', help="기본 재료명 목록 파일 (benchmarks.synthetic 참고)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--recipes', type=int, default=100, help="DB 에 미리 넣을 사용자 레시피 수")
+    parser.add_argument('--queries', type=int, default=10, help="추천 질의 수 (cold 는 질의당 1회)")
+    parser.add_argument('--repeat', type=int, default=5, help="recommend_warm 반복 횟수")
+    parser.add_argument('--iterations', type=int, default=30, help="get_all_recipes / recommend_ai 요청 수")
+    parser.add_argument('--writes', type=int, default=200, help="댓글 / 즐겨찾기 연속 쓰기 수")
+    parser.add_argument('--latency', type=float, default=0.05, help="가짜 LLM 응답 지연(초)")
+    parser.add_argument('--image-latency', type=float, default=0.05, help="가짜 이미지 응답 지연(초)")
+    parser.add_argument('--baseline', help="이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="지연 허용 비율")
+    parser.add_argument('--slack-ms', type=float, default=2.0, help="지연 허용 절대값 (아주 짧은 요청의 잡음 흡수)")
+    parser.add_argument('--save', help="이번 결과를 JSON 으로 저장")
+    args = parser.parse_args()
+    args.scenarios = [s for s in args.scenarios.split(',') if s]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+    if not 1 <= args.recipes <= args.rows:
+        parser.error("--recipes 는 1 이상 --rows 이하여야 합니다.")
+
+    from benchmarks.synthetic import load_vocabulary
+    base_names = load_vocabulary(args.vocab_file) if args.vocab_file else None
+    rows = list(make_rows(args.rows, vocab_size=args.vocab_size, min_ings=args.min_ings,
+                          max_ings=args.max_ings, seed=args.seed, base_names=base_names))
+    upstream, upstream_port = start_upstream(args.latency, args.image_latency)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = write_rows(os.path.join(tmp, 'recipes.csv'), rows)
+            os.environ.update(upstream_env(upstream_port),
+                              DJANGO_SETTINGS_MODULE='backend_dj.settings', DEBUG='False',
+                              SQLITE_PATH=os.path.join(tmp, 'db.sqlite3'), RECIPE_DATASET_PATH=csv_path,
+                              AI_RATE_LIMIT_PER_MINUTE='0', REQUEST_LOG_ENABLED='False',
+                              RECOMMEND_ME_PRECOMPUTE='False', WSGI_PRELOAD='False')
+            sys.path.insert(0, PROJECT_DIR)
+            import django
+            django.setup()
+            from django.conf import settings
+            from django.core.management import call_command
+            settings.MEDIA_ROOT = os.path.join(tmp, 'media')
+            settings.ALLOWED_HOSTS = ['testserver']
+            call_command('migrate', verbosity=0)
+
+            # 뷰의 진행 로그(print)가 결과 JSON 과 섞이지 않도록 stderr 로
+            with contextlib.redirect_stdout(sys.stderr):
+                scenarios = run_scenarios(args, rows, upstream_port)
+    finally:
+        upstream.terminate()
+        upstream.wait(timeout=30)
+
+    config = {key: getattr(args, key) for key in CONFIG_KEYS}
+    config["vocab_file"] = os.path.basename(args.vocab_file) if args.vocab_file else None
+    report = {"config": config, "scenarios": scenarios}
+
+    failures = [f"{name}: 기대하지 않은 상태 코드 {r['statuses']}"
+                for name, r in scenarios.items() if r["unexpected_statuses"]]
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += compare(report, json.load(f), args.tolerance, args.slack_ms)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    report["ok"] = not failures
+    report["failures"] = failures
+    print(json.dumps(report, ensure_ascii=False))
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
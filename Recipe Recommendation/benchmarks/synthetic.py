@@ -0,0 +1,110 @@
+# benchmarks/synthetic.py
+"""
+벤치마크용 가짜 레시피 카탈로그 생성기
+
+실제 recipe_dataset.csv 와 같은 컬럼(food_title, ingredients, time, difficulty, cartegory)을
+만들고, 재료 인기도는 지프(Zipf) 분포를 따르게 해서 "양파/마늘" 같은 흔한 재료가 많이 겹치도록 합니다.
+
+    python -m benchmarks.synthetic out.csv --rows 20000 --min-ings 3 --max-ings 10 --vocab-size 2000
+    python -m benchmarks.synthetic out.csv --rows 5000 --vocab-file my_ingredients.txt
+
+--vocab-file 은 한 줄에 재료명 하나 (흔한 것부터). 기본 재료 목록 대신 이걸로 조합을 만듭니다.
+"""
+import argparse
+import random
+
+BASE_INGREDIENTS = [
+    "양파", "대파", "마늘", "계란", "두부", "김치", "감자", "당근", "애호박", "버섯",
+    "돼지고기", "소고기", "닭고기", "오징어", "새우", "고추장", "된장", "간장", "참기름", "설탕",
+    "고춧가루", "양배추", "콩나물", "시금치", "무", "배추", "어묵", "햄", "치즈", "우유",
+]
+PREFIXES = ["", "다진 ", "국산 ", "냉동 ", "생", "말린 ", "청", "홍", "묵은지 ", "통"]
+DISHES = ["볶음", "찌개", "국", "조림", "전", "구이", "무침", "덮밥", "볶음밥", "샐러드"]
+AMOUNTS = ["1개", "2개", "1/2개", "100g", "200g", "1큰술", "2큰술", "약간", "1컵", "한줌"]
+
+
+def load_vocabulary(path):
+    """ 한 줄에 하나씩 적힌 재료명 목록 (빈 줄, # 주석 제외) """
+    with open(path, encoding='utf-8') as f:
+        names = [line.strip() for line in f]
+    return list(dict.fromkeys(n for n in names if n and not n.startswith('#')))
+
+
+def make_vocabulary(size, seed=0, base_names=None):
+    """ 기본 재료(base_names) x 접두어 조합으로 size 개의 재료명 (흔한 것부터) """
+    rng = random.Random(seed)
+    base = list(base_names or BASE_INGREDIENTS)
+    names = list(base)
+    while len(names) < size:
+        name = f"{rng.choice(PREFIXES)}{rng.choice(base)}{len(names)}"
+        names.append(name)
+    return names[:size]
+
+
+def make_rows(n, vocab_size=2000, min_ings=3, max_ings=10, seed=0, base_names=None):
+    """ Catalog 에 바로 넣을 수 있는 row dict 를 하나씩 생성 """
+    rng = random.Random(seed)
+    vocab = make_vocabulary(vocab_size, seed, base_names)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    for i in range(n):
+        k = rng.randint(min_ings, max_ings)
+        names = list(dict.fromkeys(rng.choices(vocab, weights=weights, k=k)))
+        ingredients_raw = '|'.join(f"{name} {rng.choice(AMOUNTS)}" for name in names)
+        yield {
+            'title': f"{names[0]} {rng.choice(DISHES)} {i}",
+            'ingredients_raw': ingredients_raw,
+            'names': names,
+            'time': rng.choice([10, 15, 20, 30, 40, 60]),
+            'difficulty': rng.choice(["초급", "중급", "고급"]),
+            'category': rng.choice(["한식", "양식", "중식", "일식"]),
+        }
+
+
+def make_queries(rows, count, seed=0):
+    """ 실제 레시피 재료 일부 + 잡음 재료로 "냉장고" 질의 생성 """
+    rng = random.Random(seed)
+    vocab = make_vocabulary(len(BASE_INGREDIENTS))
+    queries = []
+    for _ in range(count):
+        row = rng.choice(rows)
+        picked = rng.sample(row['names'], k=min(len(row['names']), rng.randint(2, 4)))
+        queries.append(picked + rng.sample(vocab, k=2))
+    return queries
+
+
+def write_rows(path, rows):
+    """ make_rows() 결과를 recipe_dataset.csv 와 같은 형식으로 저장 """
+    import csv
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['food_title', 'ingredients', 'time', 'difficulty', 'cartegory'])
+        for row in rows:
+            writer.writerow([row['title'], row['ingredients_raw'], f"{row['time']}분",
+                             row['difficulty'], row['category']])
+    return path
+
+
+def write_csv(path, n, seed=0, **kwargs):
+    """ recipe_dataset.csv 와 같은 형식으로 n 개 레시피 저장 """
+    return write_rows(path, make_rows(n, seed=seed, **kwargs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--min-ings', type=int, default=3, help="레시피당 최소 재료 수")
+    parser.add_argument('--max-ings', type=int, default=10, help="레시피당 최대 재료 수")
+    parser.add_argument('--vocab-size', type=int, default=2000, help="재료명 종류 수")
+    parser.add_argument('--vocab-file', help="기본 재료명 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    base_names = load_vocabulary(args.vocab_file) if args.vocab_file else None
+    write_csv(args.path, args.rows, seed=args.seed, vocab_size=args.vocab_size,
+              min_ings=args.min_ings, max_ings=args.max_ings, base_names=base_names)
+    print(f"✅ {args.rows}개 레시피 저장: {args.path}")
+
+
+if __name__ == '__main__':
+    main()
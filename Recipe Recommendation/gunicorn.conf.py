@@ -0,0 +1,42 @@
+# gunicorn.conf.py
+"""
+운영 배포용 gunicorn 설정
+
+    pip install gunicorn
+    gunicorn -c gunicorn.conf.py
+
+preload_app = True 로 backend_dj/wsgi.py 를 마스터에서 먼저 import 하므로
+backend_dj/preload.py 가 카탈로그/인덱스를 fork 전에 한 번만 올립니다.
+워커 수, 바인드 주소는 환경 변수로 조절합니다.
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+
+# GUNICORN_ASGI=True 면 uvicorn 워커로 ASGI 앱을 띄움 (/api/recommend/*/async/ 가 이벤트 루프에서 동작)
+if os.getenv('GUNICORN_ASGI', 'False') == 'True':
+    wsgi_app = 'backend_dj.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'backend_dj.wsgi:application'
+    # 로그인 해싱 레인(api/login_lane.py)이 해싱 스레드를 제한하는 동안 남은 스레드가 레시피 요청을 처리하도록
+    # gthread 워커만 지원 (sync 워커는 해싱 동안 워커 전체가 멈추고 레인이 줄을 세우지 못함)
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+    if threads <= int(os.getenv('LOGIN_LANE_CONCURRENCY', '2')):
+        raise RuntimeError(
+            "GUNICORN_THREADS 는 LOGIN_LANE_CONCURRENCY 보다 커야 합니다 "
+            "(로그인 해싱 레인은 gthread 워커의 남는 스레드로 다른 요청을 처리합니다)."
+        )
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))  # AI 호출이 느릴 수 있음
+
+# fork 전에 앱 로딩 (copy-on-write 공유). False 로 두면 워커마다 따로 로딩
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+# preload_app 일 때만 wsgi.py / asgi.py 가 카탈로그와 무거운 모듈을 마스터에서 올림 (settings.WSGI_PRELOAD)
+if preload_app:
+    os.environ.setdefault('WSGI_PRELOAD', 'True')
+
+# 메모리 누수 대비 주기적 워커 재시작 (0 이면 사용 안 함)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
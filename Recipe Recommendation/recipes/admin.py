@@ -1,7 +1,301 @@
+"""
+관리자 화면
+
+카탈로그가 수십만 건이 되어도 목록이 바로 뜨도록
+  - 목록 한 페이지는 쿼리 몇 번으로 끝냄 (list_select_related, 개수 컬럼은 그 페이지 행에만 도는 서브쿼리)
+  - 전체 개수는 COUNT(*) 대신 max(id) 로 어림하고, 검색/필터 결과 개수는 MAX_EXACT_COUNT 에서 끊음
+  - 검색은 인덱스를 타는 것만: 레시피는 FTS5 색인(api/search.py), 나머지는 정확 일치 / 접두어(범위) 검색
+    (Django 기본 검색은 LIKE '%...%' 라 매번 테이블 전체를 읽음)
+  - 외래 키는 autocomplete 로 (select 박스에 재료/레시피 수만 개를 싣지 않음)
+  - 레시피 화면 인라인은 재료/조리 순서만. 댓글/즐겨찾기처럼 한없이 늘 수 있는 건 개수 + 필터된 목록 링크
+"""
 from django.contrib import admin
-from .models import Recipe, Ingredient, RecipeIngredient, Step
+from django.contrib.admin.utils import get_fields_from_path
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+from .models import (
+    AIRecommendation, CatalogEntry, Comment, Favorite, Ingredient, PrecomputedRecommendation,
+    RecentlyViewed, Recipe, RecipeIngredient, Step, UserIngredient, UserRecommendation,
+)
+
+# 이보다 많으면 전체 개수는 어림값, 검색/필터 결과는 여기서 끊어서 셈
+MAX_EXACT_COUNT = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """ 필터 없는 목록은 max(id) 로 어림 (지운 행만큼 마지막 페이지가 비어 있을 수 있음) """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            last = queryset.model._default_manager.order_by('-pk').values_list('pk', flat=True).first() or 0
+            if last > MAX_EXACT_COUNT:
+                return last
+        return queryset.order_by()[:MAX_EXACT_COUNT].count()
+
+
+def _count_of(model, field='recipe'):
+    """ 행마다 related 개수 (목록 페이지에 나온 행에만 인덱스로 계산) """
+    counts = (model.objects.filter(**{field: OuterRef('pk')}).order_by()
+              .values(field).annotate(n=Count('*')).values('n'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _changelist_link(model, field, obj, label):
+    url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+    return format_html('<a href="{}?{}={}">{}</a>', url, field, obj.pk, label)
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """ 어림 개수 + 인덱스 검색 (exact_search_fields: field=검색어, prefix_search_fields: 검색어로 시작) """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = ('-pk',)
+    exact_search_fields = ()
+    prefix_search_fields = ()
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        # 검색창 / autocomplete 가 켜지도록 (실제 검색은 get_search_results)
+        if not self.search_fields:
+            self.search_fields = (*self.exact_search_fields, *self.prefix_search_fields)
+
+    def _value(self, path, term):
+        try:
+            return get_fields_from_path(self.model, path)[-1].to_python(term)
+        except (ValidationError, ValueError, TypeError):
+            return None
+
+    def search_condition(self, term):
+        condition = Q()
+        for path in self.exact_search_fields:
+            value = self._value(path, term)
+            if value is not None:
+                condition |= Q(**{path: value})
+        for path in self.prefix_search_fields:
+            # 범위 조건이라 LIKE 와 달리 인덱스를 탐
+            condition |= Q(**{f'{path}__gte': term, f'{path}__lt': term + '\U0010ffff'})
+        return condition
+
+    def get_search_results(self, request, queryset, search_term):
+        term = ' '.join(search_term.split())
+        if not term:
+            return queryset, False
+        condition = self.search_condition(term)
+        return (queryset.filter(condition) if condition else queryset.none()), False
+
+
+# ----------------------------------------------------------------------
+# 레시피
+# ----------------------------------------------------------------------
+
+class RecipeIngredientInline(admin.TabularInline):
+    model = RecipeIngredient
+    extra = 0
+    autocomplete_fields = ('ingredient',)
+
+    def get_queryset(self, request):
+        # 행 제목(__str__)이 재료 이름을 읽으므로 같이 가져옴
+        return super().get_queryset(request).select_related('ingredient')
+
+
+class StepInline(admin.TabularInline):
+    model = Step
+    extra = 0
+
+
+@admin.register(Recipe)
+class RecipeAdmin(ScalableAdmin):
+    list_display = ('id', 'name', 'source', 'category', 'difficulty', 'author', 'ingredient_count', 'step_count',
+                    'comment_link', 'version', 'created_at')
+    list_display_links = ('id', 'name')
+    list_filter = ('source', 'category', 'difficulty', 'late_night_suitable')
+    list_select_related = ('author',)
+    search_fields = ('name', 'id', 'source_key')
+    search_help_text = "이름/재료/설명/조리 순서 전문 검색, 레시피 id, 카탈로그 제목(source_key) 정확 일치"
+    autocomplete_fields = ('author',)
+    readonly_fields = ('version', 'created_at')
+    inlines = (RecipeIngredientInline, StepInline)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            ingredient_count=_count_of(RecipeIngredient),
+            step_count=_count_of(Step),
+            comment_count=_count_of(Comment),
+        )
+
+    def search_condition(self, term):
+        from api.search import match_expression
+        condition = Q()
+        value = self._value('id', term)
+        if value is not None:
+            condition |= Q(id=value)
+        # (source, source_key) 유니크 인덱스를 타도록 source 도 같이
+        condition |= Q(source__in=[s for s, _ in Recipe.SOURCE_CHOICES], source_key=term)
+        expression = match_expression(term)
+        if expression and connection.vendor == 'sqlite':
+            condition |= Q(id__in=RawSQL("SELECT rowid FROM recipe_search WHERE recipe_search MATCH %s", [expression]))
+        elif expression:
+            condition |= Q(name__gte=term, name__lt=term + '\U0010ffff')
+        return condition
+
+    # 개수로 정렬하면 전체 행에 서브쿼리가 돌아서 정렬은 막아 둠
+    @admin.display(description='재료')
+    def ingredient_count(self, obj):
+        return obj.ingredient_count
+
+    @admin.display(description='조리 순서')
+    def step_count(self, obj):
+        return obj.step_count
+
+    @admin.display(description='댓글')
+    def comment_link(self, obj):
+        return _changelist_link(Comment, 'recipe__id__exact', obj, obj.comment_count)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # 상세 문서 캐시 무효화 (재료/조리 순서 인라인까지 저장한 뒤)
+        from api.recipe_detail import touch_recipe
+        touch_recipe(form.instance.pk)
+
+
+@admin.register(Ingredient)
+class IngredientAdmin(ScalableAdmin):
+    list_display = ('id', 'name', 'recipe_count')
+    exact_search_fields = ('id',)
+    prefix_search_fields = ('name',)
+    search_help_text = "재료 이름 앞부분 또는 id"
+    ordering = ('name',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(recipe_count=_count_of(RecipeIngredient, 'ingredient'))
+
+    @admin.display(description='레시피')
+    def recipe_count(self, obj):
+        return _changelist_link(RecipeIngredient, 'ingredient__id__exact', obj, obj.recipe_count)
+
+
+class RecipeChildAdmin(ScalableAdmin):
+    """ 레시피에 딸린 행 (저장/삭제하면 레시피 상세 캐시 무효화) """
+
+    list_select_related = ('recipe',)
+    autocomplete_fields = ('recipe',)
+    exact_search_fields = ('recipe__id',)
+
+    def save_model(self, request, obj, form, change):
+        from api.recipe_detail import touch_recipe
+        super().save_model(request, obj, form, change)
+        touch_recipe(obj.recipe_id)
+
+    def delete_model(self, request, obj):
+        from api.recipe_detail import touch_recipe
+        super().delete_model(request, obj)
+        touch_recipe(obj.recipe_id)
+
+    def delete_queryset(self, request, queryset):
+        from api.recipe_detail import touch_recipe
+        recipe_ids = set(queryset.values_list('recipe_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for recipe_id in recipe_ids:
+            touch_recipe(recipe_id)
+
+
+@admin.register(RecipeIngredient)
+class RecipeIngredientAdmin(RecipeChildAdmin):
+    list_display = ('id', 'recipe', 'ingredient', 'amount')
+    list_select_related = ('recipe', 'ingredient')
+    autocomplete_fields = ('recipe', 'ingredient')
+    exact_search_fields = ('recipe__id', 'ingredient__name')
+    search_help_text = "레시피 id 또는 재료 이름 (정확히)"
+
+
+@admin.register(Step)
+class StepAdmin(RecipeChildAdmin):
+    list_display = ('id', 'recipe', 'order', 'content')
+    search_help_text = "레시피 id"
+
+
+# ----------------------------------------------------------------------
+# 사용자 활동
+# ----------------------------------------------------------------------
+
+class UserActivityAdmin(ScalableAdmin):
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    exact_search_fields = ('user__username', 'recipe__id')
+    search_help_text = "유저 이름 또는 레시피 id (정확히)"
+
+
+@admin.register(Comment)
+class CommentAdmin(UserActivityAdmin):
+    list_display = ('id', 'recipe', 'user', 'rating', 'content', 'created_at')
+
+
+@admin.register(Favorite)
+class FavoriteAdmin(UserActivityAdmin):
+    list_display = ('id', 'user', 'recipe', 'created_at')
+
+
+@admin.register(RecentlyViewed)
+class RecentlyViewedAdmin(UserActivityAdmin):
+    list_display = ('id', 'user', 'recipe', 'viewed_at')
+
+
+@admin.register(UserIngredient)
+class UserIngredientAdmin(ScalableAdmin):
+    list_display = ('id', 'user', 'name', 'created_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    exact_search_fields = ('user__username', 'name')
+    search_help_text = "유저 이름 또는 재료 이름 (정확히)"
+
+
+# ----------------------------------------------------------------------
+# 미리 계산 / 동기화 / AI 결과
+# ----------------------------------------------------------------------
+
+@admin.register(PrecomputedRecommendation)
+class PrecomputedRecommendationAdmin(ScalableAdmin):
+    list_display = ('id', '__str__', 'support', 'catalog_version', 'created_at')
+    exact_search_fields = ('key',)
+    search_help_text = "재료 조합 지문(sha1)"
+    readonly_fields = ('key', 'ingredients', 'matches', 'catalog_version', 'support', 'created_at')
+
+
+@admin.register(UserRecommendation)
+class UserRecommendationAdmin(ScalableAdmin):
+    list_display = ('id', 'user', 'catalog_version', 'updated_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    exact_search_fields = ('user__username',)
+    search_help_text = "유저 이름 (정확히)"
+    readonly_fields = ('fingerprint', 'catalog_version', 'matches', 'updated_at')
+
+
+@admin.register(CatalogEntry)
+class CatalogEntryAdmin(ScalableAdmin):
+    list_display = ('id', 'recipe', 'content_hash', 'synced_at')
+    list_select_related = ('recipe',)
+    autocomplete_fields = ('recipe',)
+    exact_search_fields = ('recipe__id', 'content_hash')
+    search_help_text = "레시피 id 또는 content_hash"
+    readonly_fields = ('synced_at',)
+
 
-admin.site.register(Recipe)
-admin.site.register(Ingredient)
-admin.site.register(RecipeIngredient)
-admin.site.register(Step)
+@admin.register(AIRecommendation)
+class AIRecommendationAdmin(ScalableAdmin):
+    list_display = ('id', '__str__', 'preferences', 'generated_at')
+    list_filter = ('time_slot',)
+    exact_search_fields = ('key',)
+    search_help_text = "요청 지문(sha1)"
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.8 on 2026-10-19 17:54
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def dedupe_user_ingredients(apps, schema_editor):
+    # 제약 추가 전에 (user, name) 중복 행은 가장 오래된 것만 남김
+    UserIngredient = apps.get_model('recipes', 'UserIngredient')
+    keep_ids = (
+        UserIngredient.objects.values('user_id', 'name')
+        .annotate(keep_id=Min('id'))
+        .values_list('keep_id', flat=True)
+    )
+    UserIngredient.objects.exclude(id__in=list(keep_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_user_ingredients, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='useringredient',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='unique_user_ingredient'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_precomputed_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['recipe', 'created_at'], name='comment_recipe_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['recipe', 'rating'], name='comment_recipe_rating_idx'),
+        ),
+    ]
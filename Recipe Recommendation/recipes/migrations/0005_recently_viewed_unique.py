@@ -0,0 +1,40 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:39
+
+from django.db import migrations, models
+from django.db.models import Max
+import django.utils.timezone
+
+
+def dedupe_recently_viewed(apps, schema_editor):
+    # 제약 추가 전에 (user, recipe) 중복 행은 가장 나중에 만들어진 것만 남김
+    RecentlyViewed = apps.get_model('recipes', 'RecentlyViewed')
+    keep_ids = (
+        RecentlyViewed.objects.values('user_id', 'recipe_id')
+        .annotate(keep_id=Max('id'))
+        .values_list('keep_id', flat=True)
+    )
+    RecentlyViewed.objects.exclude(id__in=list(keep_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_recently_viewed, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='recentlyviewed',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='recentlyviewed',
+            index=models.Index(fields=['user', 'viewed_at'], name='recently_viewed_user_time_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='recentlyviewed',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe'), name='recently_viewed_user_recipe_uniq'),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:48
+
+import csv
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def _repoint_unique(model, keep, dupes):
+    # (user, recipe) 유니크라서 이미 keep 쪽에 있는 유저의 행은 지우고 나머지만 옮김
+    taken = set(model.objects.filter(recipe_id=keep).values_list('user_id', flat=True))
+    drop, move = [], []
+    for row_id, user_id in model.objects.filter(recipe_id__in=dupes).order_by('-id').values_list('id', 'user_id'):
+        (drop if user_id in taken else move).append(row_id)
+        taken.add(user_id)
+    model.objects.filter(id__in=drop).delete()
+    model.objects.filter(id__in=move).update(recipe_id=keep)
+
+
+def _catalog_titles():
+    """ 카탈로그 CSV 의 food_title 집합 (CSV 가 없으면 빈 집합) """
+    candidates = [
+        getattr(settings, 'RECIPE_DATASET_PATH', None),
+        os.path.join(settings.BASE_DIR, 'backend_dj', 'recipe_dataset.csv'),
+        os.path.join(settings.BASE_DIR, 'recipe_dataset.csv'),
+    ]
+    path = next((p for p in candidates if p and os.path.exists(p)), None)
+    if path is None:
+        return set()
+    with open(path, newline='', encoding='utf-8') as f:
+        # 빈 제목은 스냅샷 / 추천 API 와 같은 기본 이름으로
+        return {(record.get('food_title') or '이름 없는 요리') for record in csv.DictReader(f)}
+
+
+def dedupe_catalog_recipes(apps, schema_editor):
+    """ CSV 에서 만들어진 레시피를 키별로 하나만 남기고 source='catalog' + source_key 채움
+
+    카탈로그 레시피 = CatalogEntry 가 있거나, 작성자가 없고 이름이 카탈로그 CSV 제목과 같은 레시피
+    (추천 API 가 get_or_create(name=...) 로 만들던 것). 키는 CatalogEntry.key, 없으면 레시피 이름.
+    작성자가 탈퇴해서(SET_NULL) 작성자가 없어진 사용자 레시피는 그대로 source='user' 로 두고 합치지 않습니다.
+    같은 키가 여러 개면 CatalogEntry 가 있는 것 > 조리 순서가 있는 것 > 먼저 만들어진 것을 남기고,
+    나머지의 즐겨찾기/댓글/최근 본 기록을 남길 레시피로 옮긴 뒤 삭제합니다.
+    """
+    Recipe = apps.get_model('recipes', 'Recipe')
+    CatalogEntry = apps.get_model('recipes', 'CatalogEntry')
+    Step = apps.get_model('recipes', 'Step')
+    Favorite = apps.get_model('recipes', 'Favorite')
+    Comment = apps.get_model('recipes', 'Comment')
+    RecentlyViewed = apps.get_model('recipes', 'RecentlyViewed')
+
+    entries = dict(CatalogEntry.objects.values_list('recipe_id', 'key'))
+    titles = _catalog_titles()
+    groups = defaultdict(list)
+    # 제목 목록이 커서 IN 대신 파이썬에서 거름
+    candidates = Q(author__isnull=True) | Q(catalog_entry__isnull=False)
+    for recipe_id, name in Recipe.objects.filter(candidates).values_list('id', 'name'):
+        if recipe_id in entries:
+            groups[entries[recipe_id]].append(recipe_id)
+        elif name in titles:
+            groups[name].append(recipe_id)
+
+    with_steps = set(Step.objects.filter(Q(recipe__author__isnull=True) | Q(recipe__catalog_entry__isnull=False))
+                     .values_list('recipe_id', flat=True))
+    keyed, merged = [], 0
+    for key, ids in groups.items():
+        keep = min(ids, key=lambda i: (i not in entries, i not in with_steps, i))
+        dupes = [i for i in ids if i != keep]
+        if dupes:
+            _repoint_unique(Favorite, keep, dupes)
+            _repoint_unique(RecentlyViewed, keep, dupes)
+            Comment.objects.filter(recipe_id__in=dupes).update(recipe_id=keep)
+            Recipe.objects.filter(id__in=dupes).delete()
+            merged += len(dupes)
+        keyed.append(Recipe(id=keep, source='catalog', source_key=key))
+    Recipe.objects.bulk_update(keyed, ['source', 'source_key'], batch_size=500)
+    if merged:
+        print(f"\n  🧹 중복 카탈로그 레시피 {merged}개를 합쳤습니다.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_catalog_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='source',
+            field=models.CharField(choices=[('user', '사용자 작성'), ('catalog', 'CSV 카탈로그'), ('ai', 'AI 생성')], default='user', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='source_key',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.RunPython(dedupe_catalog_recipes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='recipe',
+            constraint=models.UniqueConstraint(condition=models.Q(('source_key__isnull', False)), fields=('source', 'source_key'), name='recipe_source_key_uniq'),
+        ),
+        migrations.RemoveField(
+            model_name='catalogentry',
+            name='key',
+        ),
+    ]
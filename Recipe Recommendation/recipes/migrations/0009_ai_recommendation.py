@@ -0,0 +1,26 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:56
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_source_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=40, unique=True)),
+                ('ingredients', models.JSONField(default=list)),
+                ('time_slot', models.CharField(max_length=20)),
+                ('preferences', models.CharField(blank=True, max_length=200)),
+                ('recipe_ids', models.JSONField(default=list)),
+                ('generated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 # 1. 재료 모델 (기존 유지)
@@ -32,6 +33,15 @@ class Recipe(models.Model):
         ('기타', '기타'),
     ]
 
+    SOURCE_USER = 'user'
+    SOURCE_CATALOG = 'catalog'
+    SOURCE_AI = 'ai'
+    SOURCE_CHOICES = [
+        (SOURCE_USER, '사용자 작성'),
+        (SOURCE_CATALOG, 'CSV 카탈로그'),
+        (SOURCE_AI, 'AI 생성'),
+    ]
+
     # 작성자: User 모델과 연결 (로그인한 사람이 작성자가 됨)
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='recipes')
     
@@ -53,6 +63,19 @@ class Recipe(models.Model):
     late_night_suitable = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # 내용이 바뀔 때마다 +1 (api/recipe_detail.py 상세 문서 캐시 키)
+    version = models.PositiveIntegerField(default=1)
+
+    # 💡 출처별 자연 키 (카탈로그: CSV food_title). 사용자 레시피는 source_key 없이 이름 중복 허용
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default=SOURCE_USER)
+    source_key = models.CharField(max_length=200, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # (source, source_key) 로 바로 찾고 upsert 하도록 유니크 인덱스 (동시 생성 시 중복도 막아줌)
+            models.UniqueConstraint(fields=['source', 'source_key'], condition=models.Q(source_key__isnull=False),
+                                    name='recipe_source_key_uniq'),
+        ]
 
     def __str__(self):
         return self.name
@@ -81,6 +104,12 @@ class UserIngredient(models.Model):
     name = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # 같은 재료 중복 저장 방지 + (user, name) 인덱스로 차집합 계산
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'], name='unique_user_ingredient'),
+        ]
+
     def __str__(self):
         return f"{self.user.username}의 재료: {self.name}"
 
@@ -101,11 +130,72 @@ class Comment(models.Model):
     rating = models.IntegerField(default=5)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 레시피별 최신순 페이지 조회
+            models.Index(fields=['recipe', 'created_at'], name='comment_recipe_created_idx'),
+            # 평점 요약(개수/평균/분포)을 테이블을 읽지 않고 인덱스만으로 집계
+            models.Index(fields=['recipe', 'rating'], name='comment_recipe_rating_idx'),
+        ]
+
 # 8. 최근 본 레시피
+# (api/recently_viewed.py 가 모아서 한 번에 upsert, 유저당 최근 RECENT_VIEWS_KEEP 개만 유지)
 class RecentlyViewed(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE)
-    viewed_at = models.DateTimeField(auto_now=True)
+    # 버퍼에 쌓인 실제 조회 시각을 그대로 저장하도록 auto_now 대신 기본값만
+    viewed_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        ordering = ['-viewed_at']
\ No newline at end of file
+        ordering = ['-viewed_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'recipe'], name='recently_viewed_user_recipe_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'viewed_at'], name='recently_viewed_user_time_idx'),
+        ]
+
+# 9. 미리 계산된 추천 (인기 재료 조합 -> top-K, manage.py build_topk 로 생성)
+class PrecomputedRecommendation(models.Model):
+    key = models.CharField(max_length=40, unique=True)  # 정렬된 재료 조합의 sha1
+    ingredients = models.JSONField(default=list)
+    matches = models.JSONField(default=list)
+    catalog_version = models.CharField(max_length=64)
+    support = models.PositiveIntegerField(default=0)  # 조합이 등장한 횟수
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return ', '.join(self.ingredients)
+
+# 10. CSV 카탈로그 동기화 상태 (manage.py sync_catalog, CSV 한 줄 = 레시피 하나, 키는 Recipe.source_key)
+class CatalogEntry(models.Model):
+    recipe = models.OneToOneField(Recipe, on_delete=models.CASCADE, related_name='catalog_entry')
+    content_hash = models.CharField(max_length=40)  # 제목/재료/시간/난이도/분류의 sha1
+    synced_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.recipe.source_key or self.recipe.name
+
+# 11. AI 맞춤 추천 결과 (요청 지문 -> 저장된 AI 레시피 목록, api/ai_results.py)
+class AIRecommendation(models.Model):
+    key = models.CharField(max_length=40, unique=True)  # 재료/시간대/취향 지문(sha1)
+    ingredients = models.JSONField(default=list)
+    time_slot = models.CharField(max_length=20)
+    preferences = models.CharField(max_length=200, blank=True)
+    recipe_ids = models.JSONField(default=list)  # LLM 이 준 순서대로
+    # 마지막으로 LLM 이 만든 시각 (AI_RECOMMEND_FRESH_SECONDS 가 지나면 다시 생성)
+    generated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{', '.join(self.ingredients)} / {self.time_slot}"
+
+# 12. "내 냉장고로 추천" 랭킹 (유저당 한 행, api/recommend_cache.py. 워커/서버끼리 공유되도록 DB 에 둠)
+class UserRecommendation(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='fridge_recommendation')
+    fingerprint = models.CharField(max_length=40)  # 계산할 때의 냉장고 지문(sha1)
+    catalog_version = models.CharField(max_length=64)
+    matches = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} ({self.catalog_version})"
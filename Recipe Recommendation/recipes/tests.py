@@ -1,3 +1,76 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+
+
+class RecipeSourceKeyMigrationTests(TransactionTestCase):
+    """ 0008_recipe_source_key: 카탈로그 레시피만 합치고 작성자 잃은 사용자 레시피는 그대로 """
+
+    migrate_from = [('recipes', '0007_catalog_entry')]
+    migrate_to = [('recipes', '0008_recipe_source_key')]
+
+    def setUp(self):
+        fd, self.csv_path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write("food_title,ingredients,time,difficulty,cartegory\n"
+                    "김치찌개,김치 1컵|두부 1모,20분,초급,한식\n"
+                    "된장찌개,된장 1큰술|호박 1/2개,20분,초급,한식\n")
+        self.addCleanup(os.remove, self.csv_path)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.old_apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        with override_settings(RECIPE_DATASET_PATH=self.csv_path):
+            executor.migrate(self.migrate_to)
+        return executor.loader.project_state(self.migrate_to).apps
+
+    def test_merges_catalog_rows_and_keeps_orphaned_user_recipes(self):
+        User = self.old_apps.get_model('auth', 'User')
+        Recipe = self.old_apps.get_model('recipes', 'Recipe')
+        CatalogEntry = self.old_apps.get_model('recipes', 'CatalogEntry')
+        Favorite = self.old_apps.get_model('recipes', 'Favorite')
+        Comment = self.old_apps.get_model('recipes', 'Comment')
+
+        user = User.objects.create(username='tester')
+        # 추천 API 가 이름으로 두 번 만든 카탈로그 레시피
+        kimchi_first = Recipe.objects.create(name='김치찌개')
+        kimchi_dupe = Recipe.objects.create(name='김치찌개')
+        # sync_catalog 가 만든 레시피 (CatalogEntry 있음) + 이름으로 만든 중복
+        doenjang_dupe = Recipe.objects.create(name='된장찌개')
+        doenjang_synced = Recipe.objects.create(name='된장찌개')
+        CatalogEntry.objects.create(recipe=doenjang_synced, key='된장찌개', content_hash='0' * 40)
+        # 작성자가 탈퇴해서 author 가 NULL 이 된 사용자 레시피 (CSV 에 없는 이름, 같은 이름 두 개)
+        orphan_a = Recipe.objects.create(name='우리집 볶음밥')
+        orphan_b = Recipe.objects.create(name='우리집 볶음밥')
+        authored = Recipe.objects.create(name='김치찌개', author=user)
+
+        Favorite.objects.create(user=user, recipe=kimchi_dupe)
+        Comment.objects.create(user=user, recipe=doenjang_dupe, rating=5, content='맛있어요')
+
+        apps = self._migrate()
+        Recipe = apps.get_model('recipes', 'Recipe')
+        rows = {r.id: (r.source, r.source_key) for r in Recipe.objects.all()}
+
+        self.assertEqual(rows[kimchi_first.id], ('catalog', '김치찌개'))
+        self.assertNotIn(kimchi_dupe.id, rows)
+        self.assertEqual(rows[doenjang_synced.id], ('catalog', '된장찌개'))
+        self.assertNotIn(doenjang_dupe.id, rows)
+        self.assertEqual(rows[orphan_a.id], ('user', None))
+        self.assertEqual(rows[orphan_b.id], ('user', None))
+        self.assertEqual(rows[authored.id], ('user', None))
+
+        # 지운 중복 레시피의 즐겨찾기 / 댓글은 남긴 레시피로 옮겨짐
+        self.assertEqual(apps.get_model('recipes', 'Favorite').objects.get().recipe_id, kimchi_first.id)
+        self.assertEqual(apps.get_model('recipes', 'Comment').objects.get().recipe_id, doenjang_synced.id)